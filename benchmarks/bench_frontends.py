@@ -0,0 +1,61 @@
+"""
+File: bench_frontends.py
+---------------------------
+Created on Sat Oct 17th, 2026
+
+Benchmarks of template parsing and the Scrambling and Isotopomers
+front-ends, on synthetic templates.
+"""
+
+import shutil
+import tempfile
+
+from pyisotopomer import Diagnostics, IsotopeStandards, Isotopomers, Scrambling
+from pyisotopomer import ScramblingInput
+
+from .common import ROWS, _RowBenchmark
+from .synthetic import template
+
+
+class _TemplateBenchmark(_RowBenchmark):
+    # writes a template with the given number of rows before each benchmark
+
+    def setup(self, rows, *params):
+        super().setup(rows, *params)
+        self.directory = tempfile.mkdtemp(prefix="pyisotopomer_benchmark_")
+        self.template = template(rows, self.directory)
+
+    def teardown(self, rows, *params):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+class ScramblingInputParse(_TemplateBenchmark):
+    # read the template, calculate 17R and pair up reference materials
+
+    def run(self, rows):
+        ScramblingInput(
+            self.template, IsotopeStandards(), diagnostics=Diagnostics(mode="off")
+        )
+
+
+class ScramblingFrontend(_TemplateBenchmark):
+    params = [ROWS, ["algebraic", "least_squares"]]
+    param_names = ["rows", "method"]
+    rowbyrow = ("least_squares",)
+
+    def run(self, rows, method):
+        Scrambling(
+            self.template,
+            saveout=False,
+            method=method,
+            diagnostics=Diagnostics(mode="off"),
+        )
+
+
+class IsotopomersFrontend(_TemplateBenchmark):
+    params = [ROWS, ["least_squares", "bracketed"]]
+    param_names = ["rows", "method"]
+    rowbyrow = ("least_squares",)
+
+    def run(self, rows, method):
+        Isotopomers(self.template, saveout=False, method=method)
@@ -0,0 +1,86 @@
+"""
+File: bench_solvers.py
+---------------------------
+Created on Sat Oct 17th, 2026
+
+Benchmarks of the row solvers, on synthetic isotope ratios.
+"""
+
+from pyisotopomer import Diagnostics, IsotopeStandards
+from pyisotopomer import algebraic_gk_eqns, automate_gk_solver, calculate_17R
+from pyisotopomer.calcSPmain import calcSPmain
+from pyisotopomer.tracerSPmain import tracerSPmain
+
+from .common import ROWBYROW, ROWS, _RowBenchmark
+from .synthetic import pairedratios, sampleratios, tracerratios
+
+
+class CalcSPmain(_RowBenchmark):
+    # 15Ralpha and 15Rbeta of natural-abundance samples
+    params = [ROWS, ["least_squares", "newton", "bracketed"]]
+    param_names = ["rows", "method"]
+    rowbyrow = ("least_squares",)
+
+    def setup(self, rows, method):
+        super().setup(rows, method)
+        self.R = sampleratios(rows)
+        self.isotopestandards = IsotopeStandards()
+
+    def run(self, rows, method):
+        calcSPmain(self.R, self.isotopestandards, method=method)
+
+
+class TracerSPmain(_RowBenchmark):
+    # 15Ralpha and 15Rbeta of 15N-labeled samples
+    params = [ROWS, ["least_squares", "linear"]]
+    param_names = ["rows", "method"]
+    rowbyrow = ("least_squares",)
+
+    def setup(self, rows, method):
+        super().setup(rows, method)
+        self.R = tracerratios(rows)
+        self.isotopestandards = IsotopeStandards()
+
+    def run(self, rows, method):
+        tracerSPmain(self.R, self.isotopestandards, method=method)
+
+
+class Calculate17R(_RowBenchmark):
+    # 15Rbulk, 17R and 18R from 45R and 46R
+    params = [ROWS, ["bracketed", "least_squares"]]
+    param_names = ["rows", "method"]
+    rowbyrow = ("least_squares",)
+
+    def setup(self, rows, method):
+        super().setup(rows, method)
+        self.R = sampleratios(rows)[:, :4]
+        self.isotopestandards = IsotopeStandards()
+
+    def run(self, rows, method):
+        calculate_17R(
+            self.R,
+            self.isotopestandards,
+            method=method,
+            diagnostics=Diagnostics(mode="off"),
+        )
+
+
+class AlgebraicGKEqns(_RowBenchmark):
+    # gamma and kappa of paired reference materials, algebraic solution
+
+    def setup(self, rows):
+        self.R, self.refconstants = pairedratios(rows)
+
+    def run(self, rows):
+        algebraic_gk_eqns(self.R, self.refconstants, ref1="ATM", ref2="S2")
+
+
+class AutomateGKSolver(_RowBenchmark):
+    # gamma and kappa of paired reference materials, least squares solver
+    params = [[rows for rows in ROWS if rows <= ROWBYROW]]
+
+    def setup(self, rows):
+        self.R, self.refconstants = pairedratios(rows)
+
+    def run(self, rows):
+        automate_gk_solver(self.R, self.refconstants, ref1="ATM", ref2="S2")
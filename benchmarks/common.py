@@ -0,0 +1,63 @@
+"""
+File: common.py
+---------------------------
+Created on Sat Oct 17th, 2026
+
+Base class for benchmarks that time one call on a number of rows of input.
+"""
+
+import contextlib
+import io
+
+# numbers of rows to benchmark each solver path at
+ROWS = [10**2, 10**3, 10**4, 10**5, 10**6]
+
+# largest number of rows to benchmark the row-by-row least squares solvers at,
+# which take minutes at 10^6 rows
+ROWBYROW = 10**5
+
+
+class _RowBenchmark:
+    """
+    Time and peak memory of one call on a number of rows.
+
+    DESCRIPTION:
+        Subclasses set params (number of rows first, then e.g. the solver
+        method), build their input in setup, after calling
+        _RowBenchmark.setup, and define run(self, rows, *params), which makes
+        the call to be benchmarked. asv then reports:
+            time_run: seconds per call
+            peakmem_run: peak memory (bytes) of the benchmark process
+        Throughput (rows per second) is rows / time_run. Each call is made
+        once per benchmark (no repeats), and methods listed in rowbyrow, which
+        solve one row at a time, are skipped above ROWBYROW rows. Output
+        printed by the solvers is discarded.
+    """
+
+    params = [ROWS]
+    param_names = ["rows"]
+
+    # values of the second parameter (the solver method) that solve one row
+    # at a time
+    rowbyrow = ()
+
+    number = 1
+    repeat = 1
+    rounds = 1
+    warmup_time = 0
+    timeout = 3600
+
+    def setup(self, rows, *params):
+        # asv skips a benchmark whose setup raises NotImplementedError
+        if rows > ROWBYROW and params[:1] and params[0] in self.rowbyrow:
+            raise NotImplementedError
+
+    def quietrun(self, rows, *params):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return self.run(rows, *params)
+
+    def time_run(self, rows, *params):
+        self.quietrun(rows, *params)
+
+    def peakmem_run(self, rows, *params):
+        self.quietrun(rows, *params)
@@ -0,0 +1,140 @@
+"""
+File: synthetic.py
+---------------------------
+Created on Sat Oct 17th, 2026
+
+Functions to generate synthetic input for the benchmarks, at any
+number of rows, from known isotopocule ratios.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from pyisotopomer import IsotopeStandards, Workbook
+from pyisotopomer.constants_new import compileconstants
+from pyisotopomer.forwardmodel import isotopocules
+
+# d15Na and d15Nb of the reference materials in the example template
+REFERENCES = pd.DataFrame(
+    {
+        "ref_tag": ["ATM", "S2", "B6"],
+        "d15Na": [15.6, 5.55, -0.403965],
+        "d15Nb": [-2.3, -12.87, -0.148149],
+    }
+)
+
+# example template, tiled to make templates of any size
+TEMPLATE = os.path.join(
+    os.path.dirname(__file__), "..", "pyisotopomer_examples", "00_Python_template_v3.xlsx"
+)
+
+
+def oxygen(n, rng, isotopestandards):
+    # 17R, 18R and D17O of n samples with d18O of 20-60 per mil
+    r18 = (rng.uniform(20, 60, n) / 1000 + 1) * isotopestandards.R18VSMOW
+    D17O = rng.normal(0, 0.5, n)
+    r17 = (
+        isotopestandards.R17VSMOW
+        * (r18 / isotopestandards.R18VSMOW) ** isotopestandards.O17beta
+        * (D17O / 1000 + 1)
+    )
+    return r17, r18, D17O
+
+
+def sampleratios(n, seed=0):
+    """
+    USAGE: R = sampleratios(1000)
+
+    Returns an n x 6 array of 31R, 45R, 46R, D17O, gamma and kappa, for
+    calcSPmain, of natural-abundance samples with d15Nalpha and d15Nbeta of
+    -20 to 40 per mil. The first four columns are the input for calculate_17R.
+    """
+    rng = np.random.default_rng(seed)
+    iso = IsotopeStandards()
+
+    a = (rng.uniform(-20, 40, n) / 1000 + 1) * iso.R15Air
+    b = (rng.uniform(-20, 40, n) / 1000 + 1) * iso.R15Air
+    r17, r18, D17O = oxygen(n, rng, iso)
+    g = rng.normal(0.18, 0.01, n)
+    k = rng.normal(0.09, 0.01, n)
+
+    x, y, z = isotopocules(a, b, r17, r18, g, k)
+    return np.column_stack([x, y, z, D17O, g, k])
+
+
+def tracerratios(n, seed=0):
+    """
+    USAGE: R = tracerratios(1000)
+
+    Returns an n x 9 array of 31R, 45R, 46R, D17O, gamma, kappa, delta17O,
+    15Ralpha * 15Rbeta at t0, and 46R added, for tracerSPmain, of 15N-labeled
+    samples with d15Nalpha and d15Nbeta of 0 to 2000 per mil.
+    """
+    rng = np.random.default_rng(seed)
+    iso = IsotopeStandards()
+
+    a = (rng.uniform(0, 2000, n) / 1000 + 1) * iso.R15Air
+    b = (rng.uniform(0, 2000, n) / 1000 + 1) * iso.R15Air
+    delta17O = rng.uniform(10, 30, n)
+    D17O = np.zeros(n)
+    r17 = (delta17O / 1000 + 1) * 0.0003799
+    r18 = iso.R18VSMOW * ((r17 / iso.R17VSMOW) / (D17O / 1000 + 1)) ** (1 / iso.O17beta)
+    ab = np.full(n, (1.0155 * iso.R15Air) * (0.9977 * iso.R15Air))
+    r15addition = a * b - ab  # 46R added since t0
+    g = rng.normal(0.18, 0.01, n)
+    k = rng.normal(0.09, 0.01, n)
+
+    x, y, z = isotopocules(a, b, r17, r18, g, k, ab=ab + r15addition)
+    return np.column_stack([x, y, z, D17O, g, k, delta17O, ab, r15addition])
+
+
+def pairedratios(n, seed=0, ref1="ATM", ref2="S2"):
+    """
+    USAGE: R, refconstants = pairedratios(1000)
+
+    Returns an n x 10 array of 31R, 45R, 46R, 15Rbulk and 17R of ref1 and
+    ref2, for algebraic_gk_eqns and automate_gk_solver, and the table of
+    15Ralpha and 15Rbeta of the reference materials from compileconstants.
+    """
+    rng = np.random.default_rng(seed)
+    iso = IsotopeStandards()
+    refconstants = compileconstants(REFERENCES)
+
+    g = rng.normal(0.18, 0.01, n)
+    k = rng.normal(0.09, 0.01, n)
+
+    columns = []
+    for ref in (ref1, ref2):
+        a, b = refconstants[ref]
+        r17, r18, D17O = oxygen(n, rng, iso)
+        x, y, z = isotopocules(a, b, r17, r18, g, k)
+        columns += [x, y, z, np.full(n, (a + b) / 2), r17]
+
+    return np.column_stack(columns), refconstants
+
+
+def template(n, directory):
+    """
+    USAGE: path = template(1000, "benchmark_template")
+
+    Writes a template with n rows in its "size_correction" tab to a directory
+    of .csv files (see workbook.py), by tiling the rows of the example
+    template, with a new run date for each copy, so that the number of
+    reference material pairings grows in proportion to n. Returns the
+    directory.
+    """
+    workbook = Workbook(TEMPLATE)
+    data = workbook.read("size_correction", skiprows=1).dropna(thresh=10)
+    scale = workbook.read("scale_normalization", skiprows=1)
+
+    copies = int(np.ceil(n / len(data)))
+    tiled = pd.concat([data] * copies, ignore_index=True).iloc[:n]
+    copy = np.repeat(np.arange(copies), len(data))[:n]
+    tiled["run_date"] = tiled["run_date"] + copy * 1000000
+
+    os.makedirs(directory, exist_ok=True)
+    tiled.to_csv(os.path.join(directory, "size_correction.csv"), index=False)
+    scale.to_csv(os.path.join(directory, "scale_normalization.csv"), index=False)
+    return directory
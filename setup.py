@@ -1,5 +1,4 @@
-from setuptools import find_packages
-from distutils.core import setup
+from setuptools import find_packages, setup
 
 if __name__ == "__main__":
     with open("README.md", "r") as fh:
@@ -37,4 +36,10 @@ if __name__ == "__main__":
             "openpyxl",
             "jupyter"
         ],
+        extras_require={
+            "parquet": ["pyarrow"],
+        },
+        entry_points={
+            "console_scripts": ["pyisotopomer=pyisotopomer.cli:main"],
+        },
     )
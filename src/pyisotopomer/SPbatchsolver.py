@@ -0,0 +1,140 @@
+"""
+File: SPbatchsolver.py
+---------------------------
+Created on Sat Oct 17th, 2026
+
+Batched Newton solver for N2O isotopocule values: solves the
+2 x 2 SPnonlineq system for every row at once.
+"""
+
+import numpy as np
+from .SPnonlineq import SPnonlineq, SPjacobian
+
+
+def SPbatchsolver(
+    R, isotopestandards, x0, lb, ub, xtol=1e-14, ftol=1e-12, maxiter=50
+):
+    """
+    USAGE: isol, converged = SPbatchsolver(R, isotopestandards, x0, lb, ub)
+
+    DESCRIPTION:
+        Solves SPnonlineq for 15Ralpha and 15Rbeta in all rows of R at once,
+        using a damped Newton iteration on arrays of shape (n, 2). Each Newton
+        step is projected onto the bounds [lb, ub], and is halved until it
+        reduces the residual of that row. Rows stop iterating independently
+        once their step falls below xtol.
+
+    INPUT:
+        :param R: array with dimensions n x 6 where n is the number of
+        measurements.  The six columns are 31R, 45R, 46R, D17O, gamma,
+        and kappa, from left to right.
+        :type R: numpy array, dtype=float
+        :param isotopestandards: IsotopeStandards class from isotopestandards.py,
+        containing 15RAir, 18RVSMOW, 17RVSMOW, and beta for the 18O/17O relation.
+        :type isotopestandards: Class
+        :param x0: initial guess for 15Ralpha and 15Rbeta, either one guess
+        for all rows (length 2) or one guess per row (n x 2)
+        :type x0: numpy array, dtype=float
+        :param lb: lower bounds for 15Ralpha and 15Rbeta
+        :type lb: numpy array, dtype=float
+        :param ub: upper bounds for 15Ralpha and 15Rbeta
+        :type ub: numpy array, dtype=float
+        :param xtol: relative step size at which a row is considered converged
+        :type xtol: float
+        :param ftol: largest absolute residual accepted for a converged row
+        :type ftol: float
+        :param maxiter: maximum number of Newton iterations
+        :type maxiter: int
+
+    OUTPUT:
+        :returns: isol, converged
+        :param isol: array with dimensions n x 2. The two columns are 15Ralpha
+        and 15Rbeta, from left to right.
+        :type isol: numpy array
+        :param converged: per-row convergence mask. Rows that stopped on a
+        bound without solving the system, or that ran out of iterations,
+        are False.
+        :type converged: numpy array, dtype=bool
+    """
+    R = np.asarray(R, dtype=float)
+    lb = np.asarray(lb, dtype=float)
+    ub = np.asarray(ub, dtype=float)
+
+    X = np.clip(np.broadcast_to(np.asarray(x0, dtype=float), (len(R), 2)), lb, ub)
+    X = X.copy()
+
+    # 17R = 45R - 15Ralpha - 15Rbeta must be positive for 18R to be real:
+    # for depleted samples, shrink the guess until 17R is that of VSMOW
+    y = R[:, 1]
+    r17guess = isotopestandards.R17VSMOW * (R[:, 3] / 1000 + 1)
+    infeasible = X.sum(axis=1) >= y
+    if infeasible.any():
+        scale = np.maximum(y - r17guess, 0.5 * y) / X.sum(axis=1)
+        X[infeasible] = np.clip(X[infeasible] * scale[infeasible, None], lb, ub)
+
+    def residuals(X, rows):
+        # SPnonlineq evaluates all rows at once when given transposed arrays
+        with np.errstate(invalid="ignore", divide="ignore"):
+            F = np.array(SPnonlineq(X.T, R[rows].T, isotopestandards)).T
+        # rows where 17R = 45R - 15Ralpha - 15Rbeta < 0 have no real 18R
+        return np.where(np.isfinite(F), F, np.inf)
+
+    active = np.ones(len(R), dtype=bool)  # rows that are still iterating
+    F = residuals(X, slice(None))
+    normF = np.max(np.abs(F), axis=1)
+
+    for _ in range(maxiter):
+        rows = np.flatnonzero(active)
+        if len(rows) == 0:
+            break
+
+        x = X[rows]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            J = np.moveaxis(
+                np.array(SPjacobian(x.T, R[rows].T, isotopestandards)), -1, 0
+            )
+            # closed-form inverse of each 2 x 2 Jacobian
+            det = J[:, 0, 0] * J[:, 1, 1] - J[:, 0, 1] * J[:, 1, 0]
+            step = -np.stack(
+                [
+                    (J[:, 1, 1] * F[rows, 0] - J[:, 0, 1] * F[rows, 1]) / det,
+                    (J[:, 0, 0] * F[rows, 1] - J[:, 1, 0] * F[rows, 0]) / det,
+                ],
+                axis=1,
+            )
+        step = np.where(np.isfinite(step), step, 0.0)
+
+        # rows whose full Newton step is negligible have converged
+        small = np.all(np.abs(step) <= xtol * np.abs(x) + 1e-300, axis=1)
+        active[rows[small]] = False
+
+        # backtrack: halve the step of each row until its residual decreases
+        xnew = x.copy()
+        Fnew = F[rows].copy()
+        pending = ~small
+        t = 1.0
+        for _ in range(40):
+            trial = np.clip(x[pending] + t * step[pending], lb, ub)
+            Ftrial = residuals(trial, rows[pending])
+            better = np.max(np.abs(Ftrial), axis=1) < normF[rows[pending]]
+            idx = np.flatnonzero(pending)[better]
+            xnew[idx] = trial[better]
+            Fnew[idx] = Ftrial[better]
+            pending[idx] = False
+            if not pending.any():
+                break
+            t *= 0.5
+
+        dx = np.abs(xnew - x)
+        X[rows] = xnew
+        F[rows] = Fnew
+        normF[rows] = np.max(np.abs(Fnew), axis=1)
+
+        # a row is done when its step stalls (including when no step
+        # reduced its residual any further)
+        done = np.all(dx <= xtol * np.abs(xnew) + 1e-300, axis=1)
+        active[rows[done]] = False
+
+    converged = ~active & (normF <= ftol)
+
+    return X, converged
@@ -61,3 +61,60 @@ def SPnonlineq(f, R, isotopestandards):
     ]
 
     return F
+
+
+def SPjacobian(f, R, isotopestandards):
+    """
+    USAGE: J = SPjacobian(f, R, isotopestandards)
+        Please see calcSPmain.py for definitions of these variables.
+
+    DESCRIPTION:
+        Analytic Jacobian of SPnonlineq with respect to 15Ralpha and 15Rbeta.
+        Like SPnonlineq, it operates on a single row of R, or on all rows at
+        once if f and R are passed in transposed (f.T and R.T).
+
+    INPUT:
+        f = 15Ralpha and 15Rbeta, from left to right.
+        R = array with dimensions n x 6 where n is the number of
+        measurements.  The six columns are 31R, 45R, 46R, D17O, gamma,
+        and kappa, from left to right.
+        isotopestandards = IsotopeStandards class from isotopestandards.py,
+        containing 15RAir, 18RVSMOW, 17RVSMOW, and beta for the 18O/17O relation.
+
+    OUTPUT:
+        J = nested list with dimensions 2 x 2: the partial derivatives of the
+        46R and 31R equations (rows) with respect to 15Ralpha and 15Rbeta
+        (columns).
+    """
+
+    # rename inputted data
+    x = R[0]  # size-corrected 31R
+    y = R[1]  # size-corrected 45R
+    D17O = R[3]
+
+    g = R[4]  # gamma scrambling coefficient
+    k = R[5]  # kappa scrambling coefficient
+
+    beta = isotopestandards.O17beta
+    R17VSMOW = isotopestandards.R17VSMOW
+    R18VSMOW = isotopestandards.R18VSMOW
+
+    r17 = y - f[0] - f[1]  # 17R from the 45R equation
+    r18 = R18VSMOW * ((r17 / R17VSMOW) / (D17O / 1000 + 1)) ** (1 / beta)
+    dr18 = r18 / (beta * r17)  # d(18R)/d(17R)
+
+    # denominator of the 31R equation
+    D = 1 + g * f[0] + (1 - k) * f[1]
+
+    J = [
+        [
+            r17 - (f[0] + f[1]) - dr18 + f[1],
+            r17 - (f[0] + f[1]) - dr18 + f[0],
+        ],
+        [
+            (1 - g) + f[1] - D + (r17 - x) * g,
+            k + f[0] - D + (r17 - x) * (1 - k),
+        ],
+    ]
+
+    return J
@@ -0,0 +1,133 @@
+"""
+File: SProotsolver.py
+---------------------------
+Created on Sat Oct 17th, 2026
+
+Solve for N2O isotopocule values by reducing SPnonlineq to one
+scalar equation per sample, in the sum 15Ralpha + 15Rbeta.
+"""
+
+import numpy as np
+from .bracketroot import bracketroot
+
+
+def SPreducedeq(s, R, isotopestandards):
+    """
+    USAGE: h, a = SPreducedeq(s, R, isotopestandards)
+
+    DESCRIPTION:
+        Reduces the two equations in SPnonlineq to one equation in the sum
+        s = 15Ralpha + 15Rbeta. The 45R equation gives 17R = 45R - s, and the
+        46R equation then gives the product 15Ralpha * 15Rbeta as a function
+        of s alone. With that product known, the 31R equation is linear in
+        15Ralpha, so 15Ralpha and 15Rbeta = s - 15Ralpha follow from s.
+        The residual h is zero when they also reproduce that product.
+        Operates on all rows at once, with R passed in transposed (R.T).
+
+    INPUT:
+        s = 15Ralpha + 15Rbeta
+        R = array with dimensions n x 6 where n is the number of
+        measurements.  The six columns are 31R, 45R, 46R, D17O, gamma,
+        and kappa, from left to right.
+        isotopestandards = IsotopeStandards class from isotopestandards.py,
+        containing 15RAir, 18RVSMOW, 17RVSMOW, and beta for the 18O/17O relation.
+
+    OUTPUT:
+        h = residual of the reduced equation
+        a = 15Ralpha implied by s
+    """
+
+    # rename inputted data
+    x = R[0]  # size-corrected 31R
+    y = R[1]  # size-corrected 45R
+    z = R[2]  # size-corrected 46R
+    D17O = R[3]
+
+    g = R[4]  # gamma scrambling coefficient
+    k = R[5]  # kappa scrambling coefficient
+
+    beta = isotopestandards.O17beta
+    R17VSMOW = isotopestandards.R17VSMOW
+    R18VSMOW = isotopestandards.R18VSMOW
+
+    r17 = y - s  # 45R equation
+    r18 = R18VSMOW * ((r17 / R17VSMOW) / (D17O / 1000 + 1)) ** (1 / beta)
+    ab = z - s * r17 - r18  # 46R equation: 15Ralpha * 15Rbeta
+
+    # 31R equation, with 15Ralpha * 15Rbeta = ab and 15Rbeta = s - 15Ralpha
+    a = -(k * s + ab + (r17 - x) * (1 + (1 - k) * s)) / (
+        (1 - g - k) * (1 + x - r17)
+    )
+
+    h = a * (s - a) - ab
+
+    return h, a
+
+
+def SProotsolver(R, isotopestandards, lb, ub):
+    """
+    USAGE: isol, converged = SProotsolver(R, isotopestandards, lb, ub)
+
+    DESCRIPTION:
+        Solves SPnonlineq for 15Ralpha and 15Rbeta in all rows of R at once,
+        by finding the root of SPreducedeq in s = 15Ralpha + 15Rbeta with
+        bracketroot.py. Since 18R < 46R, 17R can be no larger than the 17R
+        implied by 18R = 46R; this bounds s from below, and 17R > 0 bounds it
+        from above. SPreducedeq decreases monotonically across that bracket,
+        from positive to negative, so each sample has exactly one root in it
+        and needs no initial guess.
+
+    INPUT:
+        :param R: array with dimensions n x 6 where n is the number of
+        measurements.  The six columns are 31R, 45R, 46R, D17O, gamma,
+        and kappa, from left to right.
+        :type R: numpy array, dtype=float
+        :param isotopestandards: IsotopeStandards class from isotopestandards.py,
+        containing 15RAir, 18RVSMOW, 17RVSMOW, and beta for the 18O/17O relation.
+        :type isotopestandards: Class
+        :param lb: lower bounds for 15Ralpha and 15Rbeta
+        :type lb: numpy array, dtype=float
+        :param ub: upper bounds for 15Ralpha and 15Rbeta
+        :type ub: numpy array, dtype=float
+
+    OUTPUT:
+        :returns: isol, converged
+        :param isol: array with dimensions n x 2. The two columns are 15Ralpha
+        and 15Rbeta, from left to right.
+        :type isol: numpy array
+        :param converged: per-row convergence mask. Rows without a root in
+        the bracket, or whose solution lies outside [lb, ub], are False.
+        :type converged: numpy array, dtype=bool
+    """
+    R = np.asarray(R, dtype=float)
+    lb = np.asarray(lb, dtype=float)
+    ub = np.asarray(ub, dtype=float)
+
+    y = R[:, 1]  # size-corrected 45R
+    z = R[:, 2]  # size-corrected 46R
+
+    # 17R when 18R = 46R
+    r17max = (
+        isotopestandards.R17VSMOW
+        * (R[:, 3] / 1000 + 1)
+        * (z / isotopestandards.R18VSMOW) ** isotopestandards.O17beta
+    )
+
+    # bracket for s, narrowed to the bounds on 15Ralpha + 15Rbeta
+    lo = np.maximum(y - r17max, lb.sum())
+    hi = np.minimum(y, ub.sum())
+
+    def residual(s, rows):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return SPreducedeq(s, R[rows].T, isotopestandards)[0]
+
+    s, converged = bracketroot(residual, lo, hi)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        a = SPreducedeq(s, R.T, isotopestandards)[1]
+    isol = np.column_stack([a, s - a])
+
+    inbounds = np.all((isol >= lb) & (isol <= ub), axis=1)
+    converged &= inbounds & np.all(np.isfinite(isol), axis=1)
+
+    return isol, converged
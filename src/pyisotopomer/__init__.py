@@ -1,8 +1,12 @@
 # pyisotopomer: Nitrous oxide isotopocule data corrections in Python
 # Copyright (C) 2021  Colette L Kelly et al.  (MIT License)
 
-from .constants_new import constants_new
+from .constants_new import constants_new, compileconstants
 from .isotopestandards import IsotopeStandards
+from .diagnostics import Diagnostics
+from .workbook import Workbook
+from .preprocessing import preprocess, preprocessworkbook
+from .resultcache import ResultCache
 
 # from .calculate_17R import calculate_17R
 from .calculate_17R_v2 import calculate_17R
@@ -11,6 +15,10 @@ from .algebraic_gk_eqns import algebraic_gk_eqns
 from .automate_gk_solver import automate_gk_solver
 from .scramblinginput import ScramblingInput
 from .parseoutput import parseoutput
+from .forwardmodel import forwardmodel, tracerforwardmodel
+from .montecarlo import montecarlo
+from .bootstrap import bootstrapscrambling
+from .scramblingtimeseries import ScramblingTimeSeries
 from .isotopomerinput import IsotopomerInput
 from .pyisotopomer import Scrambling
 from .pyisotopomer import Isotopomers
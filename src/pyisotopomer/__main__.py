@@ -0,0 +1,12 @@
+"""
+File: __main__.py
+---------------------------
+Created on Sat Oct 17th, 2026
+
+Run the pyisotopomer command with "python -m pyisotopomer".
+"""
+
+import sys
+from .cli import main
+
+sys.exit(main())
@@ -29,6 +29,7 @@ def algebraic_gk_eqns(R, isotopeconstants, ref1, ref2):
 
     DESCRIPTION:
         Sets up equations for gamma and kappa as in Kelly et al. (in revision for RCMS).
+        Operates on all rows of R at once, including the 31R error check.
 
     INPUT:
         :param R: array with dimensions n x 10 where n is the number of reference pairs.
@@ -36,8 +37,10 @@ def algebraic_gk_eqns(R, isotopeconstants, ref1, ref2):
         the same for reference #2, from left to right.
         :type R: numpy array, dtype=float
         :param isotopeconstants: ref_tag, d15Na, and d15Nb of reference materials
-            entered into the "scale_normalization" tab of the excel template
-        :type isotopeconstants: Pandas Dataframe
+            entered into the "scale_normalization" tab of the excel template,
+            or the {ref_tag: (15Ralpha, 15Rbeta)} table compiled from them
+            (see constants_new.compileconstants)
+        :type isotopeconstants: Pandas Dataframe or dict
         :param ref1: string or number containing name of reference material #1,
         as written in constants.csv
         :type ref1: str, int, or float
@@ -56,43 +59,34 @@ def algebraic_gk_eqns(R, isotopeconstants, ref1, ref2):
     # they are specified in the data correction spreadsheet
     a, b, a2, b2 = constants_new(isotopeconstants, ref1, ref2)
 
-    gk = np.zeros((len(R), 4))  # set up numpy array to populate with solutions
+    R = np.asarray(R, dtype=float)
+
+    # rename inputted data; all pairings are solved at once
+    x = R[:, 0]  # size-corrected 31/30 ratio for reference material #1
+    r17 = R[:, 4]  # 17R calculated iteratively from 45R and 46R for reference material #1
+
+    x2 = R[:, 5]  # size-corrected 31/30 ratio for reference material #2
+    r172 = R[:, 9]  # 17R calculated iteratively from 45R and 46R for reference material #2
+
+    # algebraic solutions for gamma and kappa
+    kappa = (
+        (a - x + r17) * (1 + b) / (a * (1 + x - r17))
+        - (a2 - x2 + r172) * (1 + b2) / (a2 * (1 + x2 - r172))
+    ) / (b2 / a2 - b / a)
+    gamma1 = (a + kappa * b + a * b - (x - r17) * (1 + (1 - kappa) * b)) / (
+        a * (1 + x - r17)
+    )
+    gamma2 = (a2 + kappa * b2 + a2 * b2 - (x2 - r172) * (1 + (1 - kappa) * b2)) / (
+        a2 * (1 + x2 - r172)
+    )
 
-    for n in range(len(R)):
-        # I'm still not sure why, but looping through the rows prevents an IndexError
-        row = np.array(R[n][:])
-        # rename inputted data
-        x = row[0]  # size-corrected 31/30 ratio for reference material #1
-        r17 = row[
-            4
-        ]  # 17R calculated iteratively from 45R and 46R for reference material #1
-
-        x2 = row[5]  # size-corrected 31/30 ratio for reference material #2
-        r172 = row[
-            9
-        ]  # 17R calculated iteratively from 45R and 46R for reference material #2
-
-        # algebraic solutions for gamma and kappa
-        kappa = (
-            (a - x + r17) * (1 + b) / (a * (1 + x - r17))
-            - (a2 - x2 + r172) * (1 + b2) / (a2 * (1 + x2 - r172))
-        ) / (b2 / a2 - b / a)
-        gamma1 = (a + kappa * b + a * b - (x - r17) * (1 + (1 - kappa) * b)) / (
-            a * (1 + x - r17)
-        )
-        gamma2 = (a2 + kappa * b2 + a2 * b2 - (x2 - r172) * (1 + (1 - kappa) * b2)) / (
-            a2 * (1 + x2 - r172)
-        )
-
-        # print(gamma1 - gamma2) # the two gamma values should be within machine precision of each other
-
-        error = check31r([gamma1, kappa], row, isotopeconstants, ref1, ref2)
-
-        gk[n][0] = gamma1  # populate numpy array with solutions
-        gk[n][1] = kappa
-        gk[n][
-            2:
-        ] = error  # 31R error for gamma and kappa solutions, (31R_calculated/31Rmeasured - 1)*1000
+    # print(gamma1 - gamma2) # the two gamma values should be within machine precision of each other
+
+    gk = np.zeros((len(R), 4))  # set up numpy array to populate with solutions
+    gk[:, 0] = gamma1
+    gk[:, 1] = kappa
+    # 31R error for gamma and kappa solutions, (31R_calculated/31Rmeasured - 1)*1000
+    gk[:, 2:] = check31r(gk[:, :2], R, isotopeconstants, ref1, ref2)
 
     # return a dataframe of gamma and kappa values, same format as automate_gk_solver.py
     gkdf = pd.DataFrame(gk).rename(
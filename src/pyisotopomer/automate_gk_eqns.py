@@ -34,8 +34,10 @@ def automate_gk_eqns(f, R, isotopeconstants, ref1, ref2, weights):
         the same for reference #2, from left to right.
         :type R: numpy array, dtype=float
         :param isotopeconstants: ref_tag, d15Na, and d15Nb of reference materials
-            entered into the "scale_normalization" tab of the excel template
-        :type isotopeconstants: Pandas Dataframe
+            entered into the "scale_normalization" tab of the excel template,
+            or the {ref_tag: (15Ralpha, 15Rbeta)} table compiled from them
+            (see constants_new.compileconstants)
+        :type isotopeconstants: Pandas Dataframe or dict
         :param ref1: string or number containing name of reference material #1,
         as written in constants.csv
         :type ref1: str, int, or float
@@ -87,3 +89,35 @@ def automate_gk_eqns(f, R, isotopeconstants, ref1, ref2, weights):
     )
 
     return cost
+
+
+def automate_gk_jacobian(f, R, isotopeconstants, ref1, ref2, weights):
+    """
+    Analytic Jacobian of automate_gk_eqns with respect to gamma and kappa.
+
+    USAGE: v = least_squares(automate_gk_eqns, x0, jac=automate_gk_jacobian... args=args)
+        See automate_gk_eqns for arg descriptions.
+
+    OUTPUT:
+        :returns: 2 x 2 array: the partial derivatives of the cost equations for
+        reference #1 and reference #2 (rows) with respect to gamma and kappa (columns).
+    """
+
+    # rename inputted data
+    x = R[0]  # size-corrected 31/30 ratio for reference material #1
+    r17 = R[4]  # 17R calculated iteratively from 45R and 46R for reference material #1
+
+    x2 = R[5]  # size-corrected 31/30 ratio for reference material #2
+    r172 = R[9]  # 17R calculated iteratively from 45R and 46R for reference material #2
+
+    a, b, a2, b2 = constants_new(isotopeconstants, ref1, ref2)
+
+    # the cost equations are linear in gamma and kappa
+    J = np.array(
+        [
+            [weights[0] * a * (r17 - x - 1), weights[0] * b * (1 - r17 + x)],
+            [weights[1] * a2 * (r172 - x2 - 1), weights[1] * b2 * (1 - r172 + x2)],
+        ]
+    )
+
+    return J
@@ -15,12 +15,24 @@ import numpy as np
 from scipy.optimize import least_squares
 from .automate_gk_eqns import (
     automate_gk_eqns,
+    automate_gk_jacobian,
 )  # import alpha and beta values for reference materials
 from .check31r import check31r
+from .parallelsolve import isparallel, parallelsolve
+from .initialguess import gkinitialguess
 
 
 def automate_gk_solver(
-    R, isotopeconstants, ref1, ref2, x0=None, lb=None, ub=None, weights=False
+    R,
+    isotopeconstants,
+    ref1,
+    ref2,
+    x0=None,
+    lb=None,
+    ub=None,
+    weights=False,
+    n_jobs=None,
+    executor=None,
 ):
     """
     Calculate gamma and kappa from measured rR31/30 and r45/44, given known a, b, 17R.
@@ -38,16 +50,29 @@ def automate_gk_solver(
         the same for reference #2, from left to right.
         :type R: numpy array, dtype=float
         :param isotopeconstants: ref_tag, d15Na, and d15Nb of reference materials
-            entered into the "scale_normalization" tab of the excel template
-        :type isotopeconstants: Pandas Dataframe
-        :param x0: initial guess for gamma and kappa (e.g. x0=np.array([0.1, 0.1], dtype=float))
-        :type x0: numpy array, dtype=float
+            entered into the "scale_normalization" tab of the excel template,
+            or the {ref_tag: (15Ralpha, 15Rbeta)} table compiled from them
+            (see constants_new.compileconstants)
+        :type isotopeconstants: Pandas Dataframe or dict
+        :param x0: initial guess for gamma and kappa (e.g. x0=np.array([0.1, 0.1], dtype=float)).
+        May also be an n x 2 array with one guess per pairing, "algebraic" to start
+        each pairing from its algebraic solution, or "previous" to start each
+        pairing from the solution of the pairing before it (see initialguess.py)
+        :type x0: numpy array, dtype=float, or String
         :param lb: lower bounds for solver (e.g. lb=np.array([0.0, 0.0], dtype=float))
         :type lb: numpy array, dtype=float
         :param ub: upper bounds for solver (e.g. ub=np.array([1.0, 1.0], dtype=float))
         :type ub: numpy array, dtype=float
         :param weights: if True, weight each ref. material by variance in its 31R
         :type weights: bool
+        :param n_jobs: number of worker processes to solve chunks of pairings in,
+        or -1 to use every core. If None (default), solve in this process.
+        Cannot be combined with x0="previous", since each chunk would start
+        again from the default guess.
+        :type n_jobs: int
+        :param executor: existing executor (e.g. a ProcessPoolExecutor) to
+        submit chunks of pairings to, instead of starting a new process pool.
+        :type executor: concurrent.futures.Executor
 
     OUTPUT:
         :returns: Pandas DataFrame with dimensions n x 4, where n is the number of measurements.
@@ -59,12 +84,6 @@ def automate_gk_solver(
     #  python: need to set up empty dataframe to which we'll add values
     gk = np.zeros((len(R), 4))  # set up numpy array to populate with solutions
 
-    #  an approximate initial solution: initial guess for gamma and kappa
-    if x0 is not None:  # check if solver has been given an x0 parameter
-        x0 = x0
-    else:
-        x0 = np.array([0.1, 0.1], dtype=float)  # set default x0
-
     #  lower and upperbounds for 15Ralpha and 15Rbeta
     #  these constraints ensure that the solver converges to a solution in the
     #  correct range
@@ -78,6 +97,17 @@ def automate_gk_solver(
     else:
         ub = np.array([1.0, 1.0], dtype=float)
 
+    #  an approximate initial solution: initial guess for gamma and kappa,
+    #  either one guess for all pairings or one guess per pairing
+    x0, previous = gkinitialguess(R, isotopeconstants, ref1, ref2, x0, lb, ub)
+
+    if previous and isparallel(n_jobs, executor):
+        # the first pairing of each chunk would have no previous pairing to start from
+        raise ValueError(
+            'x0="previous" solves the pairings in order and cannot be '
+            "split between worker processes; use n_jobs=None"
+        )
+
     bounds = (lb, ub)
 
     if weights == True:  # if variance kwarg is True, calculate weights
@@ -97,6 +127,27 @@ def automate_gk_solver(
 
         weights = [1.0, 1.0]  # if variance kwarg is False, set weights to 1
 
+    if isparallel(n_jobs, executor):
+        # weights are calculated above from all pairings, not per chunk
+        # per-pairing initial guesses are split into chunks along with R
+        if x0.ndim == 2:
+            guess = dict(rowkwargs={"x0": x0})
+        else:
+            guess = dict(x0=x0)
+        return parallelsolve(
+            automate_gk_solver,
+            R,
+            isotopeconstants,
+            ref1,
+            ref2,
+            lb=lb,
+            ub=ub,
+            weights=weights,
+            n_jobs=n_jobs,
+            executor=executor,
+            **guess,
+        )
+
     #  python: options for solver function are specified in signature as kwargs
 
     #  run leastsquares nonlinear solver for each row of data to obtain alpha
@@ -104,6 +155,12 @@ def automate_gk_solver(
     for n in range(len(R)):
         #  python: scipy.optimize.least_squares instead of matlab "lsqnonlin"
         row = np.array(R[n][:])
+        if previous and n > 0:
+            guess = gk[n - 1, :2]  # start from the solution of the previous pairing
+        elif x0.ndim == 2:
+            guess = x0[n]
+        else:
+            guess = x0
         args = (
             row,
             isotopeconstants,
@@ -112,9 +169,12 @@ def automate_gk_solver(
             weights,
         )
         # v = least_squares(automate_gk_eqns, x0, bounds=bounds,args=args)
+        # gtol is left at its default: a tighter gtol converges to the algebraic
+        # solution, rather than to the minimum close to x0 (see README)
         v = least_squares(
             automate_gk_eqns,
-            x0,
+            guess,
+            jac=automate_gk_jacobian,
             bounds=bounds,
             ftol=1e-15,
             xtol=1e-15,
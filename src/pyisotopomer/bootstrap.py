@@ -0,0 +1,134 @@
+"""
+File: bootstrap.py
+---------------------------
+Created on Sat Oct 17th, 2026
+
+Functions to calculate bootstrap confidence intervals on the mean
+gamma and kappa of a set of reference material pairings.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .parallelsolve import solverpool
+
+
+def resamplemeans(values, starts, counts, nresamples, seed):
+    # mean of each column of values over nresamples two-stage resamples: run
+    # dates are drawn with replacement, then, within each run date drawn,
+    # as many pairings as it has are drawn with replacement. Rows of values
+    # are sorted by run date; starts and counts give the rows of each date.
+    rng = np.random.default_rng(seed)
+
+    dates = rng.integers(len(counts), size=(nresamples, len(counts)))
+    sizes = counts[dates].ravel()
+    rows = np.repeat(starts[dates].ravel(), sizes) + (
+        rng.random(sizes.sum()) * np.repeat(sizes, sizes)
+    ).astype(np.int64)
+
+    # draws of each resample are contiguous, so sum them in one pass
+    total = counts[dates].sum(axis=1)
+    sums = np.add.reduceat(values[rows], np.concatenate([[0], np.cumsum(total)[:-1]]))
+    return sums / total[:, None]
+
+
+def bootstrapscrambling(
+    alloutputs,
+    nresamples=1000,
+    confidence=0.95,
+    seed=None,
+    n_jobs=None,
+    executor=None,
+    batchsize=2000000,
+):
+    """
+    USAGE: ci, resamples = bootstrapscrambling(gk.alloutputs, nresamples=10000)
+
+    DESCRIPTION:
+        Bootstrap confidence intervals on the mean gamma and kappa of all
+        pairings of reference materials. Each resample draws run dates with
+        replacement and, within each run date drawn, draws its pairings with
+        replacement, so that the intervals account for both day-to-day and
+        within-day scatter. The gamma and kappa of each pairing are those
+        already calculated by Scrambling; only the means are recalculated.
+
+        Resamples are drawn in batches of at most batchsize pairings, with
+        numpy array operations, and the batches are spread across worker
+        processes if n_jobs or executor are given. Each batch has its own
+        random seed, spawned from seed, so the result does not depend on
+        the number of workers.
+
+    INPUT:
+        :param alloutputs: table of scrambling coefficients for all pairings,
+        indexed by run date (Scrambling.alloutputs); must have at least one
+        pairing
+        :type alloutputs: Pandas DataFrame
+        :param nresamples: number of bootstrap resamples
+        :type nresamples: int
+        :param confidence: confidence level of the intervals
+        :type confidence: float
+        :param seed: seed for numpy's random number generator
+        :type seed: int
+        :param n_jobs: number of worker processes, or -1 to use every core.
+        If None (default), resample in this process.
+        :type n_jobs: int
+        :param executor: existing executor (e.g. a ProcessPoolExecutor)
+        :type executor: concurrent.futures.Executor
+        :param batchsize: maximum number of pairings drawn in one batch
+        :type batchsize: int
+
+    OUTPUT:
+        :returns: ci, a Pandas DataFrame indexed by "gamma" and "kappa", with
+        the mean over all pairings, the bootstrap standard error, and the lower
+        and upper bounds of the confidence interval; and resamples, a Pandas
+        DataFrame of the mean gamma and kappa of each resample.
+    """
+    scrambling = alloutputs[["gamma", "kappa"]].dropna()
+    if len(scrambling) == 0:
+        raise ValueError(
+            "alloutputs has no pairings with gamma and kappa to resample; "
+            "check that the reference materials were measured on the same run date"
+        )
+
+    # sort pairings by run date, and find the rows of each run date
+    dates, codes = np.unique(scrambling.index.to_numpy(), return_inverse=True)
+    order = np.argsort(codes, kind="stable")
+    values = scrambling.to_numpy(dtype=float)[order]
+    counts = np.bincount(codes, minlength=len(dates))
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+    # number of resamples in each batch, and a seed for each batch
+    perbatch = max(1, batchsize // max(1, len(values)))
+    sizes = [min(perbatch, nresamples - n) for n in range(0, nresamples, perbatch)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    with solverpool(n_jobs, executor) as pool:
+        if pool is None or len(sizes) == 1:
+            batches = [
+                resamplemeans(values, starts, counts, size, s)
+                for size, s in zip(sizes, seeds)
+            ]
+        else:
+            futures = [
+                pool.submit(resamplemeans, values, starts, counts, size, s)
+                for size, s in zip(sizes, seeds)
+            ]
+            batches = [future.result() for future in futures]
+
+    resamples = pd.DataFrame(
+        np.concatenate(batches) if batches else np.empty((0, 2)),
+        columns=["gamma", "kappa"],
+    )
+
+    tail = (1 - confidence) / 2 * 100
+    lower, upper = np.percentile(resamples, [tail, 100 - tail], axis=0)
+    ci = pd.DataFrame(
+        {
+            "mean": scrambling.mean(),
+            "se": resamples.std(),
+            "lower": lower,
+            "upper": upper,
+        }
+    )
+
+    return ci, resamples
@@ -0,0 +1,96 @@
+"""
+File: bracketroot.py
+---------------------------
+Created on Sat Oct 17th, 2026
+
+Vectorized bracketed root-finding for one scalar equation per row.
+"""
+
+import numpy as np
+
+
+def bracketroot(func, lo, hi, xtol=1e-15, maxiter=200):
+    """
+    Find one root per row of a scalar equation, given a bracket for each row.
+
+    USAGE: root, converged = bracketroot(func, lo, hi)
+
+    DESCRIPTION:
+        Runs the Illinois variant of false position on every row at once.
+        Each row falls back to a bisection step whenever its bracket has not
+        halved over the last two steps, so convergence is guaranteed and
+        the number of iterations per row is bounded, as for pure bisection.
+        Rows stop iterating independently once their bracket is narrower
+        than xtol (relative) or their residual is exactly zero.
+
+    INPUT:
+        :param func: residual function, called as func(x, rows), where x holds
+        the current estimate for each row in the integer index array rows.
+        It must return one residual per element of x.
+        :type func: function
+        :param lo: lower end of the bracket for each row
+        :type lo: numpy array, dtype=float
+        :param hi: upper end of the bracket for each row
+        :type hi: numpy array, dtype=float
+        :param xtol: relative bracket width at which a row is converged
+        :type xtol: float
+        :param maxiter: maximum number of iterations
+        :type maxiter: int
+
+    OUTPUT:
+        :returns: root, converged
+        :param root: best estimate of the root for each row
+        :type root: numpy array
+        :param converged: per-row convergence mask. Rows whose residuals at lo
+        and hi have the same sign have no bracketed root and are False.
+        :type converged: numpy array, dtype=bool
+    """
+    a = np.array(lo, dtype=float)
+    b = np.array(hi, dtype=float)
+    allrows = np.arange(len(a))
+
+    fa = func(a, allrows)
+    fb = func(b, allrows)
+
+    # rows with a root at either end of the bracket are already solved
+    root = np.where(fa == 0, a, b)
+    converged = (fa == 0) | (fb == 0)
+
+    # only rows with a sign change have a bracketed root
+    active = (np.sign(fa) * np.sign(fb) < 0) & ~converged
+    width = np.abs(b - a)
+    prevwidth = 2 * width  # bracket widths one and two steps ago
+    prevwidth2 = 4 * width
+
+    for _ in range(maxiter):
+        rows = np.flatnonzero(active)
+        if len(rows) == 0:
+            break
+
+        ra, rb, rfa, rfb = a[rows], b[rows], fa[rows], fb[rows]
+
+        # false position, or bisection if the bracket is shrinking too slowly
+        c = rb - rfb * (rb - ra) / (rfb - rfa)
+        slow = (width[rows] > 0.5 * prevwidth2[rows]) | ~np.isfinite(c)
+        c = np.where(slow, 0.5 * (ra + rb), c)
+        prevwidth2[rows] = prevwidth[rows]
+        prevwidth[rows] = width[rows]
+
+        fc = func(c, rows)
+
+        # c replaces b; if f(c) has the same sign as f(b), a is kept for
+        # another step and its residual is halved (the Illinois step)
+        sameb = np.sign(fc) == np.sign(rfb)
+        newa = np.where(sameb, ra, rb)
+        newfa = np.where(sameb, 0.5 * rfa, rfb)
+        a[rows], fa[rows] = newa, newfa
+        b[rows], fb[rows] = c, fc
+
+        width[rows] = np.abs(c - newa)
+        root[rows] = c
+
+        done = (fc == 0) | (width[rows] <= xtol * np.abs(c))
+        converged[rows[done]] = True
+        active[rows[done]] = False
+
+    return root, converged
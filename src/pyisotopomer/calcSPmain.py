@@ -13,11 +13,23 @@ import pandas as pd
 import numpy as np
 import warnings
 from scipy.optimize import least_squares
-from .SPnonlineq import SPnonlineq
+from .SPnonlineq import SPnonlineq, SPjacobian
+from .SPbatchsolver import SPbatchsolver
+from .SProotsolver import SProotsolver
+from .parallelsolve import isparallel, parallelsolve
+from .initialguess import SPinitialguess
 
 
 def calcSPmain(
-    R, isotopestandards, initialguess=None, lowerbounds=None, upperbounds=None
+    R,
+    isotopestandards,
+    initialguess=None,
+    lowerbounds=None,
+    upperbounds=None,
+    method="least_squares",
+    n_jobs=None,
+    executor=None,
+    cache=None,
 ):
     """
     USAGE: isotoperatios = calcSPmain(R)
@@ -35,14 +47,43 @@ def calcSPmain(
         containing 15RAir, 18RVSMOW, 17RVSMOW, and beta for the 18O/17O relation.
         :type isotopestandards: Class
         :param initialguess: Initial guess for 15Ralpha and 15Rbeta
-        If None, default to [0.0037, 0.0037].
-        :type initialguess: list or Numpy array
+        If None, default to [0.0037, 0.0037]. May also be an n x 2 array with
+        one guess per row, "bulk" to start each row from an estimate based on
+        its 45R and 46R, or "previous" to start each row from the solution of
+        the row before it (see initialguess.py). The "bracketed" method needs
+        no initial guess; the "newton" method starts from the default guess
+        for "previous".
+        :type initialguess: list, Numpy array or String
         :param lowerbounds: Lower bounds for least_squares solver
         If None, default to [0.0, 0.0].
         :type lowerbounds: list or Numpy array
         :param upperbounds: Upper bounds for least_squares solver
         If None, default to [1.0, 1.0].
         :type upperbounds: list or Numpy array
+        :param method: Solver backend. "least_squares" (default) is the
+        reference backend, which runs scipy's least_squares on one row at a time.
+        "newton" solves all rows at once with SPbatchsolver.py; its solutions
+        agree with "least_squares" to within 1e-12 in 15Ralpha and 15Rbeta
+        (3e-7 per mil in d15Nalpha and d15Nbeta). "bracketed" reduces the
+        system to one equation per row in 15Ralpha + 15Rbeta and solves all
+        rows at once with SProotsolver.py; it needs no initial guess and
+        converges within a fixed number of iterations, to the same precision
+        as "newton".
+        Rows that the batched solvers cannot converge are re-solved with
+        "least_squares".
+        :type method: String
+        :param n_jobs: number of worker processes to solve chunks of rows in,
+        or -1 to use every core. If None (default), solve in this process.
+        Cannot be combined with initialguess="previous", since each chunk
+        would start again from the default guess.
+        :type n_jobs: int
+        :param executor: existing executor (e.g. a ProcessPoolExecutor) to
+        submit chunks of rows to, instead of starting a new process pool.
+        :type executor: concurrent.futures.Executor
+        :param cache: ResultCache from resultcache.py. If given, rows that are
+        already in the cache are not solved again, and newly solved rows are
+        added to it.
+        :type cache: Class
     OUTPUT:
         :returns: pandas DataFrame with dimensions n x 45where n is the number of measurements.
         The five columns are 15Ralpha, 15Rbeta, 17R, 18R, and D17O.
@@ -51,11 +92,6 @@ def calcSPmain(
     """
 
     # default arguments
-    # an approximate initial solution: initial guess for 15Ralpha and 15Rbeta
-    if initialguess is not None:
-        x0 = np.array(initialguess, dtype=float)
-    elif initialguess is None:
-        x0 = np.array([0.0037, 0.0037], dtype=float)
     # lower and upperbounds for 15Ralpha and 15Rbeta
     # these constraints ensure that the solver converges to a solution in the
     # correct range
@@ -69,6 +105,36 @@ def calcSPmain(
     elif upperbounds is None:
         ub = np.array([1.0, 1.0], dtype=float)
 
+    # an approximate initial solution: initial guess for 15Ralpha and 15Rbeta,
+    # either one guess for all rows or one guess per row
+    x0, previous = SPinitialguess(R, isotopestandards, initialguess, lb, ub)
+
+    if previous and isparallel(n_jobs, executor):
+        # the first row of each chunk would have no previous row to start from
+        raise ValueError(
+            'initialguess="previous" solves the rows in order and cannot be '
+            "split between worker processes; use n_jobs=None"
+        )
+
+    if cache is None and isparallel(n_jobs, executor):
+        # solve chunks of rows in worker processes, each one in serial;
+        # per-row initial guesses are split into chunks along with R
+        if x0.ndim == 2:
+            guess = dict(rowkwargs={"initialguess": x0})
+        else:
+            guess = dict(initialguess=x0)
+        return parallelsolve(
+            calcSPmain,
+            R,
+            isotopestandards,
+            lowerbounds=lb,
+            upperbounds=ub,
+            method=method,
+            n_jobs=n_jobs,
+            executor=executor,
+            **guess,
+        )
+
     beta = isotopestandards.O17beta
     R17VSMOW = isotopestandards.R17VSMOW
     R18VSMOW = isotopestandards.R18VSMOW
@@ -79,23 +145,75 @@ def calcSPmain(
 
     bounds = (lb, ub)
 
+    if cache is not None:
+        # look up each row in the cache; only the rows that aren't found are
+        # solved (in worker processes, if n_jobs or executor are given)
+        keys = cache.makekeys(
+            R,
+            isotopestandards,
+            solver="calcSPmain",
+            method=method,
+            initialguess="previous" if previous else x0,
+            lowerbounds=lb,
+            upperbounds=ub,
+        )
+        isol, hit = cache.lookup(keys)
+        miss = np.flatnonzero(~hit)
+        if len(miss) > 0:
+            solved = calcSPmain(
+                R[miss],
+                isotopestandards,
+                initialguess=x0[miss] if x0.ndim == 2 else ("previous" if previous else x0),
+                lowerbounds=lb,
+                upperbounds=ub,
+                method=method,
+                n_jobs=n_jobs,
+                executor=executor,
+            )
+            isol[miss] = solved[["15Ralpha", "15Rbeta"]].to_numpy()
+            cache.store([keys[n] for n in miss], isol[miss])
+        unsolved = []
+    elif method == "newton":
+        # solve all rows at once; only rows that fail to converge are
+        # handed on to the row-by-row least squares solver below
+        isol, converged = SPbatchsolver(R, isotopestandards, x0, lb, ub)
+        unsolved = np.flatnonzero(~converged)
+    elif method == "bracketed":
+        isol, converged = SProotsolver(R, isotopestandards, lb, ub)
+        unsolved = np.flatnonzero(~converged)
+    elif method == "least_squares":
+        unsolved = range(len(R))
+    else:
+        raise ValueError(
+            f"method must be 'least_squares', 'newton' or 'bracketed', not {method!r}"
+        )
+
     #  python: options for solver function are specified in signature as kwargs
 
     #  run leastsquares nonlinear solver for each row of data to obtain alpha
     #  and beta
-    for n in range(len(R)):
+    for n in unsolved:
         #  python: scipy.optimize.least_squares instead of matlab "lsqnonlin"
         row = np.array(R[n][:])
         args = (row, isotopestandards)
+        if previous and n > 0 and isol[n - 1].sum() < row[1]:
+            # start from the solution of the previous row, if it leaves 17R > 0
+            guess = isol[n - 1]
+        elif x0.ndim == 2:
+            guess = x0[n]
+        else:
+            guess = x0
         try:  # try different initial guesses to account for samples w/ extreme delta values
             with warnings.catch_warnings():  # suppress RuntimeWarning when it can't find a solution
                 warnings.simplefilter("ignore")
                 v = least_squares(
                     SPnonlineq,
-                    x0,
+                    guess,
+                    jac=SPjacobian,
                     bounds=bounds,
                     ftol=1e-15,
                     xtol=1e-15,
+                    gtol=1e-15,
                     max_nfev=2000,
                     args=args,
                 )
@@ -104,9 +222,11 @@ def calcSPmain(
             v = least_squares(
                 SPnonlineq,
                 np.array([0.0, 0.0]),
+                jac=SPjacobian,
                 bounds=bounds,
                 ftol=1e-15,
                 xtol=1e-15,
+                gtol=1e-15,
                 max_nfev=2000,
                 args=args,
             )
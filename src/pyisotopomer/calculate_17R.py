@@ -13,6 +13,7 @@ both 45R and 46R to use in scrambling calculation.
 # import utils
 import pandas as pd
 import numpy as np
+from .diagnostics import Diagnostics
 
 # for solving equations for 15R and 17R
 from scipy.optimize import least_squares
@@ -49,6 +50,28 @@ def bulknonlineq(f, R, isotopestandards):
     return F
 
 
+def bulkjacobian(f, R, isotopestandards):
+    """
+    Analytic Jacobian of bulknonlineq with respect to 15Rav and 17R.
+    """
+
+    D17O = R[3]
+
+    beta = isotopestandards.O17beta
+    R17VSMOW = isotopestandards.R17VSMOW
+    R18VSMOW = isotopestandards.R18VSMOW
+
+    r18 = R18VSMOW * ((f[1] / R17VSMOW) / (D17O / 1000 + 1)) ** (1 / beta)
+    dr18 = r18 / (beta * f[1])  # d(18R)/d(17R)
+
+    J = [
+        [2, 1],  # 45R equation
+        [2 * f[1] + 2 * f[0], dr18 + 2 * f[0]],  # 46R equation
+    ]
+
+    return J
+
+
 def calcdeltabulk(isol, isotopestandards):
     """
     Convert 15Rav, 18R and 17R to delta values.
@@ -73,7 +96,7 @@ def calcdeltabulk(isol, isotopestandards):
     return deltaVals
 
 
-def calculate_17R(R, isotopestandards):
+def calculate_17R(R, isotopestandards, diagnostics=None):
     """
     USAGE: r17array = calculate_17R(sizecorrected, isotopestandards)
 
@@ -90,6 +113,10 @@ def calculate_17R(R, isotopestandards):
         :param IsotopeStandards: IsotopeStandards class from isotopestandards.py,
         containing 15RAir, 18RVSMOW, 17RVSMOW, and beta for the 18O/17O relation.
         :type isotopestandards: Class
+        :param diagnostics: Diagnostics object from diagnostics.py, to which the
+        normalized_ratios and normalized_deltas tables are added. If None,
+        both tables are written to .csv files in the current working directory.
+        :type diagnostics: Class
 
     OUTPUT:
         :param isol: array with dimensions n x 2, where n is the number of
@@ -100,6 +127,11 @@ def calculate_17R(R, isotopestandards):
     @author: Colette L. Kelly (clkelly@stanford.edu).
     """
 
+    # without a Diagnostics object, write tables out straight away, as before
+    flush = diagnostics is None
+    if diagnostics is None:
+        diagnostics = Diagnostics()
+
     x0 = np.array([0.0036765, 0.0003799])  # initial guess for 15Rav and 17R
 
     isol = np.zeros((len(R), 2))  # set up numpy array to populate with solutions.
@@ -118,9 +150,11 @@ def calculate_17R(R, isotopestandards):
         v = least_squares(
             bulknonlineq,
             x0,
+            jac=bulkjacobian,
             bounds=([0, 0], [1, 1]),
             ftol=1e-15,
             xtol=1e-15,
+            gtol=1e-15,
             max_nfev=2000,
             args=args,
             verbose=0,
@@ -130,20 +164,26 @@ def calculate_17R(R, isotopestandards):
         #  first column is 15Rav, second column is 17R
         isol[n][:] = v.x
 
-    # convert to Pandas DataFrame to save out - is this necessary?
-    saveout = pd.DataFrame(isol).rename(columns={0: "15Rbulk", 1: "17R"})
+    if diagnostics.enabled:
+        # convert to Pandas DataFrame to save out - is this necessary?
+        saveout = pd.DataFrame(isol).rename(columns={0: "15Rbulk", 1: "17R"})
 
-    saveout["D17O"] = R[:, 3]
+        saveout["D17O"] = R[:, 3]
 
-    # calculate r18 from r17
-    saveout["18R"] = R18VSMOW * (
-        (saveout["17R"] / R17VSMOW) / (saveout["D17O"] / 1000 + 1)
-    ) ** (
-        1 / beta
-    )  # 18R expressed in terms of 17R
+        # calculate r18 from r17
+        saveout["18R"] = R18VSMOW * (
+            (saveout["17R"] / R17VSMOW) / (saveout["D17O"] / 1000 + 1)
+        ) ** (
+            1 / beta
+        )  # 18R expressed in terms of 17R
+
+        diagnostics.add("normalized_ratios", saveout)  # saveout isotope ratios
+        # want the delta values as check values; only calculated if they are written out
+        diagnostics.add(
+            "normalized_deltas", lambda: calcdeltabulk(saveout, isotopestandards)
+        )
 
-    saveout.to_csv("normalized_ratios.csv")  # saveout isotope ratios to .csv file
-    # want the delta values as check values
-    calcdeltabulk(saveout, isotopestandards).to_csv("normalized_deltas.csv")
+    if flush:
+        diagnostics.flush()
 
     return isol
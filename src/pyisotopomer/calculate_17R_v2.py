@@ -14,9 +14,12 @@ scrambling calculation.
 # import utils
 import pandas as pd
 import numpy as np
+from .diagnostics import Diagnostics
+from .parallelsolve import isparallel, parallelsolve
 
 # for solving equations for 15R and 17R
 from scipy.optimize import least_squares
+from .bracketroot import bracketroot
 
 
 def bulknonlineq(f, R, isotopestandards):
@@ -50,6 +53,52 @@ def bulknonlineq(f, R, isotopestandards):
     return F
 
 
+def bulkjacobian(f, R, isotopestandards):
+    """
+    Analytic Jacobian of bulknonlineq with respect to 15Rav and 18R.
+    """
+
+    D17O = R[3]
+
+    beta = isotopestandards.O17beta
+    R17VSMOW = isotopestandards.R17VSMOW
+    R18VSMOW = isotopestandards.R18VSMOW
+
+    r17 = R17VSMOW * ((f[1] / R18VSMOW) ** beta) * (D17O / 1000 + 1)
+    dr17 = beta * r17 / f[1]  # d(17R)/d(18R)
+
+    J = [
+        [2, dr17],  # 45R equation
+        [2 * r17 + 2 * f[0], 1 + 2 * f[0] * dr17],  # 46R equation
+    ]
+
+    return J
+
+
+def bulkreducedeq(r18, R, isotopestandards):
+    """
+    Equation in 18R alone, after eliminating 15Rav with the 45R equation.
+    Operates on all rows at once, with R passed in transposed (R.T).
+    Returns the 46R residual, 15Rav and 17R.
+    """
+
+    y = R[1]  # size-corrected 45R
+    z = R[2]  # size-corrected 46R
+    D17O = R[3]
+
+    beta = isotopestandards.O17beta
+    R17VSMOW = isotopestandards.R17VSMOW
+    R18VSMOW = isotopestandards.R18VSMOW
+
+    r17 = R17VSMOW * ((r18 / R18VSMOW) ** beta) * (D17O / 1000 + 1)
+    r15 = (y - r17) / 2  # 45R = 2*15R + 17R
+
+    # 46R ~ 18R + 2*15R*17R + 15R^2
+    F = r18 + 2 * r15 * r17 + r15**2 - z
+
+    return F, r15, r17
+
+
 def calcdeltabulk(isol, isotopestandards):
     """
     Convert 15Rav, 18R and 17R to delta values.
@@ -74,7 +123,14 @@ def calcdeltabulk(isol, isotopestandards):
     return deltaVals
 
 
-def calculate_17R(R, isotopestandards):
+def calculate_17R(
+    R,
+    isotopestandards,
+    method="bracketed",
+    diagnostics=None,
+    n_jobs=None,
+    executor=None,
+):
     """
     USAGE: r17array = calculate_17R(sizecorrected, isotopestandards)
 
@@ -91,15 +147,36 @@ def calculate_17R(R, isotopestandards):
         :param IsotopeStandards: IsotopeStandards class from isotopestandards.py,
         containing 15RAir, 18RVSMOW, 17RVSMOW, and beta for the 18O/17O relation.
         :type isotopestandards: Class
+        :param method: "bracketed" (default) solves the 46R equation for 18R in
+        all rows at once, with 15Rbulk taken from 18R via the 45R equation.
+        18R lies between 0 and 46R, and the 46R equation changes sign once
+        across that bracket. "least_squares" solves both equations with scipy's
+        least_squares, one row at a time. The two agree to within 1e-12.
+        :type method: String
+        :param diagnostics: Diagnostics object from diagnostics.py, to which the
+        normalized_ratios and normalized_deltas tables are added. If None,
+        both tables are written to .csv files in the current working directory.
+        :type diagnostics: Class
+        :param n_jobs: number of worker processes to solve chunks of rows in,
+        or -1 to use every core. If None (default), solve in this process.
+        :type n_jobs: int
+        :param executor: existing executor (e.g. a ProcessPoolExecutor) to
+        submit chunks of rows to, instead of starting a new process pool.
+        :type executor: concurrent.futures.Executor
 
     OUTPUT:
-        :param isol: array with dimensions n x 2, where n is the number of
-        measurements. The two columns are the estimated 15Rbulk and 17R,
+        :param r17array: array with dimensions n x 3, where n is the number of
+        measurements. The three columns are the estimated 15Rbulk, 18R and 17R,
         from left to right.
-        :type isol: Numpy array
+        :type r17array: Numpy array
 
     @author: Colette L. Kelly (clkelly@stanford.edu).
     """
+
+    # without a Diagnostics object, write tables out straight away, as before
+    flush = diagnostics is None
+    if diagnostics is None:
+        diagnostics = Diagnostics()
     x0 = np.array(
         [0.0036765, 0.002094030360]
     )  # 18R initial guess is that of atmospheric N2O
@@ -111,18 +188,52 @@ def calculate_17R(R, isotopestandards):
     R17VSMOW = isotopestandards.R17VSMOW
     R18VSMOW = isotopestandards.R18VSMOW
 
+    if isparallel(n_jobs, executor):
+        # solve chunks of rows in worker processes, each one in serial;
+        # the diagnostics tables are built below, from all rows at once
+        isol = parallelsolve(
+            calculate_17R,
+            R,
+            isotopestandards,
+            method=method,
+            diagnostics=Diagnostics(mode="off"),
+            n_jobs=n_jobs,
+            executor=executor,
+        )[:, :2]
+        unsolved = []
+    elif method == "bracketed":
+        R = np.asarray(R, dtype=float)
+
+        def residual(r18, rows):
+            return bulkreducedeq(r18, R[rows].T, isotopestandards)[0]
+
+        # 18R can be no larger than 46R
+        r18, converged = bracketroot(residual, np.zeros(len(R)), R[:, 2])
+        isol[:, 0] = bulkreducedeq(r18, R.T, isotopestandards)[1]
+        isol[:, 1] = r18
+        unsolved = np.flatnonzero(~converged)
+    elif method == "least_squares":
+        unsolved = range(len(R))
+    else:
+        raise ValueError(
+            f"method must be 'bracketed' or 'least_squares', not {method!r}"
+        )
+
     #  run leastsquares nonlinear solver for each row of data to obtain 15Rav and 17R
+    #  (for the "bracketed" method, only rows without a bracketed root)
 
-    for n in range(len(R)):
+    for n in unsolved:
         row = np.array(R[n][:])
         args = (row, isotopestandards)
 
         v = least_squares(
             bulknonlineq,
             x0,
+            jac=bulkjacobian,
             bounds=([0, 0], [1, 1]),
             ftol=1e-15,
             xtol=1e-15,
+            gtol=1e-15,
             max_nfev=2000,
             args=args,
             verbose=0,
@@ -139,18 +250,24 @@ def calculate_17R(R, isotopestandards):
     r17array[:, 1] = isol[:, 1]
     r17array[:, 2] = R17VSMOW * ((isol[:, 1] / R18VSMOW) ** beta) * (R[:, 3] / 1000 + 1)
 
-    # convert to Pandas DataFrame to save out
-    saveout = pd.DataFrame(isol).rename(columns={0: "15Rbulk", 1: "18R"})
+    if diagnostics.enabled:
+        # convert to Pandas DataFrame to save out
+        saveout = pd.DataFrame(isol).rename(columns={0: "15Rbulk", 1: "18R"})
+
+        saveout["D17O"] = R[:, 3]
 
-    saveout["D17O"] = R[:, 3]
+        # calculate r17 from r18
+        saveout["17R"] = (
+            R17VSMOW * ((saveout["18R"] / R18VSMOW) ** beta) * (saveout["D17O"] / 1000 + 1)
+        )
 
-    # calculate r17 from r18
-    saveout["17R"] = (
-        R17VSMOW * ((saveout["18R"] / R18VSMOW) ** beta) * (saveout["D17O"] / 1000 + 1)
-    )
+        diagnostics.add("normalized_ratios", saveout)  # saveout isotope ratios
+        # want the delta values as check values; only calculated if they are written out
+        diagnostics.add(
+            "normalized_deltas", lambda: calcdeltabulk(saveout, isotopestandards)
+        )
 
-    saveout.to_csv("normalized_ratios.csv")  # saveout isotope ratios to .csv file
-    # want the delta values as check values
-    calcdeltabulk(saveout, isotopestandards).to_csv("normalized_deltas.csv")
+    if flush:
+        diagnostics.flush()
 
     return r17array
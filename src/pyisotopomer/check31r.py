@@ -30,15 +30,17 @@ def check31r(f, R, isotopeconstants, ref1, ref2):
         compares calculated 31R to measured 31R used to calculate gamma and kappa.
 
     INPUT:
-        :param f: gamma and kappa
-        :type f: list
+        :param f: gamma and kappa, for one pairing or with dimensions n x 2
+        :type f: list or numpy array
         :param R: array with dimensions n x 10 where n is the number of reference pairs.
         The six columns are 31R, 45R, 46R, 15Rbulk, and 17R for reference #1, then
         the same for reference #2, from left to right.
         :type R: numpy array, dtype=float
         :param isotopeconstants: ref_tag, d15Na, and d15Nb of reference materials
-            entered into the "scale_normalization" tab of the excel template
-        :type isotopeconstants: Pandas Dataframe
+            entered into the "scale_normalization" tab of the excel template,
+            or the {ref_tag: (15Ralpha, 15Rbeta)} table compiled from them
+            (see constants_new.compileconstants)
+        :type isotopeconstants: Pandas Dataframe or dict
         :param ref1: string or number containing name of reference material #1,
         as written in constants.csv
         :type ref1: str, int, or float
@@ -47,17 +49,23 @@ def check31r(f, R, isotopeconstants, ref1, ref2):
         :type ref1: str, int, or float
 
     OUTPUT:
-        :returns: Numpy Array with dimensions n x 2 where n is the number of measurements.
+        :returns: Numpy Array with dimensions n x 2 where n is the number of measurements
+        (or of length 2, for a single pairing).
         The two columns are 31R error for ref 1 and ref 2, equal to (31R_calculated/31Rmeasured - 1)*1000
 
     @author: Colette L. Kelly (clkelly@stanford.edu).
     """
+    # works on one pairing (f of length 2, R of length 10) or on all pairings
+    # at once (f with dimensions n x 2, R with dimensions n x 10)
+    f = np.asarray(f, dtype=float)
+    R = np.asarray(R, dtype=float)
+
     # rename inputted data
-    x = R[0]  # size-corrected 31/30 ratio for reference material #1
-    r17 = R[4]  # 17R calculated iteratively from 45R and 46R for reference material #1
+    x = R[..., 0]  # size-corrected 31/30 ratio for reference material #1
+    r17 = R[..., 4]  # 17R calculated iteratively from 45R and 46R for reference material #1
 
-    x2 = R[5]  # size-corrected 31/30 ratio for reference material #2
-    r172 = R[9]  # 17R calculated iteratively from 45R and 46R for reference material #2
+    x2 = R[..., 5]  # size-corrected 31/30 ratio for reference material #2
+    r172 = R[..., 9]  # 17R calculated iteratively from 45R and 46R for reference material #2
 
     # these are the alpha and beta values for the two reference materials
     # they are specified in the data correction spreadsheet
@@ -65,27 +73,20 @@ def check31r(f, R, isotopeconstants, ref1, ref2):
 
     # solve two equations with two unknowns
     # f[0] = gamma, and f[1] = kappa
-    
+    g = f[..., 0]
+    k = f[..., 1]
+
     calculated31r = [  # calculate 31R from gamma, kappa, 15Ralpha, 15Rbeta, and 17R in eqn. (10)
-            (
-                (1 - f[0]) * a
-                + f[1] * b
-                + a * b
-                + (r17) * (1 + f[0] * a + (1 - f[1]) * b)
-            )
-            / (1 + f[0] * a + (1 - f[1]) * b),
-            (
-                (1 - f[0]) * a2
-                + f[1] * b2
-                + a2 * b2
-                + (r172) * (1 + f[0] * a2 + (1 - f[1]) * b2)
-            )
-            / (1 + f[0] * a2 + (1 - f[1]) * b2),
-        ]
+        ((1 - g) * a + k * b + a * b + (r17) * (1 + g * a + (1 - k) * b))
+        / (1 + g * a + (1 - k) * b),
+        ((1 - g) * a2 + k * b2 + a2 * b2 + (r172) * (1 + g * a2 + (1 - k) * b2))
+        / (1 + g * a2 + (1 - k) * b2),
+    ]
 
     # express 31R error in per mil, where 31R error = (31R_calculated/31Rmeasured - 1)*1000
-    error = np.array(
-        [(calculated31r[0] / x - 1) * 1000, (calculated31r[1] / x2 - 1) * 1000]
+    error = np.stack(
+        [(calculated31r[0] / x - 1) * 1000, (calculated31r[1] / x2 - 1) * 1000],
+        axis=-1,
     )
 
     return error
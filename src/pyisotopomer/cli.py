@@ -0,0 +1,423 @@
+"""
+File: cli.py
+---------------------------
+Created on Sat Oct 17th, 2026
+
+Command-line interface to run Scrambling, Isotopomers and Tracers
+on many template files at once.
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from .diagnostics import Diagnostics
+from .workbook import openworkbook
+from .preprocessing import preprocessworkbook
+
+# file extensions picked up when a directory of templates is given
+TEMPLATES = (".xlsx", ".xlsm", ".xls")
+
+# name of the output file written for each template, and its extension
+OUTPUTS = {
+    "scrambling": ("scrambling_output", ".xlsx"),
+    "isotopomers": ("isotopeoutput", ".csv"),
+    "tracers": ("traceroutput", ".csv"),
+}
+
+
+def findinputs(paths):
+    # expand globs and directories into a sorted list of template files,
+    # skipping excel lock files (~$...) and pyisotopomer's own outputs
+    found = []
+    for path in paths:
+        matches = sorted(glob.glob(path)) or [path]
+        for match in matches:
+            if os.path.isdir(match):
+                found.extend(
+                    os.path.join(match, name)
+                    for name in sorted(os.listdir(match))
+                    if name.endswith(TEMPLATES)
+                    and not name.startswith("~$")
+                    and not any(output in name for output, ext in OUTPUTS.values())
+                )
+            else:
+                found.append(match)
+
+    # keep the first occurrence of each file
+    return list(dict.fromkeys(found))
+
+
+def outputname(command, inputfile, outdir=None):
+    # e.g. data/run1.xlsx -> data/run1_scrambling_output.xlsx
+    name, ext = OUTPUTS[command]
+    stem = os.path.splitext(os.path.basename(inputfile.rstrip(os.sep)))[0]
+    directory = outdir if outdir is not None else os.path.dirname(inputfile)
+    return os.path.join(directory, f"{stem}_{name}{ext}")
+
+
+def runfile(command, inputfile, outputfile, kwargs, diagnostics=None, preprocess=False):
+    """
+    Run one command on one template file, and time each stage.
+
+    USAGE: summary = runfile("isotopomers", "run1.xlsx", "run1_isotopeoutput.csv", {})
+
+    DESCRIPTION:
+        Reads the template (stage "read"), pre-processing its raw data
+        first if preprocess is True, solves it with Scrambling,
+        Isotopomers or Tracers (stage "solve"), and saves the output (stage
+        "write"). Any error is caught and reported in the summary, so that
+        one bad file doesn't stop the others from being processed.
+
+    INPUT:
+        :param command: "scrambling", "isotopomers" or "tracers"
+        :type command: String
+        :param inputfile: template file to process
+        :type inputfile: String
+        :param outputfile: output file to write
+        :type outputfile: String
+        :param kwargs: keyword arguments for Scrambling, Isotopomers or Tracers
+        :type kwargs: dict
+        :param diagnostics: directory to write intermediate tables to, in a
+        subdirectory named after the template. If None, they are not kept.
+        :type diagnostics: String
+        :param preprocess: if True, calculate the size-corrected 31R, 45R and
+        46R from the raw Isodat data in the template (see preprocessing.py)
+        :type preprocess: Bool
+
+    OUTPUT:
+        :returns: dict with the file, command, status ("ok" or "failed"),
+        number of rows processed, seconds spent in each stage, output file, and
+        the error, if any.
+    """
+    # import here, so that workers only load the solvers they need
+    from .pyisotopomer import Scrambling, Isotopomers, Tracers
+
+    summary = dict(
+        file=inputfile,
+        command=command,
+        status="ok",
+        rows=0,
+        read_s=0.0,
+        solve_s=0.0,
+        write_s=0.0,
+        output=outputfile,
+        error="",
+    )
+    stage = "read"
+    workbook = None
+
+    try:
+        if diagnostics is not None:
+            stem = os.path.splitext(os.path.basename(inputfile.rstrip(os.sep)))[0]
+            path = os.path.join(diagnostics, stem)
+            os.makedirs(path, exist_ok=True)
+            diagnostics = Diagnostics(mode="write", path=path)
+        else:
+            diagnostics = Diagnostics(mode="off")
+
+        start = time.perf_counter()
+        workbook = openworkbook(inputfile)
+        if preprocess:
+            workbook, scalefactors = preprocessworkbook(workbook)
+        summary["read_s"] = time.perf_counter() - start
+
+        stage = "solve"
+        start = time.perf_counter()
+        if command == "scrambling":
+            result = Scrambling(
+                workbook, saveout=False, diagnostics=diagnostics, **kwargs
+            )
+            summary["rows"] = len(result.alloutputs)
+        elif command == "isotopomers" and kwargs.get("chunksize") is not None:
+            # chunks are saved out as they are solved
+            result = Isotopomers(
+                workbook, outputfile=outputfile, diagnostics=diagnostics, **kwargs
+            )
+            summary["rows"] = result.nrows
+        elif command == "isotopomers":
+            result = Isotopomers(
+                workbook, saveout=False, diagnostics=diagnostics, **kwargs
+            )
+            summary["rows"] = result.nrows
+        elif command == "tracers":
+            result = Tracers(
+                workbook,
+                saveout=False,
+                outputfile=outputfile,
+                diagnostics=diagnostics,
+                **kwargs,
+            )
+            summary["rows"] = len(result.deltavals)
+        else:
+            raise ValueError(f"unknown command {command!r}")
+        summary["solve_s"] = time.perf_counter() - start
+
+        stage = "write"
+        start = time.perf_counter()
+        if command == "scrambling":
+            result.saveoutput(
+                outputfile,
+                layout=kwargs.get("layout", "sheets"),
+                streaming=kwargs.get("streaming", False),
+            )
+        elif kwargs.get("chunksize") is None:
+            result.saveoutput(result.deltavals, outputfile)
+        summary["write_s"] = time.perf_counter() - start
+
+    except Exception as e:
+        summary["status"] = "failed"
+        summary["output"] = ""
+        summary["error"] = f"{stage}: {type(e).__name__}: {e}"
+        traceback.print_exc()
+
+    finally:
+        # release the template, so that a long batch doesn't hold every file open
+        if workbook is not None:
+            workbook.close()
+
+    return summary
+
+
+def runfiles(
+    command, inputfiles, kwargs, outdir=None, jobs=1, diagnostics=None, preprocess=False
+):
+    """
+    Run one command on many template files, jobs files at a time.
+
+    USAGE: summary = runfiles("isotopomers", ["run1.xlsx", "run2.xlsx"], {}, jobs=2)
+
+    DESCRIPTION:
+        Calls runfile on each template, in a ProcessPoolExecutor with jobs
+        workers if jobs > 1, or in this process if jobs is 1. Rows of the
+        summary are in the order of inputfiles. A worker that dies is
+        reported as a failure of the file it was processing.
+
+    INPUT:
+        :param command: "scrambling", "isotopomers" or "tracers"
+        :type command: String
+        :param inputfiles: template files to process
+        :type inputfiles: list of Strings
+        :param kwargs: keyword arguments for Scrambling, Isotopomers or Tracers
+        :type kwargs: dict
+        :param outdir: directory to write outputs to. If None, write each
+        output next to its template.
+        :type outdir: String
+        :param jobs: number of files to process at once, or -1 to use every core
+        :type jobs: int
+        :param diagnostics: directory to write intermediate tables to
+        :type diagnostics: String
+        :param preprocess: if True, pre-process the raw data in each template
+        :type preprocess: Bool
+
+    OUTPUT:
+        :returns: Pandas DataFrame with one row per file: the file, command,
+        status, number of rows processed, seconds spent reading, solving and
+        writing, output file, and error, if any.
+    """
+    if outdir is not None:
+        os.makedirs(outdir, exist_ok=True)
+
+    tasks = [
+        (
+            command,
+            inputfile,
+            outputname(command, inputfile, outdir),
+            kwargs,
+            diagnostics,
+            preprocess,
+        )
+        for inputfile in inputfiles
+    ]
+
+    if jobs == -1:
+        jobs = os.cpu_count() or 1
+
+    if jobs == 1 or len(tasks) <= 1:
+        summaries = [runfile(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as pool:
+            futures = [pool.submit(runfile, *task) for task in tasks]
+            summaries = []
+            for task, future in zip(tasks, futures):
+                try:
+                    summaries.append(future.result())
+                except Exception as e:  # e.g. a worker killed by the OS
+                    summaries.append(
+                        dict(
+                            file=task[1],
+                            command=command,
+                            status="failed",
+                            rows=0,
+                            read_s=0.0,
+                            solve_s=0.0,
+                            write_s=0.0,
+                            output="",
+                            error=f"{type(e).__name__}: {e}",
+                        )
+                    )
+
+    summary = pd.DataFrame(
+        summaries,
+        columns=[
+            "file",
+            "command",
+            "status",
+            "rows",
+            "read_s",
+            "solve_s",
+            "write_s",
+            "output",
+            "error",
+        ],
+    )
+    summary["total_s"] = summary[["read_s", "solve_s", "write_s"]].sum(axis=1)
+    return summary
+
+
+def parser():
+    # argument parser for the pyisotopomer command
+    parser = argparse.ArgumentParser(
+        prog="pyisotopomer",
+        description="Nitrous oxide isotopocule data corrections for many template files at once.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    # arguments shared by all three commands
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "inputs",
+        nargs="+",
+        help="template files, glob patterns (e.g. 'runs/*.xlsx') or directories of templates",
+    )
+    common.add_argument(
+        "-o",
+        "--outdir",
+        help="directory to write outputs to (default: next to each template)",
+    )
+    common.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="number of files to process at once, or -1 to use every core (default: 1)",
+    )
+    common.add_argument(
+        "--summary",
+        default="pyisotopomer_summary.csv",
+        help="summary table of rows processed, time per stage and failures "
+        "(default: pyisotopomer_summary.csv)",
+    )
+    common.add_argument(
+        "--diagnostics",
+        help="directory to write intermediate tables to, one subdirectory per template",
+    )
+    common.add_argument(
+        "--preprocess",
+        action="store_true",
+        help=(
+            "calculate size-corrected 31R, 45R and 46R from the raw Isodat data "
+            "first, with the scale normalization factors entered in the template"
+        ),
+    )
+    common.add_argument("--tabname", help="sheet to read the data from")
+    common.add_argument("--method", help="solver method")
+    for name in ("initialguess", "lowerbounds", "upperbounds"):
+        common.add_argument(f"--{name}", nargs=2, type=float, metavar=("A", "B"))
+    for name in ("O17beta", "R15Air", "R17VSMOW", "R18VSMOW"):
+        common.add_argument(f"--{name}", type=float)
+
+    scrambling = subparsers.add_parser(
+        "scrambling", parents=[common], help="calculate scrambling coefficients"
+    )
+    scrambling.add_argument(
+        "--refs", nargs="+", help="reference materials to pair up, e.g. ATM S2 B6"
+    )
+    scrambling.add_argument(
+        "--weights", action="store_true", help="weight the least squares solver"
+    )
+    scrambling.add_argument(
+        "--layout", choices=["sheets", "long"], default="sheets", help="output layout"
+    )
+    scrambling.add_argument(
+        "--streaming", action="store_true", help="write the output one row at a time"
+    )
+
+    isotopomers = subparsers.add_parser(
+        "isotopomers", parents=[common], help="calculate isotopomers"
+    )
+    isotopomers.add_argument(
+        "--chunksize", type=int, help="solve and save out chunks of at most this many rows"
+    )
+
+    subparsers.add_parser(
+        "tracers", parents=[common], help="calculate isotopomers of 15N-labeled samples"
+    )
+
+    return parser
+
+
+def main(argv=None):
+    """
+    Entry point of the pyisotopomer command.
+
+    USAGE: pyisotopomer isotopomers "runs/*.xlsx" --jobs 4 --outdir output
+    """
+    args = parser().parse_args(argv)
+
+    kwargs = {}
+    for name in (
+        "tabname",
+        "method",
+        "initialguess",
+        "lowerbounds",
+        "upperbounds",
+        "O17beta",
+        "R15Air",
+        "R17VSMOW",
+        "R18VSMOW",
+        "weights",
+        "layout",
+        "streaming",
+        "chunksize",
+    ):
+        value = getattr(args, name, None)
+        if value is not None:
+            kwargs[name] = value
+    for n, ref in enumerate(getattr(args, "refs", None) or [], start=1):
+        kwargs[f"ref{n}"] = ref
+
+    inputfiles = findinputs(args.inputs)
+    if len(inputfiles) == 0:
+        print("no template files found")
+        return 1
+
+    summary = runfiles(
+        args.command,
+        inputfiles,
+        kwargs,
+        outdir=args.outdir,
+        jobs=args.jobs,
+        diagnostics=args.diagnostics,
+        preprocess=args.preprocess,
+    )
+    summary.to_csv(args.summary, index=False)
+
+    print(summary[["file", "status", "rows", "total_s"]].to_string(index=False))
+    failed = (summary.status == "failed").sum()
+    print(
+        f"{len(summary) - failed} of {len(summary)} files processed; "
+        f"summary saved as {args.summary}"
+    )
+
+    return 1 if failed > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
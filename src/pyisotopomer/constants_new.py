@@ -11,10 +11,37 @@ NEW: Read in data from excel template instead of from a separate file.
 @author: Colette L. Kelly (clkelly@stanford.edu).
 """
 
-import pandas as pd
 import numpy as np
 
 
+def compileconstants(isotopeconstants):
+    """
+    Compile 15Ralpha and 15Rbeta for every reference material, once.
+
+    USAGE: refconstants = compileconstants(isotopeconstants)
+
+    INPUT:
+        :param isotopeconstants: ref_tag, d15Na, and d15Nb of reference materials
+            entered into the "scale_normalization" tab of the excel template
+        :type isotopeconstants: Pandas Dataframe
+
+    OUTPUT:
+        :returns: dict of {ref_tag: (15Ralpha, 15Rbeta)}, as floats. If a ref_tag
+        is entered more than once, its first entry is used, as in constants_new.
+
+    """
+    refs = isotopeconstants.dropna(subset=["ref_tag"]).drop_duplicates(
+        subset="ref_tag", keep="first"
+    )
+
+    R15a = (np.asarray(refs.d15Na, dtype=float) / 1000 + 1) * 0.0036765
+    R15b = (np.asarray(refs.d15Nb, dtype=float) / 1000 + 1) * 0.0036765
+
+    return {
+        tag: (float(a), float(b)) for tag, a, b in zip(refs.ref_tag, R15a, R15b)
+    }
+
+
 def constants_new(isotopeconstants, ref1, ref2):
     """
     Return 15Ralpha and 15Rbeta for the two reference materials used to
@@ -24,8 +51,10 @@ def constants_new(isotopeconstants, ref1, ref2):
 
     INPUT:
         :param isotopeconstants: ref_tag, d15Na, and d15Nb of reference materials
-            entered into the "scale_normalization" tab of the excel template
-        :type isotopeconstants: Pandas Dataframe
+            entered into the "scale_normalization" tab of the excel template,
+            or the table of 15Ralpha and 15Rbeta compiled from them by
+            compileconstants (much faster in solver loops)
+        :type isotopeconstants: Pandas Dataframe or dict
         :param ref1: name of first reference material used for scrambling calibration
         :type ref1: string
         :param ref2: name of second reference material used for scrambling calibration
@@ -35,6 +64,12 @@ def constants_new(isotopeconstants, ref1, ref2):
         :returns: 15Ralpha #1, 15Rbeta #1, 15Ralpha #2, 15Rbeta #2
 
     """
+    if isinstance(isotopeconstants, dict):
+        # precompiled {ref_tag: (15Ralpha, 15Rbeta)} table
+        a, b = isotopeconstants[ref1]
+        a2, b2 = isotopeconstants[ref2]
+        return a, b, a2, b2
+
     d15Na_1 = float(isotopeconstants[isotopeconstants["ref_tag"] == ref1].d15Na.iloc[0])
     a = (d15Na_1 / 1000 + 1) * 0.0036765
 
@@ -0,0 +1,111 @@
+"""
+File: diagnostics.py
+---------------------------
+Created on Sat Oct 17th, 2026
+
+Diagnostics class to collect intermediate data products
+(e.g. normalized_ratios.csv) during a run, and write them out
+once the run is finished.
+"""
+
+import os
+
+
+class Diagnostics:
+    """
+    Collect intermediate data products and write them out at the end of a run.
+
+    USAGE: diagnostics = Diagnostics(mode="write", path=".", fmt="csv")
+
+    DESCRIPTION:
+        Solvers add intermediate tables (e.g. "normalized_ratios") to a
+        Diagnostics object instead of writing them to disk. Nothing is
+        written until flush() is called, which Scrambling, Isotopomers and
+        Tracers do once all calculations are finished. Tables can also be
+        added as functions that return a DataFrame; these are only
+        evaluated when the table is written out or accessed.
+
+    INPUT:
+        :param mode: "write" to write tables to path when flushed, "memory" to
+        keep them in memory only, or "off" (or None) to discard them.
+        :type mode: String
+        :param path: Directory to write tables to, created when the tables are
+        first written if it does not exist. If None, default to the
+        current working directory.
+        :type path: String
+        :param fmt: File format for written tables: "csv", "xlsx" or "parquet".
+        :type fmt: String
+
+    OUTPUT:
+        :param artifacts: names of the tables collected so far
+        :type artifacts: list
+        :param written: paths of the files written by flush()
+        :type written: list
+    """
+
+    def __init__(self, mode="write", path=None, fmt="csv"):
+
+        if mode is None:
+            mode = "off"
+        if mode not in ("write", "memory", "off"):
+            raise ValueError(f"mode must be 'write', 'memory' or 'off', not {mode!r}")
+        if fmt not in ("csv", "xlsx", "parquet"):
+            raise ValueError(f"fmt must be 'csv', 'xlsx' or 'parquet', not {fmt!r}")
+
+        self.mode = mode
+        self.path = path if path is not None else "."
+        self.fmt = fmt
+
+        self._tables = {}
+        self.written = []
+
+    @property
+    def enabled(self):
+        # solvers skip building tables that would be discarded
+        return self.mode != "off"
+
+    @property
+    def artifacts(self):
+        return list(self._tables)
+
+    def add(self, name, table):
+        # store a DataFrame, or a function returning one, under name
+        if self.enabled:
+            self._tables[name] = table
+
+    def __getitem__(self, name):
+        table = self._tables[name]
+        if callable(table):
+            table = self._tables[name] = table()
+        return table
+
+    def __contains__(self, name):
+        return name in self._tables
+
+    def flush(self):
+        # write out all tables collected since the last flush
+        if self.mode != "write":
+            return []
+
+        # create the directory (e.g. "diagnostics/") if it doesn't exist yet
+        if self._tables:
+            os.makedirs(self.path, exist_ok=True)
+
+        written = []
+        for name in list(self._tables):
+            table = self[name]
+            filename = os.path.join(self.path, f"{name}.{self.fmt}")
+            if self.fmt == "csv":
+                table.to_csv(filename)
+            elif self.fmt == "xlsx":
+                table.to_excel(filename)
+            elif self.fmt == "parquet":
+                table.to_parquet(filename)
+            written.append(filename)
+            del self._tables[name]
+
+        self.written.extend(written)
+        return written
+
+    def __repr__(self):
+        return f"Diagnostics(mode={self.mode!r}, path={self.path!r}, fmt={self.fmt!r}): {self.artifacts}"
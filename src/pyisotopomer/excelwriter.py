@@ -0,0 +1,69 @@
+"""
+File: excelwriter.py
+---------------------------
+Created on Sat Oct 17th, 2026
+
+Functions to write DataFrames to an excel file one row at a time,
+without building the whole workbook in memory.
+"""
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+
+
+def sheetrows(sheet, df, index=True, chunksize=10000):
+    # rows of df as lists of cell values, header first, as DataFrame.to_excel
+    # lays them out; values are converted from arrays chunksize rows at a time
+    bold = Font(bold=True)
+
+    def header(value):
+        cell = WriteOnlyCell(sheet, value=value)
+        cell.font = bold
+        return cell
+
+    names = [df.index.name] if index else []
+    yield [header(name) for name in names + list(df.columns)]
+
+    for start in range(0, len(df), chunksize):
+        chunk = df.iloc[start : start + chunksize]
+        values = chunk.to_numpy(dtype=object)
+        if index:
+            values = np.column_stack([chunk.index.to_numpy(dtype=object), values])
+        values[pd.isna(values)] = None  # empty cells, as na_rep=""
+        for row in values.tolist():
+            if index:
+                row[0] = header(row[0])
+            yield row
+
+
+def writeexcel(filename, sheets, index=True):
+    """
+    Write DataFrames to the sheets of an excel file, one row at a time.
+
+    USAGE: writeexcel("scrambling_output.xlsx", [("all", alloutputs), ("S2-B6", df)])
+
+    DESCRIPTION:
+        Uses a write-only openpyxl workbook, which streams each row to disk
+        as it is appended instead of keeping every cell of every sheet in
+        memory, as pd.ExcelWriter does. The cell values in each sheet are
+        those written by DataFrame.to_excel: a bold header row and, if index
+        is True, a bold first column with the index. Missing values are
+        written as empty cells.
+
+    INPUT:
+        :param filename: name of the .xlsx file to write
+        :type filename: String
+        :param sheets: sheet names and the DataFrame to write to each sheet
+        :type sheets: list of (String, Pandas DataFrame) tuples
+        :param index: if True, write the index of each DataFrame in the first column
+        :type index: Bool
+    """
+    workbook = Workbook(write_only=True)
+    for name, df in sheets:
+        sheet = workbook.create_sheet(title=name)
+        for row in sheetrows(sheet, df, index=index):
+            sheet.append(row)
+    workbook.save(filename)
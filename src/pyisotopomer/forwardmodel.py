@@ -0,0 +1,184 @@
+"""
+File: forwardmodel.py
+---------------------------
+Created on Sat Oct 17th, 2026
+
+Functions to calculate the 31R, 45R and 46R that would be measured
+for samples with known isotopocule delta values and scrambling
+coefficients: the inverse of calcSPmain and tracerSPmain.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .isotopestandards import IsotopeStandards
+from .isotopomerinput import ISOTOPOMERCOLUMNS
+
+# columns of the tracer template that tracerSPmain needs, in order
+TRACERCOLUMNS = ISOTOPOMERCOLUMNS + ["delta17O", "ab_t0", "46R excess"]
+
+
+def isotopocules(a, b, r17, r18, g, k, ab=None):
+    """
+    USAGE: x, y, z = isotopocules(a, b, r17, r18, g, k)
+
+    DESCRIPTION:
+        The three equations of SPnonlineq.py and tracernonlineq.py, solved
+        for 31R, 45R and 46R instead of 15Ralpha and 15Rbeta. Each input can
+        be a scalar or an array; arrays are calculated elementwise.
+
+    INPUT:
+        :param a: 15Ralpha
+        :param b: 15Rbeta
+        :param r17: 17R
+        :param r18: 18R
+        :param g: gamma scrambling coefficient
+        :param k: kappa scrambling coefficient
+        :param ab: 15Ralpha * 15Rbeta, or for tracer samples, 15Ralpha * 15Rbeta
+        at t0 plus the 46R added since t0 (default: a * b)
+
+    OUTPUT:
+        :returns: 31R, 45R and 46R
+    """
+    if ab is None:
+        ab = a * b
+
+    # denominator of the 31R equation
+    D = 1 + g * a + (1 - k) * b
+
+    x = ((1 - g) * a + k * b + ab + r17 * D) / D  # 31R
+    y = a + b + r17  # 45R
+    z = (a + b) * r17 + r18 + ab  # 46R
+
+    return x, y, z
+
+
+def forwardmodel(d15Na, d15Nb, d18O, D17O, gamma, kappa, isotopestandards=None):
+    """
+    USAGE: R = forwardmodel(d15Na, d15Nb, d18O, D17O, gamma, kappa)
+
+    DESCRIPTION:
+        Calculates the size-corrected 31R, 45R and 46R of natural-abundance
+        samples with known d15Nalpha, d15Nbeta, d18O and D17O, measured with
+        scrambling coefficients gamma and kappa, from the same equations that
+        calcSPmain solves (see SPnonlineq.py). 17R is calculated from 18R and
+        D17O with the mass-dependent relation in isotopestandards.
+
+        Inputs are broadcast against each other, so any of them can be a
+        scalar, e.g. to use one gamma and kappa for every sample. All rows are
+        calculated at once, with numpy array operations.
+
+    INPUT:
+        :param d15Na: d15Nalpha (per mil vs. AIR)
+        :type d15Na: float or array-like
+        :param d15Nb: d15Nbeta (per mil vs. AIR)
+        :type d15Nb: float or array-like
+        :param d18O: d18O (per mil vs. VSMOW)
+        :type d18O: float or array-like
+        :param D17O: D17O (per mil)
+        :type D17O: float or array-like
+        :param gamma: gamma scrambling coefficient
+        :type gamma: float or array-like
+        :param kappa: kappa scrambling coefficient
+        :type kappa: float or array-like
+        :param isotopestandards: IsotopeStandards class from isotopestandards.py
+        (default: IsotopeStandards())
+        :type isotopestandards: Class
+
+    OUTPUT:
+        :returns: Pandas DataFrame with one row per sample and the columns of
+        the "size_correction" tab that calcSPmain needs: size corrected 31R,
+        45R and 46R, D17O, gamma and kappa. np.array(R) is the input for
+        calcSPmain.
+    """
+    if isotopestandards is None:
+        isotopestandards = IsotopeStandards()
+
+    d15Na, d15Nb, d18O, D17O, g, k = np.broadcast_arrays(
+        *[
+            np.atleast_1d(np.asarray(v, dtype=float))
+            for v in (d15Na, d15Nb, d18O, D17O, gamma, kappa)
+        ]
+    )
+
+    a = (d15Na / 1000 + 1) * isotopestandards.R15Air
+    b = (d15Nb / 1000 + 1) * isotopestandards.R15Air
+    r18 = (d18O / 1000 + 1) * isotopestandards.R18VSMOW
+    r17 = (
+        isotopestandards.R17VSMOW
+        * (r18 / isotopestandards.R18VSMOW) ** isotopestandards.O17beta
+        * (D17O / 1000 + 1)
+    )
+
+    x, y, z = isotopocules(a, b, r17, r18, g, k)
+
+    return pd.DataFrame(
+        np.column_stack([x, y, z, D17O, g, k]), columns=ISOTOPOMERCOLUMNS
+    )
+
+
+def tracerforwardmodel(
+    d15Na, d15Nb, delta17O, D17O, gamma, kappa, ab_t0, isotopestandards=None
+):
+    """
+    USAGE: R = tracerforwardmodel(d15Na, d15Nb, delta17O, D17O, gamma, kappa, ab_t0)
+
+    DESCRIPTION:
+        Calculates the size-corrected 31R, 45R and 46R of 15N-labeled
+        samples, from the same equations that tracerSPmain solves (see
+        tracernonlineq.py). As in tracernonlineq.py, 17R is calculated from
+        delta17O and 18R from 17R and D17O, and the 46R added since t0 is
+        15Ralpha * 15Rbeta - ab_t0.
+
+        Inputs are broadcast against each other, so any of them can be a
+        scalar. All rows are calculated at once, with numpy array operations.
+
+    INPUT:
+        :param d15Na: d15Nalpha (per mil vs. AIR)
+        :type d15Na: float or array-like
+        :param d15Nb: d15Nbeta (per mil vs. AIR)
+        :type d15Nb: float or array-like
+        :param delta17O: delta17O, calculated from t0's
+        :type delta17O: float or array-like
+        :param D17O: D17O (per mil)
+        :type D17O: float or array-like
+        :param gamma: gamma scrambling coefficient
+        :type gamma: float or array-like
+        :param kappa: kappa scrambling coefficient
+        :type kappa: float or array-like
+        :param ab_t0: 15Ralpha * 15Rbeta at t0
+        :type ab_t0: float or array-like
+        :param isotopestandards: IsotopeStandards class from isotopestandards.py
+        (default: IsotopeStandards())
+        :type isotopestandards: Class
+
+    OUTPUT:
+        :returns: Pandas DataFrame with one row per sample and the columns of
+        the tracer template that tracerSPmain needs: size corrected 31R, 45R
+        and 46R, D17O, gamma, kappa, delta17O, ab_t0 and 46R excess.
+        np.array(R) is the input for tracerSPmain.
+    """
+    if isotopestandards is None:
+        isotopestandards = IsotopeStandards()
+
+    d15Na, d15Nb, delta17O, D17O, g, k, ab = np.broadcast_arrays(
+        *[
+            np.atleast_1d(np.asarray(v, dtype=float))
+            for v in (d15Na, d15Nb, delta17O, D17O, gamma, kappa, ab_t0)
+        ]
+    )
+
+    a = (d15Na / 1000 + 1) * isotopestandards.R15Air
+    b = (d15Nb / 1000 + 1) * isotopestandards.R15Air
+    r17 = (delta17O / 1000 + 1) * 0.0003799  # as in tracernonlineq.py
+    r18 = isotopestandards.R18VSMOW * (
+        (r17 / isotopestandards.R17VSMOW) / (D17O / 1000 + 1)
+    ) ** (1 / isotopestandards.O17beta)
+    r15addition = a * b - ab  # 46R added since t0
+
+    x, y, z = isotopocules(a, b, r17, r18, g, k, ab=ab + r15addition)
+
+    return pd.DataFrame(
+        np.column_stack([x, y, z, D17O, g, k, delta17O, ab, r15addition]),
+        columns=TRACERCOLUMNS,
+    )
@@ -0,0 +1,183 @@
+"""
+File: initialguess.py
+---------------------------
+Created on Sat Oct 17th, 2026
+
+Functions to choose initial guesses for the row-by-row solvers,
+either one guess for all rows or one guess per row.
+"""
+
+import numpy as np
+from .algebraic_gk_eqns import algebraic_gk_eqns
+
+
+def bulkguess(R, isotopestandards, SP=18.0):
+    """
+    USAGE: x0 = bulkguess(R, isotopestandards)
+
+    DESCRIPTION:
+        Estimates 15Ralpha and 15Rbeta for every row of R without solving
+        SPnonlineq. 18R is taken as 46R less the 15N terms of the 46R
+        equation, which gives 17R from the 18O/17O relation. 15Ralpha +
+        15Rbeta then follows from the 45R equation, and is split into
+        15Ralpha and 15Rbeta with a nominal site preference. Two passes
+        bring the estimate of 18R to within about 0.1 per mil.
+
+    INPUT:
+        :param R: array with dimensions n x 4 or more where n is the number of
+        measurements.  The first four columns are 31R, 45R, 46R and D17O.
+        :type R: numpy array, dtype=float
+        :param isotopestandards: IsotopeStandards class from isotopestandards.py,
+        containing 15RAir, 18RVSMOW, 17RVSMOW, and beta for the 18O/17O relation.
+        :type isotopestandards: Class
+        :param SP: nominal site preference (per mil) used to split 15Rbulk
+        :type SP: float
+
+    OUTPUT:
+        :returns: array with dimensions n x 2. The two columns are the estimated
+        15Ralpha and 15Rbeta, from left to right.
+    """
+    R = np.asarray(R, dtype=float)
+
+    y = R[:, 1]  # size-corrected 45R
+    z = R[:, 2]  # size-corrected 46R
+    D17O = R[:, 3]
+
+    beta = isotopestandards.O17beta
+    R17VSMOW = isotopestandards.R17VSMOW
+    R18VSMOW = isotopestandards.R18VSMOW
+
+    r18 = z  # 46R is mostly 18R
+    for _ in range(2):
+        with np.errstate(invalid="ignore"):
+            r17 = R17VSMOW * ((r18 / R18VSMOW) ** beta) * (D17O / 1000 + 1)
+        s = y - r17  # 15Ralpha + 15Rbeta, from the 45R equation
+        r18 = z - s * r17 - s**2 / 4  # 46R equation, with 15Ralpha ~ 15Rbeta
+
+    # SP = (15Ralpha - 15Rbeta) / 15RAir * 1000
+    d = SP / 1000 * isotopestandards.R15Air
+
+    return np.column_stack([(s + d) / 2, (s - d) / 2])
+
+
+def resolveguess(guess, default, lb, ub, n):
+    # one guess for all rows (length 2), or one guess per row (n x 2) moved within
+    # the bounds; rows without a usable guess fall back to the default guess
+    guess = np.array(guess, dtype=float)
+    if guess.ndim != 2:
+        return guess
+    if guess.shape != (n, 2):
+        raise ValueError(
+            f"per-row initial guesses must have shape ({n}, 2), not {guess.shape}"
+        )
+    guess = np.where(np.isfinite(guess), guess, default)
+    return np.clip(guess, lb, ub)
+
+
+def SPinitialguess(R, isotopestandards, initialguess, lb, ub):
+    """
+    USAGE: x0, previous = SPinitialguess(R, isotopestandards, initialguess, lb, ub)
+
+    DESCRIPTION:
+        Resolves the initialguess argument of calcSPmain into initial guesses
+        for 15Ralpha and 15Rbeta. initialguess may be None (default guess of
+        [0.0037, 0.0037] for every row), a list or array of two values (one
+        guess for every row), an n x 2 array (one guess per row), or one of:
+            "bulk": per-row guess from bulkguess, i.e. from 45R and 46R
+            "previous": start each row from the solution of the row before it,
+            unless that solution implies 17R < 0 for this row, and the first
+            row from the default guess
+
+    INPUT:
+        :param R: array with dimensions n x 6 where n is the number of
+        measurements.  The six columns are 31R, 45R, 46R, D17O, gamma,
+        and kappa, from left to right.
+        :type R: numpy array, dtype=float
+        :param isotopestandards: IsotopeStandards class from isotopestandards.py
+        :type isotopestandards: Class
+        :param initialguess: initial guess or strategy, as described above
+        :type initialguess: None, string, list or Numpy array
+        :param lb: lower bounds for 15Ralpha and 15Rbeta
+        :type lb: numpy array, dtype=float
+        :param ub: upper bounds for 15Ralpha and 15Rbeta
+        :type ub: numpy array, dtype=float
+
+    OUTPUT:
+        :returns: x0, previous
+        :param x0: initial guess, with length 2 or dimensions n x 2
+        :type x0: numpy array
+        :param previous: True if each row should start from the solution of the row before it
+        :type previous: bool
+    """
+    default = np.array([0.0037, 0.0037], dtype=float)
+
+    if initialguess is None:
+        return default, False
+    if isinstance(initialguess, str):
+        if initialguess == "bulk":
+            guess = bulkguess(R, isotopestandards)
+            return resolveguess(guess, default, lb, ub, len(R)), False
+        if initialguess == "previous":
+            return default, True
+        raise ValueError(
+            f"initialguess must be 'bulk', 'previous', or an array, not {initialguess!r}"
+        )
+    return resolveguess(initialguess, default, lb, ub, len(R)), False
+
+
+def gkinitialguess(R, isotopeconstants, ref1, ref2, x0, lb, ub):
+    """
+    USAGE: x0, previous = gkinitialguess(R, isotopeconstants, ref1, ref2, x0, lb, ub)
+
+    DESCRIPTION:
+        Resolves the x0 argument of automate_gk_solver into initial guesses
+        for gamma and kappa. x0 may be None (default guess of [0.1, 0.1] for
+        every pairing), a list or array of two values (one guess for every
+        pairing), an n x 2 array (one guess per pairing), or one of:
+            "algebraic": per-pairing guess from algebraic_gk_eqns.py.
+            The least squares solver then converges to the algebraic solution
+            where it lies within the bounds.
+            "previous": start each pairing from the solution of the pairing
+            before it, and the first pairing from the default guess
+
+    INPUT:
+        :param R: array with dimensions n x 10 where n is the number of reference pairs.
+        :type R: numpy array, dtype=float
+        :param isotopeconstants: isotope constants of reference materials, as
+        passed to automate_gk_solver
+        :type isotopeconstants: Pandas Dataframe or dict
+        :param ref1: first reference material in the pairing
+        :type ref1: string
+        :param ref2: second reference material in the pairing
+        :type ref2: string
+        :param x0: initial guess or strategy, as described above
+        :type x0: None, string, list or Numpy array
+        :param lb: lower bounds for gamma and kappa
+        :type lb: numpy array, dtype=float
+        :param ub: upper bounds for gamma and kappa
+        :type ub: numpy array, dtype=float
+
+    OUTPUT:
+        :returns: x0, previous
+        :param x0: initial guess, with length 2 or dimensions n x 2
+        :type x0: numpy array
+        :param previous: True if each pairing should start from the solution of the one before it
+        :type previous: bool
+    """
+    default = np.array([0.1, 0.1], dtype=float)
+
+    if x0 is None:
+        return default, False
+    if isinstance(x0, str):
+        if x0 == "algebraic":
+            with np.errstate(invalid="ignore", divide="ignore"):
+                guess = np.array(
+                    algebraic_gk_eqns(R, isotopeconstants, ref1, ref2)[["gamma", "kappa"]]
+                )
+            return resolveguess(guess, default, lb, ub, len(R)), False
+        if x0 == "previous":
+            return default, True
+        raise ValueError(
+            f"initialguess must be 'algebraic', 'previous', or an array, not {x0!r}"
+        )
+    return resolveguess(x0, default, lb, ub, len(R)), False
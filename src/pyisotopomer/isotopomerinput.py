@@ -10,9 +10,20 @@ from excel template.
 """
 
 
-import pandas as pd
 import numpy as np
 from itertools import combinations
+from .workbook import openworkbook
+from .scramblingtimeseries import ScramblingTimeSeries
+
+# columns of the template that calcSPmain needs, in order
+ISOTOPOMERCOLUMNS = [
+    "size corrected 31R",
+    "size corrected 45R",
+    "size corrected 46R",
+    "D17O",
+    "gamma",
+    "kappa",
+]
 
 
 class IsotopomerInput:
@@ -22,42 +33,61 @@ class IsotopomerInput:
     USAGE: R = IsotopomerInput(inputfile, tabname)
 
     INPUT:
-        :param filename: filename for spreadsheet template, e.g. "00_excel_template.xlsx"
-        :type R: string
+        :param filename: filename for spreadsheet template, e.g. "00_excel_template.xlsx",
+        a .csv, .parquet, .feather, .npy or .npz file or directory of them
+        with the same columns, or a Workbook object (see workbook.py)
+        :type R: string or Workbook
         :param tabname: name of tab containing size-corrected isotope ratios (default: "size_correction")
         :type R: string
+        :param scrambling: scrambling coefficients to use instead of the gamma
+        and kappa columns of the template (see attachscrambling)
+        :type scrambling: ScramblingTimeSeries, Scrambling, or [gamma, kappa]
+        :param direction: "backward" to use the running gamma and kappa of the
+        last run date on or before each sample's run date, or "nearest" to use
+        those of the closest run date
+        :type direction: string
+        :param window: number of pairings to average over, if scrambling is a
+        Scrambling object
+        :type window: int
 
     OUTPUT:
-        :returns: self.data, self.sizecorrected, self.ratiosscrambling
+        :returns: self.data, the rows of the template with all of
+        ISOTOPOMERCOLUMNS, indexed 0..n-1; self.sizecorrected; and
+        self.ratiosscrambling, the n x 6 array of the same rows
 
     @author: Colette L. Kelly (clkelly@stanford.edu).
     """
 
-    def __init__(self, filename, tabname=None):
+    def __init__(
+        self, filename, tabname=None, scrambling=None, direction="backward", window=10
+    ):
 
-        self.filename = filename
+        # excel template, parsed once and shared with any other input class
+        self.workbook = openworkbook(filename)
+        self.filename = self.workbook.filename
 
         if tabname is not None:
             self.tabname = tabname
         elif tabname is None:
             self.tabname = "size_correction"
 
-        try:
-            # full contents of excel template, first tab
-            self.data = self.readin(self.filename, self.tabname)
-        except FileNotFoundError:
-            if self.filename[-5:] != ".xlsx":
-                self.filename = self.filename + ".xlsx"
-                self.data = self.readin(self.filename, self.tabname)
+        # full contents of excel template, first tab
+        self.data = self.readin(self.workbook, self.tabname)
+        if scrambling is not None:
+            self.data = attachscrambling(self.data, scrambling, direction, window)
+
+        # drop rows without all of the columns that calcSPmain needs, so that
+        # the rows of data line up with those of ratiosscrambling
+        self.data = self.data.dropna(subset=ISOTOPOMERCOLUMNS).reset_index(drop=True)
 
         # subset of data to be used for Isotopomers
         self.sizecorrected = self.parseratios(self.data)
 
         self.ratiosscrambling = self.parseisotopomerinput(self.data)
 
-    def readin(self, filename, tabname):
+    def readin(self, workbook, tabname):
         # return Pandas DataFrame of all input data
-        return pd.read_excel(filename, tabname, skiprows=1)
+        return workbook.read(tabname, skiprows=1)
 
     def parseratios(self, data):
         # return just the size-corrected isotope ratios in a numpy array
@@ -71,22 +101,130 @@ class IsotopomerInput:
     def parseisotopomerinput(self, data):
         # return just the size-corrected isotope ratios in a numpy array
         # for input to calcSPmain
-        return np.array(
-            data[
-                [
-                    "size corrected 31R",
-                    "size corrected 45R",
-                    "size corrected 46R",
-                    "D17O",
-                    "gamma",
-                    "kappa",
-                ]
-            ].dropna()
-        )
+        return np.array(data[ISOTOPOMERCOLUMNS].dropna())
 
     def __repr__(self):
         return f"{self.sizecorrected}"
 
 
+def attachscrambling(data, scrambling, direction="backward", window=10):
+    """
+    Fill in the gamma and kappa of each sample from a time series of scrambling coefficients.
+
+    USAGE: data = attachscrambling(data, ScramblingTimeSeries(Scrambling(...)))
+
+    DESCRIPTION:
+        Replaces the gamma and kappa columns of data with the running gamma
+        and kappa of each sample's run date, found with an as-of merge on
+        run_date (see ScramblingTimeSeries.at), so that they don't have to be
+        pasted into the template by hand. Samples without a run date, or
+        run before the first run date of the time series (with
+        direction="backward"), are left without gamma and kappa, and are
+        dropped from the rows that are solved.
+
+    INPUT:
+        :param data: contents of the "size_correction" tab, with a run_date column
+        :type data: Pandas DataFrame
+        :param scrambling: a ScramblingTimeSeries; a Scrambling object, from
+        whose pairings a ScramblingTimeSeries is built; or one gamma and kappa
+        for every sample
+        :type scrambling: ScramblingTimeSeries, Scrambling, or [gamma, kappa]
+        :param direction: "backward" (the last run date on or before each
+        sample's) or "nearest" (the closest run date)
+        :type direction: string
+        :param window: number of pairings to average over, if scrambling is a
+        Scrambling object
+        :type window: int
+
+    OUTPUT:
+        :returns: copy of data with new gamma and kappa columns
+    """
+    data = data.copy()
+
+    if hasattr(scrambling, "alloutputs"):
+        scrambling = ScramblingTimeSeries(scrambling, window=window)
+
+    if isinstance(scrambling, ScramblingTimeSeries):
+        gk = np.full((len(data), 2), np.nan)
+        dated = data["run_date"].notna().to_numpy()
+        if dated.any() and len(scrambling) > 0:
+            running = scrambling.at(data["run_date"].to_numpy()[dated], direction)
+            gk[dated] = running[["gamma", "kappa"]].to_numpy()
+        missing = dated & np.isnan(gk[:, 0])
+        if missing.any():
+            print(
+                f"{missing.sum()} samples have no scrambling coefficients on or "
+                f"before their run date; use direction='nearest' to include them"
+            )
+        data["gamma"], data["kappa"] = gk[:, 0], gk[:, 1]
+    else:
+        data["gamma"], data["kappa"] = scrambling
+
+    return data
+
+
+def iterisotopomerinput(
+    filename,
+    tabname=None,
+    chunksize=10000,
+    scrambling=None,
+    direction="backward",
+    window=10,
+):
+    """
+    Read in data from the data corrections spreadsheet in chunks of rows.
+
+    USAGE: for R, data in iterisotopomerinput(inputfile, tabname, chunksize): ...
+
+    DESCRIPTION:
+        Streaming counterpart of IsotopomerInput, for inputs too large to hold
+        in memory. Reads the sheet in chunks of at most chunksize rows with
+        Workbook.iterread, and drops rows without all of the columns that
+        calcSPmain needs, so that the rows of R and data line up.
+
+    INPUT:
+        :param filename: filename for spreadsheet template, or a columnar file,
+        directory, or Workbook object (see workbook.py)
+        :type filename: string or Workbook
+        :param tabname: name of tab containing size-corrected isotope ratios (default: "size_correction")
+        :type tabname: string
+        :param chunksize: maximum number of rows per chunk
+        :type chunksize: int
+        :param scrambling: scrambling coefficients to use instead of the gamma
+        and kappa columns of the template (see attachscrambling)
+        :type scrambling: ScramblingTimeSeries, Scrambling, or [gamma, kappa]
+        :param direction: "backward" or "nearest" (see attachscrambling)
+        :type direction: string
+        :param window: number of pairings to average over, if scrambling is a
+        Scrambling object
+        :type window: int
+
+    OUTPUT:
+        :returns: generator of (R, data) for each chunk, where R is the n x 6 array
+        of size-corrected isotope ratios, D17O, gamma and kappa (as in
+        IsotopomerInput.ratiosscrambling), and data is a Pandas DataFrame of the
+        same n rows of the sheet, indexed 0..n-1.
+    """
+    workbook = openworkbook(filename)
+    if tabname is None:
+        tabname = "size_correction"
+
+    # build the time series once, rather than once per chunk
+    if hasattr(scrambling, "alloutputs"):
+        scrambling = ScramblingTimeSeries(scrambling, window=window)
+
+    try:
+        for data in workbook.iterread(tabname, chunksize, skiprows=1):
+            if scrambling is not None:
+                data = attachscrambling(data, scrambling, direction)
+            data = data.dropna(subset=ISOTOPOMERCOLUMNS).reset_index(drop=True)
+            if len(data) > 0:
+                yield np.array(data[ISOTOPOMERCOLUMNS]), data
+    finally:
+        # close the template if it was opened here
+        if workbook is not filename:
+            workbook.close()
+
+
 if __name__ == "__main__":
     print(Input(filename="00_Python_template_v3.xlsx"))
@@ -0,0 +1,132 @@
+"""
+File: montecarlo.py
+---------------------------
+Created on Sat Oct 17th, 2026
+
+Functions to propagate uncertainty in 31R, 45R, 46R, gamma and kappa
+into isotopocule delta values by Monte Carlo simulation.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .calcSPmain import calcSPmain
+from .calcdeltaSP import calcdeltaSP
+
+# columns of R that can be perturbed, and their position in R
+PERTURBED = {"31R": 0, "45R": 1, "46R": 2, "gamma": 4, "kappa": 5}
+
+# delta values summarized for each sample
+SUMMARIZED = ["d15Na", "d15Nb", "SP", "d18O"]
+
+
+def montecarlo(
+    R,
+    isotopestandards,
+    uncertainty,
+    nsamples=1000,
+    percentiles=(2.5, 97.5),
+    seed=None,
+    method="bracketed",
+    chunksize=1000000,
+    **solverkwargs,
+):
+    """
+    USAGE: stats = montecarlo(R, isotopestandards, {"31R": 1e-6, "gamma": 0.01})
+
+    DESCRIPTION:
+        Draws nsamples perturbations of the 31R, 45R, 46R, gamma and kappa
+        of each row of R, from normal distributions centred on the measured
+        values with the standard deviations in uncertainty, solves every
+        perturbed row for isotopocule delta values with calcSPmain, and
+        summarizes the nsamples solutions of each row.
+
+        The perturbed rows of all samples are solved together, in one batched
+        pass of the "bracketed" (or "newton") solver. To keep memory in check,
+        the samples are split into passes of at most chunksize perturbed rows.
+
+    INPUT:
+        :param R: array with dimensions n x 6 where n is the number of
+        measurements. The six columns are 31R, 45R, 46R, D17O, gamma,
+        and kappa, from left to right.
+        :type R: numpy array, dtype=float
+        :param isotopestandards: IsotopeStandards class from isotopestandards.py
+        :type isotopestandards: Class
+        :param uncertainty: standard deviation of any of "31R", "45R", "46R",
+        "gamma" and "kappa", in the same units as the column of R; either one
+        value for every row, or an array with one value per row. Columns that
+        are not given are not perturbed.
+        :type uncertainty: dict
+        :param nsamples: number of perturbations of each row; at least 2, so
+        that the standard deviation is defined
+        :type nsamples: int
+        :param percentiles: percentiles of each delta value to report
+        :type percentiles: tuple of floats
+        :param seed: seed for numpy's random number generator, to make the
+        perturbations reproducible
+        :type seed: int
+        :param method: batched solver backend for calcSPmain, "bracketed"
+        (default) or "newton"
+        :type method: String
+        :param chunksize: maximum number of perturbed rows to solve in one pass
+        :type chunksize: int
+        :param solverkwargs: other keyword arguments for calcSPmain, e.g.
+        lowerbounds, upperbounds, n_jobs or executor
+
+    OUTPUT:
+        :returns: Pandas DataFrame with one row per row of R, and the mean,
+        standard deviation and percentiles of d15Na, d15Nb, SP and d18O over
+        the perturbations, in columns named e.g. "d15Na_mean", "d15Na_std",
+        "d15Na_p2.5" and "d15Na_p97.5". Perturbations that can't be solved
+        (e.g. 17R < 0) are left out of the statistics.
+    """
+    if method not in ("bracketed", "newton"):
+        raise ValueError(f"method must be 'bracketed' or 'newton', not {method!r}")
+
+    if nsamples < 2:
+        raise ValueError(f"nsamples must be at least 2, not {nsamples!r}")
+
+    unknown = set(uncertainty) - set(PERTURBED)
+    if unknown:
+        raise ValueError(
+            f"uncertainty can be given for {list(PERTURBED)}, not {sorted(unknown)}"
+        )
+
+    R = np.asarray(R, dtype=float)
+    n = len(R)
+    rng = np.random.default_rng(seed)
+
+    # standard deviation of each column of R, one row per sample
+    sd = np.zeros((n, R.shape[1]))
+    for name, value in uncertainty.items():
+        sd[:, PERTURBED[name]] = value
+
+    stats = {
+        f"{name}_{stat}": np.empty(n) for name in SUMMARIZED for stat in ["mean", "std"]
+    }
+    for name in SUMMARIZED:
+        for q in percentiles:
+            stats[f"{name}_p{q:g}"] = np.empty(n)
+
+    step = max(1, chunksize // nsamples)
+    for start in range(0, n, step):
+        rows = slice(start, start + step)
+        m = len(R[rows])
+
+        # nsamples perturbed copies of each row, one after the other
+        perturbed = R[rows, None, :] + sd[rows, None, :] * rng.standard_normal(
+            (m, nsamples, R.shape[1])
+        )
+        perturbed = perturbed.reshape(m * nsamples, R.shape[1])
+
+        isol = calcSPmain(perturbed, isotopestandards, method=method, **solverkwargs)
+        deltas = calcdeltaSP(isol, isotopestandards)
+
+        for name in SUMMARIZED:
+            values = deltas[name].to_numpy().reshape(m, nsamples)
+            stats[f"{name}_mean"][rows] = np.nanmean(values, axis=1)
+            stats[f"{name}_std"][rows] = np.nanstd(values, axis=1, ddof=1)
+            for q, p in zip(percentiles, np.nanpercentile(values, percentiles, axis=1)):
+                stats[f"{name}_p{q:g}"][rows] = p
+
+    return pd.DataFrame(stats)
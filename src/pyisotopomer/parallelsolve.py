@@ -0,0 +1,136 @@
+"""
+File: parallelsolve.py
+---------------------------
+Created on Sat Oct 17th, 2026
+
+Functions to split the rows of an input array into chunks
+and solve them in a pool of worker processes.
+"""
+
+import os
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+
+def isparallel(n_jobs=None, executor=None):
+    # True if a solver has been asked to run in more than one process
+    return executor is not None or (n_jobs is not None and n_jobs != 1)
+
+
+def nworkers(n_jobs):
+    # number of worker processes for n_jobs; None or -1 uses every core
+    if n_jobs is None or n_jobs == -1:
+        return os.cpu_count() or 1
+    if n_jobs < 1:
+        raise ValueError(f"n_jobs must be a positive integer or -1, not {n_jobs!r}")
+    return n_jobs
+
+
+@contextmanager
+def solverpool(n_jobs=None, executor=None):
+    """
+    Provide one process pool for every solver call made inside a with block.
+
+    USAGE: with solverpool(n_jobs=4) as executor:
+               isol = calcSPmain(R, isotopestandards, executor=executor)
+
+    DESCRIPTION:
+        Yields executor unchanged if one is given, so that the caller stays
+        responsible for shutting it down. Otherwise, starts a
+        ProcessPoolExecutor with n_jobs workers and shuts it down at the end
+        of the with block. Yields None if n_jobs is None or 1, in which
+        case the solvers run in the current process.
+
+    INPUT:
+        :param n_jobs: number of worker processes, or -1 to use every core
+        :type n_jobs: int
+        :param executor: existing executor, e.g. a ProcessPoolExecutor
+        :type executor: concurrent.futures.Executor
+    """
+    if executor is not None:
+        yield executor
+    elif not isparallel(n_jobs):
+        yield None
+    else:
+        with ProcessPoolExecutor(max_workers=nworkers(n_jobs)) as pool:
+            yield pool
+
+
+def parallelsolve(
+    func, R, *args, n_jobs=None, executor=None, rowkwargs=None, **kwargs
+):
+    """
+    Solve the rows of R in chunks, in parallel, and reassemble them in order.
+
+    USAGE: isol = parallelsolve(calcSPmain, R, isotopestandards, n_jobs=4)
+
+    DESCRIPTION:
+        Splits R into contiguous chunks of rows with np.array_split and
+        submits func(chunk, *args, **kwargs) to a pool of worker processes.
+        Only the chunk and the (small) remaining arguments are sent to each
+        worker. Results are concatenated in the original row order: Pandas
+        DataFrames are given a fresh 0..n-1 index, and Numpy arrays are
+        stacked along their first axis. There are four chunks per worker,
+        so that workers that finish early can pick up another chunk.
+
+    INPUT:
+        :param func: row solver, e.g. calcSPmain, tracerSPmain, automate_gk_solver
+        or calculate_17R. It must be importable at module level.
+        :type func: function
+        :param R: input array, with one row per measurement or pairing
+        :type R: numpy array, dtype=float
+        :param n_jobs: number of worker processes, or -1 to use every core.
+        If executor is given, n_jobs only sets the number of chunks.
+        :type n_jobs: int
+        :param executor: existing executor to submit chunks to. If None,
+        a ProcessPoolExecutor is started for this call only.
+        :type executor: concurrent.futures.Executor
+        :param rowkwargs: keyword arguments with one entry per row of R
+        (e.g. per-row initial guesses), split into chunks along with R
+        :type rowkwargs: dict of numpy arrays
+
+    OUTPUT:
+        :returns: output of func for all rows of R, in the original row order
+        :type: Pandas DataFrame or numpy array
+    """
+    R = np.asarray(R)
+
+    rowkwargs = {} if rowkwargs is None else rowkwargs
+
+    if executor is None:
+        with solverpool(n_jobs) as pool:
+            if pool is None:
+                return func(R, *args, **rowkwargs, **kwargs)
+            return parallelsolve(
+                func,
+                R,
+                *args,
+                n_jobs=n_jobs,
+                executor=pool,
+                rowkwargs=rowkwargs,
+                **kwargs,
+            )
+
+    nchunks = min(len(R), 4 * nworkers(n_jobs))
+    if nchunks <= 1:
+        return func(R, *args, **rowkwargs, **kwargs)
+
+    chunks = np.array_split(np.arange(len(R)), nchunks)
+    futures = [
+        executor.submit(
+            func,
+            R[rows[0] : rows[-1] + 1],
+            *args,
+            **{key: value[rows[0] : rows[-1] + 1] for key, value in rowkwargs.items()},
+            **kwargs,
+        )
+        for rows in chunks
+    ]
+    results = [future.result() for future in futures]
+
+    if isinstance(results[0], pd.DataFrame):
+        return pd.concat(results, ignore_index=True)
+    return np.concatenate(results)
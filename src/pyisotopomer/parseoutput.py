@@ -22,6 +22,8 @@ def parseoutput(
     lowerbounds=None,
     upperbounds=None,
     weights=False,
+    n_jobs=None,
+    executor=None,
 ):
     """
     Parse output from scrambling solver.
@@ -39,14 +41,21 @@ def parseoutput(
         See Kelly et al. (in revision) for details.
         If None, default to "algebraic".
         :param initialguess: Initial guess for gamma and kappa.
-        If None, default to [0.17, 0.08].
-        :type initialguess: list or Numpy array
+        If None, default to [0.17, 0.08]. May also be "algebraic" or "previous"
+        (see automate_gk_solver.py).
+        :type initialguess: list, Numpy array or String
         :param lowerbounds: Lower bounds for automate_gk_solver.
         If None, default to [0.0, 0.0].
         :type lowerbounds: list or Numpy array
         :param upperbounds: Upper bounds for automate_gk_solver.
         If None, default to [1.0, 1.0].
         :type upperbounds: list or Numpy array
+        :param n_jobs: number of worker processes for automate_gk_solver,
+        or -1 to use every core. Only used with method="least_squares".
+        :type n_jobs: int
+        :param executor: existing executor for automate_gk_solver, e.g. a
+        ProcessPoolExecutor. Only used with method="least_squares".
+        :type executor: concurrent.futures.Executor
 
     OUTPUT:
         :returns: outputdfs, dfnames, maindf
@@ -61,7 +70,9 @@ def parseoutput(
     """
 
     # default arguments
-    if initialguess is not None:
+    if isinstance(initialguess, str):
+        pass  # "algebraic" or "previous", resolved by automate_gk_solver
+    elif initialguess is not None:
         initialguess = np.array(initialguess, dtype=float)
     elif initialguess is None:
         initialguess = np.array([0.1, 0.1], dtype=float)
@@ -79,27 +90,6 @@ def parseoutput(
     # set up outputs
     outputdfs = []  # list of output DataFrames for each pairing of ref. materials
     dfnames = []  # list of each pairing of ref. materials as strings
-    maindf = (
-        pd.DataFrame(  # maindf will contain ALL of the possible pairings and solutions
-            [],
-            columns=[
-                "ref_tag_1",
-                "size corrected 31R_1",
-                "size corrected 45R_1",
-                "size corrected 46R_1",
-                "15Rbulk_1",
-                "17R_1",
-                "ref_tag_2",
-                "size corrected 31R_2",
-                "size corrected 45R_2",
-                "size corrected 46R_2",
-                "15Rbulk_2",
-                "17R_2",
-                "gamma",
-                "kappa",
-            ],
-        )
-    )
 
     if method == "algebraic":
         # print out message confirming that scrambling was calculated with analytical solution
@@ -108,22 +98,21 @@ def parseoutput(
         # print out message confirming that scrambling was calculated with analytical solution
         print("scrambling calculated with least squares solver")
 
-    # loop through pairings of reference materials by popping items off input dict
-    while True:
-        if not inputobj.scrambleinput:  # stop the loop when dict is empty
-            break
+    # loop through pairings of reference materials, last one first, without
+    # removing them from the input dict, so that inputobj can be solved again
+    # (e.g. with another method or other bounds)
+    scrambleinput = list(inputobj.scrambleinput.items())[::-1]
 
+    for key, [ref1, ref2, R, df] in scrambleinput:
         # each entry in the input dict contains the names of ref materials,
         # input array for gk_solver,
         # and output DataFrame of paired reference materials
-        key, [ref1, ref2, R, df] = inputobj.scrambleinput.popitem()
-
         try:  # use Try and Except arguements to handle cases where constants.csv isn't properly set up
             if (
                 method == "algebraic"
             ):  # Calculate gamma and kappa explicitly from algebraic solution
                 gk = algebraic_gk_eqns(
-                    R, inputobj.isotopeconstants, ref1=ref1, ref2=ref2
+                    R, inputobj.refconstants, ref1=ref1, ref2=ref2
                 )
 
             elif (
@@ -131,30 +120,32 @@ def parseoutput(
             ):  # Run function that iteratively solves for gamma and kappa
                 gk = automate_gk_solver(
                     R,
-                    inputobj.isotopeconstants,
+                    inputobj.refconstants,
                     ref1=ref1,
                     ref2=ref2,
                     x0=initialguess,
                     lb=lowerbounds,
                     ub=upperbounds,
                     weights=weights,
+                    n_jobs=n_jobs,
+                    executor=executor,
                 )
 
             try:
-                # attach scrambling coeffs to output dataframe
-                df["gamma"] = np.array(gk.gamma)
-                df["kappa"] = np.array(gk.kappa)
-                df["error31r_ref1_permil"] = np.array(
-                    gk.error1
-                )  # 31R error for ref 1 = (31R_calculated/31Rmeasured - 1)*1000
-                df["error31r_ref2_permil"] = np.array(
-                    gk.error2
-                )  # 31R error for ref 2 = (31R_calculated/31Rmeasured - 1)*1000
+                # attach scrambling coeffs to a new output dataframe,
+                # leaving the input dataframe untouched
+                df = df.assign(
+                    gamma=np.asarray(gk.gamma),
+                    kappa=np.asarray(gk.kappa),
+                    # 31R error for ref 1 = (31R_calculated/31Rmeasured - 1)*1000
+                    error31r_ref1_permil=np.asarray(gk.error1),
+                    # 31R error for ref 2 = (31R_calculated/31Rmeasured - 1)*1000
+                    error31r_ref2_permil=np.asarray(gk.error2),
+                )
 
                 # write each output dataframe to a separate sheet in the output spreadsheet
                 outputdfs.append(df)
                 dfnames.append(f"{ref1}-{ref2}")
-                maindf = pd.concat([maindf, df])
 
             except AttributeError:
                 print(f"{ref1} and/or {ref2} have not been entered in constants.csv")
@@ -164,4 +155,28 @@ def parseoutput(
                 "Please ensure constants.csv is saved in the current working directory\n"
             )
 
+    # maindf will contain ALL of the possible pairings and solutions
+    if outputdfs:
+        maindf = pd.concat(outputdfs).rename_axis(None)
+    else:
+        maindf = pd.DataFrame(
+            [],
+            columns=[
+                "ref_tag_1",
+                "size corrected 31R_1",
+                "size corrected 45R_1",
+                "size corrected 46R_1",
+                "15Rbulk_1",
+                "17R_1",
+                "ref_tag_2",
+                "size corrected 31R_2",
+                "size corrected 45R_2",
+                "size corrected 46R_2",
+                "15Rbulk_2",
+                "17R_2",
+                "gamma",
+                "kappa",
+            ],
+        )
+
     return outputdfs, dfnames, maindf
@@ -0,0 +1,342 @@
+"""
+File: preprocessing.py
+---------------------------
+Created on Sat Oct 17th, 2026
+
+Functions to pre-process raw Isodat data into size-corrected,
+scale-normalized 31R, 45R and 46R, as the "size_correction" and
+"scale_normalization" tabs of the excel template do.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .isotopestandards import IsotopeStandards
+from .forwardmodel import isotopocules
+from .workbook import openworkbook
+
+# columns of the "size_correction" tab, for each ion: raw sample rR, raw
+# reference peak rR, ratio of ratios, size-corrected ratio of ratios, and
+# size-corrected (and, for 45R and 46R, scale-normalized) ratio
+COLUMNS = {
+    "31R": (
+        "rR 31NO/30NO sam",
+        "rR 31NO/30NO std",
+        "raw 31rR/31rR",
+        "size corrected 31rR/31rR",
+        "size corrected 31R",
+    ),
+    "45R": (
+        "rR 45N2O/44N2O sam",
+        "rR 45N2O/44N2O std",
+        "raw 45rR/45rR",
+        "size corrected 45rR/45rR",
+        "size corrected 45R",
+    ),
+    "46R": (
+        "rR 46N2O/44N2O sam",
+        "rR 46N2O/44N2O std",
+        "raw 46rR/46rR",
+        "size corrected 46rR/46rR",
+        "size corrected 46R",
+    ),
+}
+
+# scale-normalized ratio of ratios, for the ions that are scale normalized
+DECOMPRESSED = {
+    "45R": "scale decompressed 45rR/45rR",
+    "46R": "scale decompressed 46rR/46rR",
+}
+
+
+def templateconstants(data):
+    """
+    USAGE: reference, slopes, scalefactors = templateconstants(data)
+
+    DESCRIPTION:
+        Reads the user inputs in columns W-Y of the "size_correction" tab,
+        from fixed cells: the 31R, 45R and 46R of the N2O reference tank
+        (W3:Y3), the size correction slopes (W7:Y7), and the scale
+        normalization factors (X11:Y12). With the sheet read with
+        skiprows=1, these are rows 0, 4 and 8-9 of the "31R", "45R" and
+        "46R" columns.
+
+    INPUT:
+        :param data: "size_correction" tab, as read by Workbook.read
+        :type data: Pandas DataFrame
+
+    OUTPUT:
+        :returns: reference and slopes, Pandas Series indexed by "31R", "45R"
+        and "46R"; scalefactors, a Pandas DataFrame indexed by "lambda" and
+        "intercept", with columns "45R" and "46R".
+    """
+    missing = [col for col in ["31R", "45R", "46R"] if col not in data.columns]
+    if missing or len(data) < 10:
+        raise ValueError(
+            "the size_correction tab must have the reference tank ratios, size "
+            "correction slopes and scale normalization factors in cells W3:Y12 "
+            f"of the template (missing columns {missing}, {len(data)} rows)"
+        )
+
+    cells = {
+        "reference tank ratios (W3:Y3)": (0, ["31R", "45R", "46R"]),
+        "size correction slopes (W7:Y7)": (4, ["31R", "45R", "46R"]),
+        "lambda factors (X11:Y11)": (8, ["45R", "46R"]),
+        "intercepts (X12:Y12)": (9, ["45R", "46R"]),
+    }
+    values = {}
+    for name, (row, cols) in cells.items():
+        values[name] = pd.to_numeric(data[cols].iloc[row], errors="coerce")
+        if values[name].isna().any():
+            raise ValueError(
+                f"the {name} of the size_correction tab must be numbers, "
+                f"not {list(data[cols].iloc[row])}"
+            )
+
+    reference, slopes, lam, intercept = values.values()
+    scalefactors = pd.DataFrame({"lambda": lam, "intercept": intercept}).T
+
+    return reference.astype(float), slopes.astype(float), scalefactors.astype(float)
+
+
+def knownratios(isotopeconstants, reference, isotopestandards=None):
+    """
+    USAGE: known = knownratios(isotopeconstants, reference)
+
+    DESCRIPTION:
+        Calculates the 45R and 46R of each reference material from its
+        calibrated d15Na, d15Nb and d18O, with the equations in forwardmodel.py,
+        and their ratios to the 45R and 46R of the N2O reference tank (columns
+        G-N of the "scale_normalization" tab).
+
+    INPUT:
+        :param isotopeconstants: ref_tag, d15Na, d15Nb and d18O of each reference
+        material ("scale_normalization" tab)
+        :type isotopeconstants: Pandas DataFrame
+        :param reference: 45R and 46R of the N2O reference tank
+        :type reference: Pandas Series
+        :param isotopestandards: IsotopeStandards class from isotopestandards.py
+        (default: IsotopeStandards())
+        :type isotopestandards: Class
+
+    OUTPUT:
+        :returns: Pandas DataFrame indexed by ref_tag, with columns 45R, 46R,
+        45R/45R and 46R/46R.
+    """
+    if isotopestandards is None:
+        isotopestandards = IsotopeStandards()
+
+    refs = isotopeconstants.dropna(subset=["ref_tag"]).drop_duplicates(
+        subset="ref_tag", keep="first"
+    )
+
+    a = (refs["d15Na"].to_numpy(dtype=float) / 1000 + 1) * isotopestandards.R15Air
+    b = (refs["d15Nb"].to_numpy(dtype=float) / 1000 + 1) * isotopestandards.R15Air
+    r18 = (refs["d18O"].to_numpy(dtype=float) / 1000 + 1) * isotopestandards.R18VSMOW
+    r17 = (
+        isotopestandards.R17VSMOW
+        * (r18 / isotopestandards.R18VSMOW) ** isotopestandards.O17beta
+    )
+    x, y, z = isotopocules(a, b, r17, r18, 0, 0)
+
+    return pd.DataFrame(
+        {
+            "45R": y,
+            "46R": z,
+            "45R/45R": y / reference["45R"],
+            "46R/46R": z / reference["46R"],
+        },
+        index=pd.Index(refs["ref_tag"], name="ref_tag"),
+    )
+
+
+def scalenormalization(sizecorrected, ref_tags, known):
+    """
+    USAGE: scalefactors = scalenormalization(sizecorrected, data["ref_tag"], known)
+
+    DESCRIPTION:
+        Fits the lambda factors and intercepts of the logarithmic scale
+        normalization (Kaiser et al., 2007) to the reference materials in a
+        run: the least squares line through ln(known 45rR/45rR) against
+        ln(size corrected 45rR/45rR), and likewise for 46rR/46rR, as the
+        SLOPE and INTERCEPT formulas of the "scale_normalization" tab.
+
+    INPUT:
+        :param sizecorrected: size corrected 45rR/45rR and 46rR/46rR of each row
+        :type sizecorrected: Pandas DataFrame
+        :param ref_tags: ref_tag of each row; rows of unknowns are NaN
+        :type ref_tags: Pandas Series
+        :param known: known 45R/45R and 46R/46R of each reference material,
+        indexed by ref_tag (see knownratios)
+        :type known: Pandas DataFrame
+
+    OUTPUT:
+        :returns: Pandas DataFrame indexed by "lambda" and "intercept", with
+        columns "45R" and "46R".
+    """
+    scalefactors = pd.DataFrame(index=["lambda", "intercept"], columns=["45R", "46R"])
+
+    for ion in ["45R", "46R"]:
+        measured = np.log(sizecorrected[COLUMNS[ion][3]].to_numpy(dtype=float))
+        truth = np.log(known[f"{ion}/{ion}"].reindex(ref_tags).to_numpy(dtype=float))
+
+        ok = np.isfinite(measured) & np.isfinite(truth)
+        if ok.sum() < 2:
+            raise ValueError(
+                "scale normalization needs at least two rows of reference "
+                f"materials, with ref_tags in {list(known.index)}; found {ok.sum()}"
+            )
+
+        slope, intercept = np.polyfit(measured[ok], truth[ok], 1)
+        scalefactors[ion] = [slope, intercept]
+
+    return scalefactors.astype(float)
+
+
+def preprocess(
+    data,
+    isotopeconstants=None,
+    reference=None,
+    slopes=None,
+    scalefactors=None,
+    isotopestandards=None,
+    area=20.0,
+):
+    """
+    USAGE: data, scalefactors = preprocess(workbook.read("size_correction"),
+                                           workbook.read("scale_normalization"))
+
+    DESCRIPTION:
+        Calculates the size-corrected 31R, 45R and 46R of every row of a run
+        from the raw Isodat rR of the sample peak and its designated reference
+        peak, with the same steps as the formulas in the excel template, for
+        all rows at once:
+            1. ratio of ratios: sample rR / reference peak rR (columns AA-AC)
+            2. size correction: slope * (area - Area 44) + ratio of ratios,
+               with slopes normalized to the m/z 44 peak area (columns AE-AG)
+            3. scale normalization of 45rR/45rR and 46rR/46rR:
+               (45rR/45rR)^lambda * exp(intercept) (columns AI-AJ)
+            4. multiplication by the 31R, 45R and 46R of the N2O reference
+               tank (columns AL-AN)
+
+        The reference tank ratios, size correction slopes and scale
+        normalization factors default to the values entered in the template,
+        in which case the results match the template's own columns AL-AN to
+        within 2e-16. If isotopeconstants is given, the scale normalization
+        factors are instead fitted to every row with a ref_tag (see
+        scalenormalization). The template's factors are fitted only to the
+        rows referenced in its "scale_normalization" tab, so a refit can
+        differ: on the example template, the 45R lambda factor is 1.108
+        rather than 0.910, which moves size-corrected 45R by up to 2.4 per mil
+        and 46R by up to 1.1 per mil.
+
+    INPUT:
+        :param data: "size_correction" tab, with the raw "rR ... sam" and
+        "rR ... std" columns, "Area 44", and, to fit the scale normalization,
+        "ref_tag"
+        :type data: Pandas DataFrame
+        :param isotopeconstants: ref_tag, d15Na, d15Nb and d18O of each reference
+        material ("scale_normalization" tab). If None, scalefactors or the
+        factors entered in the template are used.
+        :type isotopeconstants: Pandas DataFrame
+        :param reference: 31R, 45R and 46R of the N2O reference tank
+        :type reference: dict or Pandas Series
+        :param slopes: size correction slopes of 31rR/31rR, 45rR/45rR and 46rR/46rR
+        :type slopes: dict or Pandas Series
+        :param scalefactors: lambda factors and intercepts for 45R and 46R,
+        e.g. {"45R": [0.91, 0.0007], "46R": [0.87, -0.002]}
+        :type scalefactors: dict or Pandas DataFrame
+        :param isotopestandards: IsotopeStandards class from isotopestandards.py,
+        used to calculate the known ratios of the reference materials
+        :type isotopestandards: Class
+        :param area: m/z 44 peak area that the size correction corrects to
+        :type area: float
+
+    OUTPUT:
+        :returns: data, a copy of data with the ratio of ratios, size corrected
+        and scale decompressed columns, and "size corrected 31R", "size
+        corrected 45R" and "size corrected 46R", filled in; and scalefactors,
+        the lambda factors and intercepts used, as a Pandas DataFrame indexed
+        by "lambda" and "intercept", with columns "45R" and "46R".
+    """
+    raw = [col for cols in COLUMNS.values() for col in cols[:2]] + ["Area 44"]
+    missing = [col for col in raw if col not in data.columns]
+    if missing:
+        raise ValueError(f"raw data has no columns {missing}")
+
+    if reference is None or slopes is None or (
+        scalefactors is None and isotopeconstants is None
+    ):
+        templatereference, templateslopes, templatefactors = templateconstants(data)
+        reference = templatereference if reference is None else reference
+        slopes = templateslopes if slopes is None else slopes
+        if scalefactors is None and isotopeconstants is None:
+            scalefactors = templatefactors
+    reference = pd.Series(reference, dtype=float)
+    slopes = pd.Series(slopes, dtype=float)
+
+    data = data.copy()
+    size = area - data["Area 44"].to_numpy(dtype=float)
+
+    for ion, (sample, std, ratio, corrected, final) in COLUMNS.items():
+        data[ratio] = data[sample].astype(float) / data[std].astype(float)
+        data[corrected] = slopes[ion] * size + data[ratio]
+
+    if scalefactors is None:
+        known = knownratios(isotopeconstants, reference, isotopestandards)
+        scalefactors = scalenormalization(data, data["ref_tag"], known)
+    scalefactors = pd.DataFrame(
+        scalefactors, index=["lambda", "intercept"], dtype=float
+    )
+
+    for ion, decompressed in DECOMPRESSED.items():
+        lam, intercept = scalefactors[ion]
+        data[decompressed] = data[COLUMNS[ion][3]] ** lam * np.exp(intercept)
+
+    data[COLUMNS["31R"][4]] = data[COLUMNS["31R"][3]] * reference["31R"]
+    for ion, decompressed in DECOMPRESSED.items():
+        data[COLUMNS[ion][4]] = data[decompressed] * reference[ion]
+
+    return data, scalefactors
+
+
+def preprocessworkbook(inputfile, tabname=None, fit=False, **kwargs):
+    """
+    USAGE: workbook, scalefactors = preprocessworkbook("raw_run.xlsx")
+           Isotopomers(inputfile=workbook, scrambling=[0.17, 0.08])
+
+    DESCRIPTION:
+        Reads a template with raw Isodat data pasted in, pre-processes its
+        "size_correction" tab with preprocess(), and returns the Workbook with
+        the pre-processed tab in place of the one in the file, so that
+        Scrambling and Isotopomers read the recalculated size-corrected 31R,
+        45R and 46R without the template being recalculated in Excel.
+
+    INPUT:
+        :param inputfile: template, columnar file or directory, or Workbook
+        (see workbook.py)
+        :type inputfile: string or Workbook
+        :param tabname: name of tab containing raw data (default: "size_correction")
+        :type tabname: string
+        :param fit: if False (default), use the scale normalization factors
+        entered in the template (or given as scalefactors); if True, refit
+        them to every row with a ref_tag, using the delta values in the
+        "scale_normalization" tab (see preprocess)
+        :type fit: Bool
+        :param kwargs: other keyword arguments for preprocess, e.g. reference,
+        slopes or isotopestandards
+
+    OUTPUT:
+        :returns: Workbook class from workbook.py, and the scale normalization
+        factors used (see preprocess)
+    """
+    workbook = openworkbook(inputfile)
+    if tabname is None:
+        tabname = "size_correction"
+
+    if fit and kwargs.get("scalefactors") is None:
+        kwargs["isotopeconstants"] = workbook.read("scale_normalization", skiprows=1)
+
+    data, scalefactors = preprocess(workbook.read(tabname, skiprows=1), **kwargs)
+    workbook.update(tabname, data, skiprows=1)
+    return workbook, scalefactors
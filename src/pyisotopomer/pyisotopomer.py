@@ -15,10 +15,17 @@ from .isotopestandards import IsotopeStandards
 from .calcSPmain import calcSPmain
 from .tracerSPmain import tracerSPmain
 from .calcdeltaSP import calcdeltaSP
+from .montecarlo import montecarlo
 from .scramblinginput import ScramblingInput
-from .isotopomerinput import IsotopomerInput
+from .isotopomerinput import IsotopomerInput, iterisotopomerinput
 from .tracerinput import TracerInput
+from .diagnostics import Diagnostics
+from .parallelsolve import solverpool
+from .workbook import openworkbook
 from .parseoutput import parseoutput
+from .excelwriter import writeexcel
+from .bootstrap import bootstrapscrambling
+from .scramblingtimeseries import ScramblingTimeSeries
 
 
 class Scrambling:
@@ -37,7 +44,11 @@ class Scrambling:
     INPUT:
         :param inputfile: Spreadsheet of size-corrected reference materials,
         following the format of "00_Python_template_v2.xlsx".
-        :type inputfile: .xlsx file
+        May also be a .csv, .parquet, .feather, .npy or .npz file, or a directory
+        of them, with the same column names (see workbook.py), or a Workbook
+        object, to reuse a template that has already been read in, e.g.
+        Scrambling(...).workbook.
+        :type inputfile: .xlsx file, columnar file, or Workbook
         :param **Refs: Reference materials included in input spreadsheet:
         e.g., ref1="NAME", ref2="NAME", ref3="NAME"
         :type **Refs: Variadic kwargs
@@ -51,8 +62,11 @@ class Scrambling:
         If None, default to "algebraic".
         :type method: String
         :param initialguess: Initial guess for gamma and kappa.
-        If None, default to [0.17, 0.08].
-        :type initialguess: list or Numpy array
+        If None, default to [0.17, 0.08]. With method="least_squares", may also
+        be "algebraic" to start each pairing from its algebraic solution, or
+        "previous" to start each pairing from the solution of the one before it
+        ("previous" cannot be combined with n_jobs or executor).
+        :type initialguess: list, Numpy array or String
         :param lowerbounds: Lower bounds for automate_gk_solver.
         If None, default to [0.0, 0.0].
         :type lowerbounds: list or Numpy array
@@ -67,6 +81,34 @@ class Scrambling:
         :type R17VSMOW: float
         :param R18VSMOW: adjustable 18/16R of VSMOW.
         :type R18VSMOW: float
+        :param diagnostics: Diagnostics object from diagnostics.py, collecting
+        intermediate tables (normalized_ratios, normalized_deltas) during the run.
+        If None, these are written to .csv files in the current working
+        directory once the run is finished.
+        :type diagnostics: Class
+        :param n_jobs: Number of worker processes to solve chunks of rows in,
+        or -1 to use every core. If None (default), solve in this process.
+        :type n_jobs: int
+        :param executor: Existing executor (e.g. a ProcessPoolExecutor) to
+        solve chunks of rows in, instead of starting a new process pool.
+        :type executor: concurrent.futures.Executor
+        :param layout: Layout of the output file. "sheets" (default) writes all
+        pairings to one sheet ("all") and each pairing to a sheet of its own;
+        "long" writes one long-format table, with a "pairing" and a "run_date"
+        column, to a single sheet, or to a .csv file if outputfile ends in .csv.
+        :type layout: String
+        :param streaming: If True, write the output .xlsx file one row at a time
+        with a write-only workbook (see excelwriter.py), so that memory use doesn't
+        grow with the number of pairings. Cell values are the same as with False.
+        :type streaming: Bool
+        :param bootstrap: Number of bootstrap resamples of run dates and
+        pairings to calculate confidence intervals on the mean gamma and kappa
+        with (see bootstrap.py). If None (default), no intervals are calculated.
+        :type bootstrap: int
+        :param confidence: Confidence level of the bootstrap intervals.
+        :type confidence: float
+        :param seed: Seed for the bootstrap resamples, to make them reproducible.
+        :type seed: int
 
     OUTPUT:
         :param IsotopeStandards: IsotopeStandards class from isotopestandards.py,
@@ -74,6 +116,9 @@ class Scrambling:
         :type isotopestandards: Class
         :param inputobj: Input class from parseinput.py
         :type inputobj: Class
+        :param workbook: Workbook class from workbook.py, which can be passed
+        to Isotopomers as inputfile to reuse the parsed template.
+        :type workbook: Class
         :param outputs: Tables of scrambling coefficients for each pairing of ref. materials.
         :type outputs: List of Pandas DataFrames
         :param pairings: List of ref. material pairings generated from parseinputs
@@ -86,6 +131,12 @@ class Scrambling:
         :type scrambling_mean: Pandas Series
         :param scrambling_std: Pandas DataFrame object with standard dev. of gamma and kappa values.
         :type scrambling_std: Pandas Series
+        :param scrambling_ci: If bootstrap is given, mean, bootstrap standard error,
+        and lower and upper confidence limits of gamma and kappa; otherwise None.
+        :type scrambling_ci: Pandas DataFrame
+        :param scrambling_bootstrap: If bootstrap is given, mean gamma and kappa
+        of each bootstrap resample; otherwise None.
+        :type scrambling_bootstrap: Pandas DataFrame
 
     @author: Colette L. Kelly (clkelly@stanford.edu).
     """
@@ -105,6 +156,14 @@ class Scrambling:
         R15Air=None,
         R17VSMOW=None,
         R18VSMOW=None,
+        diagnostics=None,
+        n_jobs=None,
+        executor=None,
+        layout="sheets",
+        streaming=False,
+        bootstrap=None,
+        confidence=0.95,
+        seed=None,
         **Refs,
     ):
 
@@ -125,36 +184,109 @@ class Scrambling:
 
         self.outputfile = outputfile
 
-        self.inputobj = ScramblingInput(inputfile, self.IsotopeStandards, **Refs)
-
-        self.outputs, self.pairings, self.alloutputs = parseoutput(
-            self.inputobj,
-            method=method,
-            initialguess=initialguess,
-            lowerbounds=lowerbounds,
-            upperbounds=upperbounds,
-            weights=weights,
-        )
-
-        self.scrambling = self.alloutputs[["gamma", "kappa"]]
-        self.scrambling_mean = self.scrambling.mean()
-        self.scrambling_std = self.scrambling.std()
+        # intermediate tables are only written out once the run is finished
+        if diagnostics is None:
+            diagnostics = Diagnostics()
+        self.diagnostics = diagnostics
+
+        self.workbook = openworkbook(inputfile)
+
+        # one process pool for calculate_17R and automate_gk_solver
+        with solverpool(n_jobs, executor) as pool:
+            try:
+                self.inputobj = ScramblingInput(
+                    self.workbook,
+                    self.IsotopeStandards,
+                    diagnostics=self.diagnostics,
+                    n_jobs=n_jobs,
+                    executor=pool,
+                    **Refs,
+                )
+            finally:
+                # close the template if it was opened here, now that it's parsed
+                if self.workbook is not inputfile:
+                    self.workbook.close()
+
+            self.outputs, self.pairings, self.alloutputs = parseoutput(
+                self.inputobj,
+                method=method,
+                initialguess=initialguess,
+                lowerbounds=lowerbounds,
+                upperbounds=upperbounds,
+                weights=weights,
+                n_jobs=n_jobs,
+                executor=pool,
+            )
+
+            self.scrambling = self.alloutputs[["gamma", "kappa"]]
+            self.scrambling_mean = self.scrambling.mean()
+            self.scrambling_std = self.scrambling.std()
+
+            if bootstrap is not None:
+                self.scrambling_ci, self.scrambling_bootstrap = bootstrapscrambling(
+                    self.alloutputs,
+                    nresamples=bootstrap,
+                    confidence=confidence,
+                    seed=seed,
+                    n_jobs=n_jobs,
+                    executor=pool,
+                )
+            else:
+                self.scrambling_ci, self.scrambling_bootstrap = None, None
 
         if saveout == True:
-            self.saveoutput(self.outputfile)
+            self.saveoutput(self.outputfile, layout=layout, streaming=streaming)
         else:
             pass
 
-    def saveoutput(self, outputfilename):
+        self.diagnostics.flush()
+
+    def saveoutput(self, outputfilename, layout="sheets", streaming=False):
+
+        if layout == "long":
+            # one table of all pairings, with the pairing and run date as columns
+            longoutput = self.longoutput()
+            if str(outputfilename).endswith(".csv"):
+                longoutput.to_csv(outputfilename, index=False)
+            elif streaming:
+                writeexcel(outputfilename, [("all", longoutput)], index=False)
+            else:
+                longoutput.to_excel(outputfilename, sheet_name="all", index=False)
+
+        elif layout == "sheets":
+            if streaming:
+                # write each sheet one row at a time
+                writeexcel(
+                    outputfilename,
+                    [("all", self.alloutputs)] + list(zip(self.pairings, self.outputs)),
+                )
+                return
+
+            # Create an excel file containing the output data
+            with pd.ExcelWriter(outputfilename) as writer:
+                self.alloutputs.to_excel(
+                    writer, sheet_name="all"
+                )  # save out main dataframe to one sheet
+                for df, name in zip(self.outputs, self.pairings):
+                    # write each output dataframe to a separate sheet in the output spreadsheet
+                    df.to_excel(writer, sheet_name=name)
+
+        else:
+            raise ValueError(f"layout must be 'sheets' or 'long', not {layout!r}")
+
+    def timeseries(self, window=10):
+        # running gamma and kappa over the last window pairings, by run date
+        return ScramblingTimeSeries(self, window=window)
 
-        # Create an excel file containing the output data
-        with pd.ExcelWriter(outputfilename) as writer:
-            self.alloutputs.to_excel(
-                writer, sheet_name="all"
-            )  # save out main dataframe to one sheet
-            for df, name in zip(self.outputs, self.pairings):
-                # write each output dataframe to a separate sheet in the output spreadsheet
-                df.to_excel(writer, sheet_name=name)
+    def longoutput(self):
+        # all pairings in one long-format table, labelled by pairing, e.g. "ATM-S2"
+        if len(self.outputs) == 0:
+            return self.alloutputs.assign(pairing=None, run_date=None)[
+                ["pairing", "run_date", *self.alloutputs.columns]
+            ]
+        return pd.concat(
+            self.outputs, keys=self.pairings, names=["pairing"]
+        ).reset_index()
 
     def __repr__(self):
         if self.saveout == True:
@@ -176,15 +308,22 @@ class Isotopomers:
     INPUT:
         :param inputfile: Spreadsheet of size-corrected reference materials,
         following the format of "00_Python_template.xlsx".
-        :type inputfile: .xlsx file
+        May also be a .csv, .parquet, .feather, .npy or .npz file, or a directory
+        of them, with the same column names (see workbook.py), or a Workbook
+        object, to reuse a template that has already been read in, e.g.
+        Scrambling(...).workbook.
+        :type inputfile: .xlsx file, columnar file, or Workbook
         :param saveout: If True, save output .xlsx file of scrambling results.
         :type saveout: Bool
         :param outputfile: Output filename. If None and saveout=True, default to
             "{date}__isotopeoutput.csv"
         :type outputfile: String
         :param initialguess: Initial guess for 15Ralpha and 15Rbeta
-        If None, default to [0.0037, 0.0037].
-        :type initialguess: list or Numpy array
+        If None, default to [0.0037, 0.0037]. May also be "bulk" to start each
+        row from an estimate based on its 45R and 46R, or "previous" to start
+        each row from the solution of the row before it ("previous" cannot be
+        combined with n_jobs or executor).
+        :type initialguess: list, Numpy array or String
         :param lowerbounds: Lower bounds for calcSPmain.py
         If None, default to [0.0, 0.0].
         :type lowerbounds: list or Numpy array
@@ -199,11 +338,64 @@ class Isotopomers:
         :type R17VSMOW: float
         :param R18VSMOW: adjustable 18/16R of VSMOW.
         :type R18VSMOW: float
+        :param method: Solver backend for calcSPmain.py: "least_squares" (default)
+        solves one row at a time; "newton" and "bracketed" solve all rows at once.
+        :type method: String
+        :param diagnostics: Diagnostics object from diagnostics.py, collecting
+        intermediate tables (isotope_ratios) during the run.
+        If None, no intermediate tables are kept.
+        :type diagnostics: Class
+        :param n_jobs: Number of worker processes to solve chunks of rows in,
+        or -1 to use every core. If None (default), solve in this process.
+        :type n_jobs: int
+        :param executor: Existing executor (e.g. a ProcessPoolExecutor) to
+        solve chunks of rows in, instead of starting a new process pool.
+        :type executor: concurrent.futures.Executor
+        :param cache: ResultCache from resultcache.py. If given, rows that have
+        been solved before with the same isotope standards and solver settings
+        are read from the cache instead of being solved again, and the number
+        of cache hits and misses is printed.
+        :type cache: Class
+        :param chunksize: If given, read, solve and save out the input in chunks
+        of at most chunksize rows, appending each chunk to the output file, so
+        that memory use doesn't grow with the size of the input. R, data,
+        isotoperatios and deltavals then hold the first chunk only, and
+        diagnostics are not collected.
+        :type chunksize: int
+        :param uncertainty: Standard deviations of any of "31R", "45R", "46R",
+        "gamma" and "kappa", one value for every row or an array with one value
+        per row. If given, nsamples perturbations of each row are solved
+        together with the "bracketed" solver (or "newton", if that is the
+        method), and the mean, standard deviation and 2.5th and 97.5th
+        percentiles of d15Na, d15Nb, SP and d18O are added to deltavals (see
+        montecarlo.py).
+        :type uncertainty: dict
+        :param nsamples: Number of perturbations of each row, if uncertainty is given.
+        Must be at least 2.
+        :type nsamples: int
+        :param seed: Seed for the perturbations, to make them reproducible.
+        :type seed: int
+        :param scrambling: Scrambling coefficients to use instead of the gamma
+        and kappa columns of the template: a ScramblingTimeSeries, whose
+        running gamma and kappa are matched to each sample by run_date; a
+        Scrambling object, from whose pairings a ScramblingTimeSeries is built;
+        or one [gamma, kappa] for every sample. If None (default), use the
+        gamma and kappa columns of the template.
+        :type scrambling: Class or list
+        :param direction: With a time series, "backward" (default) to use the
+        running gamma and kappa of the last run date on or before each sample's
+        run date, or "nearest" to use those of the closest run date.
+        :type direction: String
+        :param window: Number of pairings to average over, if scrambling is a
+        Scrambling object.
+        :type window: int
 
     OUTPUT
         :param IsotopeStandards: IsotopeStandards class from isotopestandards.py,
         containing 15RAir, 18RVSMOW, 17RVSMOW, and beta for the 18O/17O relation.
         :type isotopestandards: Class
+        :param workbook: Workbook class from workbook.py holding the parsed template.
+        :type workbook: Class
         :param R: Size-corrected 31R, 45R, and 46R, gamma, and kappa.
         :type R: Numpy array.
         :param isotoperatios: Pandas DataFrame object with  dimensions n x 4,
@@ -214,6 +406,8 @@ class Isotopomers:
             where n is the number of measurements.  The six columns are d15Nalpha,
             d15Nbeta, site preference, d15Nbulk, d17O and d18O from left to right.
         :type deltavals: Pandas DataFrame
+        :param nrows: Number of rows solved.
+        :type nrows: int
 
     @author: Colette L. Kelly (clkelly@stanford.edu).
     """
@@ -231,6 +425,18 @@ class Isotopomers:
         R15Air=None,
         R17VSMOW=None,
         R18VSMOW=None,
+        method="least_squares",
+        diagnostics=None,
+        n_jobs=None,
+        executor=None,
+        cache=None,
+        chunksize=None,
+        uncertainty=None,
+        nsamples=1000,
+        seed=None,
+        scrambling=None,
+        direction="backward",
+        window=10,
     ):
 
         # default arguments
@@ -246,25 +452,130 @@ class Isotopomers:
             O17beta=O17beta, R15Air=R15Air, R17VSMOW=R17VSMOW, R18VSMOW=R18VSMOW
         )
 
-        # core isotopomer functions
-        self.R = IsotopomerInput(inputfile, tabname).ratiosscrambling
-        self.isotoperatios = calcSPmain(
-            self.R,
-            self.IsotopeStandards,
+        if diagnostics is None:
+            diagnostics = Diagnostics(mode="off")
+        self.diagnostics = diagnostics
+
+        # check before any rows are solved, not once montecarlo is reached
+        if uncertainty is not None and nsamples < 2:
+            raise ValueError(f"nsamples must be at least 2, not {nsamples!r}")
+        self.uncertainty = uncertainty
+        self.nsamples = nsamples
+        self.rng = np.random.default_rng(seed)
+
+        # hits and misses so far, to report those of this run only
+        cachecounts = (cache.hits, cache.misses) if cache is not None else None
+
+        solverkwargs = dict(
             initialguess=initialguess,
             lowerbounds=lowerbounds,
             upperbounds=upperbounds,
+            method=method,
+            n_jobs=n_jobs,
+            cache=cache,
         )
-        self.deltavals = calcdeltaSP(self.isotoperatios, self.IsotopeStandards)
+
+        if chunksize is None:
+            # core isotopomer functions
+            self.workbook = openworkbook(inputfile)
+            try:
+                self.inputobj = IsotopomerInput(
+                    self.workbook,
+                    tabname,
+                    scrambling=scrambling,
+                    direction=direction,
+                    window=window,
+                )
+            finally:
+                # close the template if it was opened here, now that it's parsed
+                if self.workbook is not inputfile:
+                    self.workbook.close()
+            self.R = self.inputobj.ratiosscrambling
+            self.data = self.inputobj.data
+            with solverpool(n_jobs, executor) as pool:
+                self.isotoperatios, self.deltavals = self.calculate(
+                    self.R, self.data, executor=pool, **solverkwargs
+                )
+            self.diagnostics.add("isotope_ratios", self.isotoperatios)
+            self.nrows = len(self.deltavals)
+
+            if saveout == True:
+                self.saveoutput(self.deltavals, outputfile)
+            else:
+                pass
+
+        else:
+            # read, solve and save out one chunk of rows at a time, keeping
+            # only the first chunk in memory
+            self.workbook = openworkbook(inputfile)
+            self.inputobj, self.R, self.data = None, None, None
+            self.isotoperatios, self.deltavals = None, None
+            self.nrows = 0
+            try:
+                with solverpool(n_jobs, executor) as pool:
+                    for R, data in iterisotopomerinput(
+                        self.workbook,
+                        tabname,
+                        chunksize,
+                        scrambling=scrambling,
+                        direction=direction,
+                        window=window,
+                    ):
+                        isotoperatios, deltavals = self.calculate(
+                            R, data, executor=pool, **solverkwargs
+                        )
+                        if saveout == True:
+                            self.saveoutput(
+                                deltavals, outputfile, append=self.nrows > 0
+                            )
+                        if self.nrows == 0:
+                            self.R, self.data = R, data
+                            self.isotoperatios = isotoperatios
+                            self.deltavals = deltavals
+                        self.nrows += len(deltavals)
+            finally:
+                # close the template if it was opened here, now that it's parsed
+                if self.workbook is not inputfile:
+                    self.workbook.close()
+
+        if cache is not None:
+            print(
+                f"cache: {cache.hits - cachecounts[0]} hits, "
+                f"{cache.misses - cachecounts[1]} misses"
+            )
+
+        self.diagnostics.flush()
+
+    def calculate(self, R, data, **solverkwargs):
+        # solve for isotopocule ratios and delta values from R, with the
+        # identification & QC columns taken from data
+        isotoperatios = calcSPmain(R, self.IsotopeStandards, **solverkwargs)
+        deltavals = calcdeltaSP(isotoperatios, self.IsotopeStandards)
 
         # additional columns for identification & QC
-        self.data = IsotopomerInput(inputfile, tabname).data
-        self.deltavals["run_date"] = self.data["run_date"]
-        self.deltavals["Identifier 1"] = self.data["Identifier 1"]
-        self.deltavals["gamma"] = self.R[:, 4]
-        self.deltavals["kappa"] = self.R[:, 5]
+        deltavals["run_date"] = data["run_date"]
+        deltavals["Identifier 1"] = data["Identifier 1"]
+        deltavals["gamma"] = R[:, 4]
+        deltavals["kappa"] = R[:, 5]
+
+        if self.uncertainty is not None:
+            # spread of the delta values over perturbations of R
+            stats = montecarlo(
+                R,
+                self.IsotopeStandards,
+                self.uncertainty,
+                nsamples=self.nsamples,
+                seed=self.rng,
+                method="newton" if solverkwargs["method"] == "newton" else "bracketed",
+                lowerbounds=solverkwargs["lowerbounds"],
+                upperbounds=solverkwargs["upperbounds"],
+                n_jobs=solverkwargs["n_jobs"],
+                executor=solverkwargs["executor"],
+            )
+        else:
+            stats = None
 
-        self.deltavals = self.deltavals[
+        deltavals = deltavals[
             [
                 "run_date",
                 "Identifier 1",
@@ -277,15 +588,21 @@ class Isotopomers:
             ]
         ]
 
-        if saveout == True:
-            self.saveoutput(self.deltavals, outputfile)
-        else:
-            pass
+        if stats is not None:
+            deltavals = pd.concat([deltavals, stats], axis=1)
 
-    def saveoutput(self, deltavals, outputfile):
+        return isotoperatios, deltavals
+
+    def saveoutput(self, deltavals, outputfile, append=False):
         # Create a commma delimited text file containing the output data
         # The columns from left to right are gamma and kappa
-        deltavals.to_csv(path_or_buf=f"{outputfile}", header=True, index=False)
+        # With append=True, add rows to the end of an existing file
+        if append:
+            deltavals.to_csv(
+                path_or_buf=f"{outputfile}", mode="a", header=False, index=False
+            )
+        else:
+            deltavals.to_csv(path_or_buf=f"{outputfile}", header=True, index=False)
 
     def __repr__(self):
 
@@ -311,7 +628,11 @@ class Tracers:
     INPUT:
         :param inputfile: Spreadsheet of size-corrected reference materials,
         following the format of "00_Tracer_template.xlsx".
-        :type inputfile: .xlsx file
+        May also be a .csv, .parquet, .feather, .npy or .npz file, or a directory
+        of them, with the same column names (see workbook.py), or a Workbook
+        object, to reuse a template that has already been read in, e.g.
+        Scrambling(...).workbook.
+        :type inputfile: .xlsx file, columnar file, or Workbook
         :param saveout: If True, save output .xlsx file of scrambling results.
         :type saveout: Bool
         :param outputfile: Output filename. If None and saveout=True, default to
@@ -334,11 +655,31 @@ class Tracers:
         :type R17VSMOW: float
         :param R18VSMOW: adjustable 18/16R of VSMOW.
         :type R18VSMOW: float
+        :param method: Solver backend for tracerSPmain.py: "least_squares" (default)
+        solves one row at a time; "linear" solves all rows at once in closed form.
+        :type method: String
+        :param diagnostics: Diagnostics object from diagnostics.py, collecting
+        intermediate tables (isotope_ratios) during the run.
+        If None, no intermediate tables are kept.
+        :type diagnostics: Class
+        :param n_jobs: Number of worker processes to solve chunks of rows in,
+        or -1 to use every core. If None (default), solve in this process.
+        :type n_jobs: int
+        :param executor: Existing executor (e.g. a ProcessPoolExecutor) to
+        solve chunks of rows in, instead of starting a new process pool.
+        :type executor: concurrent.futures.Executor
+        :param cache: ResultCache from resultcache.py. If given, rows that have
+        been solved before with the same isotope standards and solver settings
+        are read from the cache instead of being solved again, and the number
+        of cache hits and misses is printed.
+        :type cache: Class
 
     OUTPUT
         :param IsotopeStandards: IsotopeStandards class from isotopestandards.py,
         containing 15RAir, 18RVSMOW, 17RVSMOW, and beta for the 18O/17O relation.
         :type isotopestandards: Class
+        :param workbook: Workbook class from workbook.py holding the parsed template.
+        :type workbook: Class
         :param R: Size-corrected 31R, 45R, and 46R, gamma, and kappa.
         :type R: Numpy array.
         :param isotoperatios: Pandas DataFrame object with  dimensions n x 4,
@@ -366,6 +707,11 @@ class Tracers:
         R15Air=None,
         R17VSMOW=None,
         R18VSMOW=None,
+        method="least_squares",
+        diagnostics=None,
+        n_jobs=None,
+        executor=None,
+        cache=None,
     ):
 
         # default arguments
@@ -380,20 +726,45 @@ class Tracers:
             O17beta=O17beta, R15Air=R15Air, R17VSMOW=R17VSMOW, R18VSMOW=R18VSMOW
         )
 
-        # self.scrambling = self.check_scrambling(scrambling)
-        self.R = TracerInput(inputfile, tabname).sizecorrected
+        if diagnostics is None:
+            diagnostics = Diagnostics(mode="off")
+        self.diagnostics = diagnostics
 
-        self.isotoperatios = tracerSPmain(
-            self.R,
-            self.IsotopeStandards,
-            initialguess=initialguess,
-            lowerbounds=lowerbounds,
-            upperbounds=upperbounds,
-        )
+        # hits and misses so far, to report those of this run only
+        cachecounts = (cache.hits, cache.misses) if cache is not None else None
+
+        # self.scrambling = self.check_scrambling(scrambling)
+        self.workbook = openworkbook(inputfile)
+        try:
+            self.inputobj = TracerInput(self.workbook, tabname)
+        finally:
+            # close the template if it was opened here, now that it's parsed
+            if self.workbook is not inputfile:
+                self.workbook.close()
+        self.R = self.inputobj.sizecorrected
+
+        with solverpool(n_jobs, executor) as pool:
+            self.isotoperatios = tracerSPmain(
+                self.R,
+                self.IsotopeStandards,
+                initialguess=initialguess,
+                lowerbounds=lowerbounds,
+                upperbounds=upperbounds,
+                method=method,
+                n_jobs=n_jobs,
+                executor=pool,
+                cache=cache,
+            )
+        self.diagnostics.add("isotope_ratios", self.isotoperatios)
+        if cache is not None:
+            print(
+                f"cache: {cache.hits - cachecounts[0]} hits, "
+                f"{cache.misses - cachecounts[1]} misses"
+            )
         self.deltavals = calcdeltaSP(self.isotoperatios, self.IsotopeStandards)
 
         # additional columns for identification & QC
-        self.data = TracerInput(inputfile, tabname).data
+        self.data = self.inputobj.data
         self.deltavals["15Ralpha"] = self.isotoperatios["15Ralpha"]
         self.deltavals["15Rbeta"] = self.isotoperatios["15Rbeta"]
         self.deltavals["run_date"] = self.data["run_date"]
@@ -421,6 +792,8 @@ class Tracers:
         else:
             pass
 
+        self.diagnostics.flush()
+
     def saveoutput(self, deltavals, outputfile):
         # Create a commma delimited text file containing the output data
         # The columns from left to right are gamma and kappa
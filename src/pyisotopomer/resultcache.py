@@ -0,0 +1,177 @@
+"""
+File: resultcache.py
+---------------------------
+Created on Sat Oct 17th, 2026
+
+ResultCache class to keep solutions for each row of input on disk,
+so that rows that have already been solved aren't solved again.
+"""
+
+import hashlib
+import sqlite3
+import time
+import numpy as np
+
+# change whenever the solvers change in a way that changes their solutions,
+# so that solutions cached by earlier versions are no longer used
+CACHEVERSION = 1
+
+
+class ResultCache:
+    """
+    Keep the 15Ralpha and 15Rbeta solved for each row on disk, in an SQLite file.
+
+    USAGE: cache = ResultCache("isotopomer_cache.sqlite")
+           deltavals = Isotopomers(inputfile="00_Python_template.xlsx", cache=cache)
+
+    DESCRIPTION:
+        calcSPmain and tracerSPmain look up each row of R in the cache before
+        solving it, and only solve the rows that are not found (cache misses).
+        Each row is keyed by a hash of its values (e.g. 31R, 45R, 46R, D17O,
+        gamma, kappa) together with the IsotopeStandards parameters and the
+        solver settings (solver, method, initial guess and bounds), so that
+        changing any of these solves the row again. Cached solutions are
+        exactly those the solver returned. (With initialguess="previous",
+        a row's solution also depends on the row before it, so a cached
+        solution may differ from a fresh one in the last few digits.)
+
+        When the cache holds more than maxrows rows, the rows that were least
+        recently used are removed. hits and misses count the rows found and
+        not found since the cache was opened.
+
+    INPUT:
+        :param path: filename of the SQLite cache file. It is created if it doesn't
+        exist. If ":memory:", the cache only lasts as long as the ResultCache object.
+        :type path: string
+        :param maxrows: maximum number of rows to keep in the cache
+        :type maxrows: int
+
+    OUTPUT:
+        :param hits: number of rows found in the cache
+        :type hits: int
+        :param misses: number of rows not found in the cache
+        :type misses: int
+    """
+
+    def __init__(self, path="pyisotopomer_cache.sqlite", maxrows=1000000):
+
+        if maxrows < 1:
+            raise ValueError(f"maxrows must be a positive integer, not {maxrows!r}")
+
+        self.path = path
+        self.maxrows = maxrows
+
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            """CREATE TABLE IF NOT EXISTS results (
+                key BLOB PRIMARY KEY,
+                alpha REAL NOT NULL,
+                beta REAL NOT NULL,
+                lastused REAL NOT NULL
+            )"""
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS results_lastused ON results (lastused)"
+        )
+        self.connection.commit()
+
+        self.hits = 0
+        self.misses = 0
+
+    def makekeys(self, R, isotopestandards, **settings):
+        # one key per row of R: a hash of the row, the isotope standards and the
+        # solver settings. Array-valued settings with one row per row of R (e.g.
+        # per-row initial guesses) are hashed with their row.
+        R = np.ascontiguousarray(R, dtype=float)
+
+        shared, perrow = [("version", CACHEVERSION)], []
+        for name in ("O17beta", "R15Air", "R17VSMOW", "R18VSMOW"):
+            shared.append((name, float(getattr(isotopestandards, name))))
+        for name, value in sorted(settings.items()):
+            if isinstance(value, np.ndarray) and value.ndim == 2 and len(value) == len(R):
+                perrow.append(np.ascontiguousarray(value, dtype=float))
+            elif isinstance(value, np.ndarray):
+                shared.append((name, value.astype(float).tolist()))
+            else:
+                shared.append((name, value))
+        prefix = repr(shared).encode()
+
+        keys = []
+        for n in range(len(R)):
+            h = hashlib.blake2b(prefix, digest_size=16)
+            h.update(R[n].tobytes())
+            for value in perrow:
+                h.update(value[n].tobytes())
+            keys.append(h.digest())
+        return keys
+
+    def lookup(self, keys):
+        """
+        USAGE: isol, hit = cache.lookup(keys)
+
+        Returns an n x 2 array of cached 15Ralpha and 15Rbeta (NaN for rows not
+        in the cache), and a mask of the rows found in the cache.
+        """
+        isol = np.full((len(keys), 2), np.nan)
+        found = {}
+
+        # SQLite limits the number of parameters per query
+        for start in range(0, len(keys), 500):
+            batch = keys[start : start + 500]
+            query = "SELECT key, alpha, beta FROM results WHERE key IN ({})".format(
+                ",".join("?" * len(batch))
+            )
+            for key, alpha, beta in self.connection.execute(query, batch):
+                found[key] = (alpha, beta)
+
+        hit = np.array([key in found for key in keys], dtype=bool)
+        for n in np.flatnonzero(hit):
+            isol[n] = found[keys[n]]
+
+        if found:
+            now = time.time()
+            self.connection.executemany(
+                "UPDATE results SET lastused = ? WHERE key = ?",
+                [(now, key) for key in found],
+            )
+            self.connection.commit()
+
+        self.hits += int(hit.sum())
+        self.misses += int((~hit).sum())
+
+        return isol, hit
+
+    def store(self, keys, isol):
+        # add solved rows to the cache, then remove the least recently used
+        # rows if the cache holds more than maxrows
+        now = time.time()
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO results (key, alpha, beta, lastused) VALUES (?, ?, ?, ?)",
+            [
+                (key, float(alpha), float(beta), now)
+                for key, (alpha, beta) in zip(keys, isol)
+                if np.isfinite(alpha) and np.isfinite(beta)
+            ],
+        )
+        excess = len(self) - self.maxrows
+        if excess > 0:
+            self.connection.execute(
+                "DELETE FROM results WHERE key IN "
+                "(SELECT key FROM results ORDER BY lastused LIMIT ?)",
+                (excess,),
+            )
+        self.connection.commit()
+
+    def clear(self):
+        # remove all rows from the cache
+        self.connection.execute("DELETE FROM results")
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def __repr__(self):
+        return f"ResultCache({self.path!r}): {len(self)} rows, {self.hits} hits, {self.misses} misses"
@@ -10,10 +10,11 @@ from excel template.
 """
 
 
-import pandas as pd
 import numpy as np
 from itertools import combinations
 from .calculate_17R_v2 import calculate_17R
+from .constants_new import compileconstants
+from .workbook import openworkbook
 
 
 class ScramblingInput:
@@ -25,14 +26,24 @@ class ScramblingInput:
     DESCRIPTION:
         Uses itertools from the Python standard libraries to generate
         all possible pairings of reference materials from the input spreadsheet.
-        Uses Pandas "join" to merge size-corrected isotope ratios for each pairing.
+        Uses one Pandas "merge" on run date to pair up size-corrected isotope
+        ratios for all pairings at once.
 
     INPUT:
-        :param filename: filename for spreadsheet template, e.g. "00_excel_template.xlsx"
-        :type R: string
+        :param filename: filename for spreadsheet template, e.g. "00_excel_template.xlsx",
+        a .csv, .parquet, .feather, .npy or .npz file or directory of them
+        with the same columns, or a Workbook object (see workbook.py)
+        :type R: string or Workbook
         :param isotopestandards: IsotopeStandards class from isotopestandards.py,
         containing 15RAir, 18RVSMOW, 17RVSMOW, and beta for the 18O/17O relation.
         :type isotopestandards: Class
+        :param diagnostics: Diagnostics object from diagnostics.py, passed on to
+        calculate_17R. If None, calculate_17R writes its tables out straight away.
+        :type diagnostics: Class
+        :param n_jobs: number of worker processes for calculate_17R, or -1 for every core
+        :type n_jobs: int
+        :param executor: existing executor for calculate_17R, e.g. a ProcessPoolExecutor
+        :type executor: concurrent.futures.Executor
         :param *Refs: reference materials contained in the spreadsheet, e.g. "ATM", "S2", "B6"
         :type *Refs: string
 
@@ -40,44 +51,60 @@ class ScramblingInput:
         :returns: dict with {key: [ref1, ref2, R, df]} for each reference material pairing.
         R is a Numpy array of size-corrected values to be input to automate_gk_solver.py.
         df is a Pandas DataFrame of dates, size-corrected values, and ref tags.
+        self.refconstants is a dict of {ref_tag: (15Ralpha, 15Rbeta)} for each reference
+        material in the "scale_normalization" tab, used by the scrambling solvers.
 
     @author: Colette L. Kelly (clkelly@stanford.edu).
     """
 
-    def __init__(self, filename, isotopestandards, **Refs):
+    def __init__(
+        self,
+        filename,
+        isotopestandards,
+        diagnostics=None,
+        n_jobs=None,
+        executor=None,
+        **Refs,
+    ):
 
-        self.filename = filename
+        # excel template, parsed once and shared with any other input class
+        self.workbook = openworkbook(filename)
+        self.filename = self.workbook.filename
 
-        try:
-            # full contents of excel template, first tab
-            self.data = self.readin(self.filename)
-        except FileNotFoundError:
-            if self.filename[-5:] != ".xlsx":
-                self.filename = self.filename + ".xlsx"
-                self.data = self.readin(self.filename)
+        # full contents of excel template, first tab
+        self.data = self.readin(self.workbook)
 
         # read in d15Na and d15Nb of reference materials from excel template
-        self.isotopeconstants = pd.read_excel(
-            filename,
+        self.isotopeconstants = self.workbook.read(
             "scale_normalization",
             skiprows=1,
             usecols=["ref_tag", "d15Na", "d15Nb"],
         )
 
+        # 15Ralpha and 15Rbeta of each reference material, compiled once
+        # so that the scrambling solvers don't filter isotopeconstants
+        self.refconstants = compileconstants(self.isotopeconstants)
+
         # subset of data to be used for Isotopomers
         self.sizecorrected = self.parseratios(self.data)
 
         # calculate 17R from 45R and 46R and add to self.data
-        r17array = calculate_17R(self.sizecorrected, isotopestandards)
+        r17array = calculate_17R(
+            self.sizecorrected,
+            isotopestandards,
+            diagnostics=diagnostics,
+            n_jobs=n_jobs,
+            executor=executor,
+        )
         self.data["15Rbulk"] = r17array[:, 0]
         self.data["17R"] = r17array[:, 2]
 
         # subset of data to be used for Scrambling
         self.pairings, self.scrambleinput = self.parsescrambling(self.data, **Refs)
 
-    def readin(self, filename):
+    def readin(self, workbook):
         # return Pandas DataFrame of all input data
-        data = pd.read_excel(filename, "size_correction", skiprows=1)
+        data = workbook.read("size_correction", skiprows=1)
         data = data[
             [
                 "run_date",
@@ -142,10 +169,10 @@ class ScramblingInput:
             Refs = Refs.values()
 
         # remove refs that aren't included in constants
-        unmatched = [r for r in Refs if r not in list(self.isotopeconstants.ref_tag)]
+        unmatched = [r for r in Refs if r not in self.refconstants]
         if len(unmatched) > 0:
             print("no matches found for", unmatched)
-        Refs = [r for r in Refs if r in list(self.isotopeconstants.ref_tag)]
+        Refs = [r for r in Refs if r in self.refconstants]
 
         # return n arrays of paired reference materials,
         # where n = the number of possible combinations of reference materials
@@ -156,53 +183,38 @@ class ScramblingInput:
         # and the value is the Numpy array of paired size-corrected values
         outputdict = {}
 
-        for c in pairings:
-            # pull out data for left-hand side ref. material
-            LHS = data[data.ref_tag == c[0]]
-            # index on run date to utilize Pandas "join" operator
-            LHS = (
-                LHS[
-                    [
-                        "run_date",
-                        "ref_tag",
-                        "size corrected 31R",  # only need a subset of columns
-                        "size corrected 45R",
-                        "size corrected 46R",
-                        "15Rbulk",
-                        "17R",
-                    ]
-                ]
-                .dropna()
-                .set_index("run_date")
-            )  # need to drop NaN's
-
-            # pull out data for right-hand side ref. material
-            RHS = data[data.ref_tag == c[1]]
-            RHS = (
-                RHS[
-                    [
-                        "run_date",
-                        "ref_tag",
-                        "size corrected 31R",
-                        "size corrected 45R",
-                        "size corrected 46R",
-                        "15Rbulk",
-                        "17R",
-                    ]
-                ]
-                .dropna()
-                .set_index("run_date")
-            )
-
-            # the Pandas "join" function merges the left-hand and right-hand DataFrames on date
-            # it automatically generates the maximum number of pairings possibble for each date
-            output = LHS.join(RHS, lsuffix="_1", rsuffix="_2").dropna()
+        # pull out data for all ref. materials at once
+        refdata = data[
+            [
+                "run_date",
+                "ref_tag",
+                "size corrected 31R",  # only need a subset of columns
+                "size corrected 45R",
+                "size corrected 46R",
+                "15Rbulk",
+                "17R",
+            ]
+        ].dropna()  # need to drop NaN's
+        refdata = refdata[refdata.ref_tag.isin(Refs)]
+
+        # a single self-merge on run date generates every ordered pair of
+        # measurements made on the same date, with left-hand rows in their
+        # original order, as the Pandas "join" on run date did for each pairing;
+        # the pairs of each pairing of ref. materials are then picked out by
+        # their row positions, from one groupby on the two ref_tags
+        merged = refdata.merge(
+            refdata, on="run_date", how="inner", suffixes=("_1", "_2"), sort=False
+        ).set_index("run_date")
+        rows = merged.groupby(["ref_tag_1", "ref_tag_2"], sort=False).indices
 
+        for c in pairings:
             # check if output is empty
-            if len(output) == 0:
+            if c not in rows:
                 print(f"No matching dates for reference materials {c[0]} & {c[1]}")
 
-            elif len(output) > 0:
+            else:
+                output = merged.iloc[rows[c]]
+
                 # dictionary key is the ref. pairing, e.g. "ATM-S2"
                 key = f"{c[0]}-{c[1]}"
 
@@ -0,0 +1,190 @@
+"""
+File: scramblingtimeseries.py
+---------------------------
+Created on Sat Oct 17th, 2026
+
+ScramblingTimeSeries class to keep a running average of gamma and
+kappa over a window of reference material pairings, indexed by run date.
+"""
+
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+# columns of the table of running scrambling coefficients
+RUNNINGCOLUMNS = ["gamma", "kappa", "gamma_std", "kappa_std", "n"]
+
+
+def scramblingtable(scrambling):
+    # run_date, gamma and kappa of each pairing, from a Scrambling object, its
+    # alloutputs (indexed by run date), or a table with a run_date column
+    if hasattr(scrambling, "alloutputs"):
+        scrambling = scrambling.alloutputs
+    if "run_date" in scrambling.columns:
+        table = scrambling[["run_date", "gamma", "kappa"]]
+    else:
+        table = scrambling[["gamma", "kappa"]].assign(run_date=scrambling.index)
+    table = table.dropna(subset=["run_date", "gamma", "kappa"])
+    return table.sort_values("run_date", kind="stable")[["run_date", "gamma", "kappa"]]
+
+
+class ScramblingTimeSeries:
+    """
+    Running average of gamma and kappa over a window of reference material pairings.
+
+    USAGE: ts = ScramblingTimeSeries(Scrambling(inputfile="00_Python_template.xlsx"), window=10)
+           ts.append(Scrambling(inputfile="next_run.xlsx"))
+           ts.at(201207)
+
+    DESCRIPTION:
+        Keeps the gamma and kappa of every pairing of reference materials in
+        run date order and, for each run date, the mean and standard deviation
+        of gamma and kappa over the last window pairings run on or before that
+        date, as recommended for the scrambling coefficients used to calculate
+        isotopomers.
+
+        New run days are added with append(). Only the last window pairings
+        are needed to update the statistics, so appending a run day takes
+        O(window) time, however long the time series is. Pairings must be
+        appended in run date order: a run day may be appended to more than
+        once, but not once a later run day has been appended.
+
+    INPUT:
+        :param scrambling: Scrambling object, its alloutputs, or a Pandas
+        DataFrame with run_date, gamma and kappa columns. If None, start with
+        an empty time series.
+        :type scrambling: Class or Pandas DataFrame
+        :param window: number of pairings to average over
+        :type window: int
+
+    OUTPUT:
+        :param running: running gamma and kappa, their standard deviations, and
+        the number of pairings averaged, indexed by run date
+        :type running: Pandas DataFrame
+        :param pairings: run_date, gamma and kappa of every pairing appended
+        :type pairings: Pandas DataFrame
+    """
+
+    def __init__(self, scrambling=None, window=10):
+
+        if window < 1:
+            raise ValueError(f"window must be a positive integer, not {window!r}")
+        self.window = window
+
+        # gamma and kappa of the last window pairings
+        self._window = deque(maxlen=window)
+
+        # pairings and window statistics appended so far, and the tables
+        # built from them, which are rebuilt only when they're next used
+        self._pairings = []
+        self._dates = []
+        self._stats = []
+        self._tables = None
+
+        if scrambling is not None:
+            self.append(scrambling)
+
+    def append(self, scrambling):
+        # add the pairings of one or more new run days, and update the running
+        # statistics of those days from the last window pairings
+        table = scramblingtable(scrambling)
+        if len(table) == 0:
+            return self
+
+        dates = table["run_date"].to_numpy()
+        if len(self._dates) > 0 and dates[0] < self._dates[-1]:
+            raise ValueError(
+                f"run date {dates[0]} is before the last run date in the time "
+                f"series ({self._dates[-1]}); build a new ScramblingTimeSeries instead"
+            )
+
+        values = table[["gamma", "kappa"]].to_numpy(dtype=float)
+        starts = np.flatnonzero(np.r_[True, dates[1:] != dates[:-1]])
+        for start, end in zip(starts, np.r_[starts[1:], len(dates)]):
+            self._window.extend(map(tuple, values[start:end]))
+            stats = self.windowstats()
+            if len(self._dates) > 0 and dates[start] == self._dates[-1]:
+                self._stats[-1] = stats  # more pairings of the last run day
+            else:
+                self._dates.append(dates[start])
+                self._stats.append(stats)
+
+        self._pairings.append(table)
+        self._tables = None
+        return self
+
+    def windowstats(self):
+        # mean and standard deviation of gamma and kappa in the window
+        values = np.array(self._window)
+        n = len(values)
+        mean = values.mean(axis=0)
+        std = values.std(axis=0, ddof=1) if n > 1 else np.full(2, np.nan)
+        return (mean[0], mean[1], std[0], std[1], n)
+
+    def tables(self):
+        # running and pairings tables, built once per append
+        if self._tables is None:
+            running = pd.DataFrame(
+                self._stats,
+                index=pd.Index(self._dates, name="run_date"),
+                columns=RUNNINGCOLUMNS,
+            )
+            if len(self._pairings) > 0:
+                pairings = pd.concat(self._pairings, ignore_index=True)
+            else:
+                pairings = pd.DataFrame(columns=["run_date", "gamma", "kappa"])
+            self._tables = (running, pairings)
+        return self._tables
+
+    @property
+    def running(self):
+        return self.tables()[0]
+
+    @property
+    def pairings(self):
+        return self.tables()[1]
+
+    def at(self, date, direction="backward"):
+        """
+        Running gamma and kappa on a date.
+
+        USAGE: gamma, kappa = ts.at(201207)[["gamma", "kappa"]]
+
+        DESCRIPTION:
+            Returns the running statistics of the run date on or before date
+            (direction="backward"), on or after it ("forward"), or closest to
+            it ("nearest"). Dates outside the time series get NaN.
+
+        INPUT:
+            :param date: run date, or an array of run dates
+            :param direction: "backward", "forward" or "nearest"
+            :type direction: String
+
+        OUTPUT:
+            :returns: Pandas Series of gamma, kappa, gamma_std, kappa_std and n
+            for one date, or a Pandas DataFrame with one row per date.
+        """
+        if direction not in ("backward", "forward", "nearest"):
+            raise ValueError(
+                f"direction must be 'backward', 'forward' or 'nearest', not {direction!r}"
+            )
+        dates = pd.DataFrame({"run_date": np.atleast_1d(date)})
+        running = self.running.reset_index()
+        if len(running) > 0:
+            dates["run_date"] = dates["run_date"].astype(running["run_date"].dtype)
+        order = np.argsort(dates["run_date"].to_numpy(), kind="stable")
+        stats = pd.merge_asof(
+            dates.iloc[order], running, on="run_date", direction=direction
+        )
+        stats.index = order
+        stats = stats.sort_index().set_index("run_date")
+        if np.ndim(date) == 0:
+            return stats.iloc[0]
+        return stats
+
+    def __len__(self):
+        return len(self._dates)
+
+    def __repr__(self):
+        return f"{self.running}"
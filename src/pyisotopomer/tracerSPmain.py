@@ -13,11 +13,21 @@ import pandas as pd
 import numpy as np
 import warnings
 from scipy.optimize import least_squares
-from .tracernonlineq import tracernonlineq
+from .tracernonlineq import tracernonlineq, tracerjacobian
+from .tracerlinearsolver import tracerlinearsolver
+from .parallelsolve import isparallel, parallelsolve
 
 
 def tracerSPmain(
-    R, isotopestandards, initialguess=None, lowerbounds=None, upperbounds=None
+    R,
+    isotopestandards,
+    initialguess=None,
+    lowerbounds=None,
+    upperbounds=None,
+    method="least_squares",
+    n_jobs=None,
+    executor=None,
+    cache=None,
 ):
     """
     Calculate gamma and kappa from measured rR31/30 and r45/44, given known a, b, 17R.
@@ -47,6 +57,23 @@ def tracerSPmain(
         :param upperbounds: Upper bounds for least_squares solver
         If None, default to [1.0, 1.0].
         :type upperbounds: list or Numpy array
+        :param method: Solver backend. "least_squares" (default) runs scipy's
+        least_squares on one row at a time. "linear" solves all rows at once in
+        closed form with tracerlinearsolver.py, since all three equations are
+        linear in 15Ralpha and 15Rbeta once 17R is known; it needs no initial
+        guess and reaches the same solutions. Rows it cannot solve are
+        re-solved with "least_squares".
+        :type method: String
+        :param n_jobs: number of worker processes to solve chunks of rows in,
+        or -1 to use every core. If None (default), solve in this process.
+        :type n_jobs: int
+        :param executor: existing executor (e.g. a ProcessPoolExecutor) to
+        submit chunks of rows to, instead of starting a new process pool.
+        :type executor: concurrent.futures.Executor
+        :param cache: ResultCache from resultcache.py. If given, rows that are
+        already in the cache are not solved again, and newly solved rows are
+        added to it.
+        :type cache: Class
     OUTPUT:
         :returns: pandas DataFrame with dimensions n x 4 where n is the number of measurements.
         The four columns are 15Ralpha, 15Rbeta, 17R and 18R from left to right.
@@ -73,6 +100,20 @@ def tracerSPmain(
     elif upperbounds is None:
         ub = np.array([1.0, 1.0], dtype=float)
 
+    if cache is None and isparallel(n_jobs, executor):
+        # solve chunks of rows in worker processes, each one in serial
+        return parallelsolve(
+            tracerSPmain,
+            R,
+            isotopestandards,
+            initialguess=x0,
+            lowerbounds=lb,
+            upperbounds=ub,
+            method=method,
+            n_jobs=n_jobs,
+            executor=executor,
+        )
+
     beta = isotopestandards.O17beta
     R17VSMOW = isotopestandards.R17VSMOW
     R18VSMOW = isotopestandards.R18VSMOW
@@ -83,11 +124,51 @@ def tracerSPmain(
 
     bounds = (lb, ub)
 
+    if cache is not None:
+        # look up each row in the cache; only the rows that aren't found are
+        # solved (in worker processes, if n_jobs or executor are given)
+        keys = cache.makekeys(
+            R,
+            isotopestandards,
+            solver="tracerSPmain",
+            method=method,
+            initialguess=x0,
+            lowerbounds=lb,
+            upperbounds=ub,
+        )
+        isol, hit = cache.lookup(keys)
+        miss = np.flatnonzero(~hit)
+        if len(miss) > 0:
+            solved = tracerSPmain(
+                R[miss],
+                isotopestandards,
+                initialguess=x0,
+                lowerbounds=lb,
+                upperbounds=ub,
+                method=method,
+                n_jobs=n_jobs,
+                executor=executor,
+            )
+            isol[miss] = solved[["15Ralpha", "15Rbeta"]].to_numpy()
+            cache.store([keys[n] for n in miss], isol[miss])
+        unsolved = []
+    elif method == "linear":
+        # solve all rows at once; only rows that can't be solved are
+        # handed on to the row-by-row least squares solver below
+        isol, converged = tracerlinearsolver(R, isotopestandards, lb, ub)
+        unsolved = np.flatnonzero(~converged)
+    elif method == "least_squares":
+        unsolved = range(len(R))
+    else:
+        raise ValueError(
+            f"method must be 'least_squares' or 'linear', not {method!r}"
+        )
+
     #  python: options for solver function are specified in signature as kwargs
 
     #  run leastsquares nonlinear solver for each row of data to obtain alpha
     #  and beta
-    for n in range(len(R)):
+    for n in unsolved:
         #  python: scipy.optimize.least_squares instead of matlab "lsqnonlin"
         row = np.array(R[n][:])
         args = (row, isotopestandards)
@@ -97,9 +178,11 @@ def tracerSPmain(
                 v = least_squares(
                     tracernonlineq,
                     x0,
+                    jac=tracerjacobian,
                     bounds=bounds,
                     ftol=1e-15,
                     xtol=1e-15,
+                    gtol=1e-15,
                     max_nfev=2000,
                     args=args,
                 )
@@ -108,9 +191,11 @@ def tracerSPmain(
             v = least_squares(
                 tracernonlineq,
                 np.array([0.0, 0.0]),
+                jac=tracerjacobian,
                 bounds=bounds,
                 ftol=1e-15,
                 xtol=1e-15,
+                gtol=1e-15,
                 max_nfev=2000,
                 args=args,
             )
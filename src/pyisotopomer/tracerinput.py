@@ -10,9 +10,9 @@ from excel template.
 """
 
 
-import pandas as pd
 import numpy as np
 from itertools import combinations
+from .workbook import openworkbook
 
 
 class TracerInput:
@@ -22,8 +22,10 @@ class TracerInput:
     USAGE: R = IsotopomerInput(inputfile, tabname)
 
     INPUT:
-        :param filename: filename for spreadsheet template, e.g. "00_excel_template.xlsx"
-        :type R: string
+        :param filename: filename for spreadsheet template, e.g. "00_excel_template.xlsx",
+        a .csv, .parquet, .feather, .npy or .npz file or directory of them
+        with the same columns, or a Workbook object (see workbook.py)
+        :type R: string or Workbook
         :param tabname: name of tab containing size-corrected isotope ratios (default: "size_correction")
         :type R: string
 
@@ -35,27 +37,24 @@ class TracerInput:
 
     def __init__(self, filename, tabname=None):
 
-        self.filename = filename
+        # excel template, parsed once and shared with any other input class
+        self.workbook = openworkbook(filename)
+        self.filename = self.workbook.filename
 
         if tabname is not None:
             self.tabname = tabname
         elif tabname is None:
             self.tabname = "size_correction"
 
-        try:
-            # full contents of excel template, first tab
-            self.data = self.readin(self.filename, self.tabname)
-        except FileNotFoundError:
-            if self.filename[-5:] != ".xlsx":
-                self.filename = self.filename + ".xlsx"
-                self.data = self.readin(self.filename, self.tabname)
+        # full contents of excel template, first tab
+        self.data = self.readin(self.workbook, self.tabname)
 
         # subset of data to be used for Isotopomers
         self.sizecorrected = self.parseratios(self.data)
 
-    def readin(self, filename, tabname):
+    def readin(self, workbook, tabname):
         # return Pandas DataFrame of all input data
-        return pd.read_excel(filename, tabname, skiprows=1)
+        return workbook.read(tabname, skiprows=1)
 
     def parseratios(self, data):
         # return just the size-corrected isotope ratios in a numpy array
@@ -0,0 +1,105 @@
+"""
+File: tracerlinearsolver.py
+---------------------------
+Created on Sat Oct 17th, 2026
+
+Solve for N2O isotopocule values in 15N-labeled tracer experiments
+in closed form, for all samples at once.
+"""
+
+import numpy as np
+from .tracernonlineq import tracernonlineq, tracerjacobian
+
+
+def tracerlinearsolver(R, isotopestandards, lb, ub):
+    """
+    USAGE: isol, converged = tracerlinearsolver(R, isotopestandards, lb, ub)
+
+    DESCRIPTION:
+        Solves tracernonlineq for 15Ralpha and 15Rbeta in all rows of R at once.
+        With 17R known from delta17O, the 46R, 45R and 31R equations are all
+        linear in 15Ralpha and 15Rbeta, so the least squares solution of each
+        row is that of a 3 x 2 linear system: F = J * f + F0, where J is
+        tracerjacobian and F0 is tracernonlineq at f = [0, 0]. Each row's
+        unbounded solution comes from its 2 x 2 normal equations. Rows whose
+        solution lies outside [lb, ub] take the best of the solutions along
+        each edge of the bounds (one of 15Ralpha, 15Rbeta held at a bound, the
+        other solved for and clipped to its bounds), which is the solution of
+        the bounded problem, as found by least_squares in tracerSPmain.py.
+
+    INPUT:
+        :param R: array with dimensions n x 9 where n is the number of
+        measurements.  The columns are 31R, 45R, 46R, D17O, gamma, kappa,
+        delta17O (calculated from t0's), 15Ralpha * 15Rbeta at t0, and
+        46R added (calculated from t0s), from left to right.
+        :type R: numpy array, dtype=float
+        :param isotopestandards: IsotopeStandards class from isotopestandards.py,
+        containing 15RAir, 18RVSMOW, 17RVSMOW, and beta for the 18O/17O relation.
+        :type isotopestandards: Class
+        :param lb: lower bounds for 15Ralpha and 15Rbeta
+        :type lb: numpy array, dtype=float
+        :param ub: upper bounds for 15Ralpha and 15Rbeta
+        :type ub: numpy array, dtype=float
+
+    OUTPUT:
+        :returns: isol, converged
+        :param isol: array with dimensions n x 2. The two columns are 15Ralpha
+        and 15Rbeta, from left to right.
+        :type isol: numpy array
+        :param converged: per-row mask. Rows whose linear system could not be
+        solved (e.g. rows with missing values) are False.
+        :type converged: numpy array, dtype=bool
+    """
+    R = np.asarray(R, dtype=float)
+    lb = np.asarray(lb, dtype=float)
+    ub = np.asarray(ub, dtype=float)
+    n = len(R)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # residuals at f = [0, 0], and the (constant) Jacobian, for all rows:
+        # F0 has dimensions n x 3, J has dimensions n x 3 x 2
+        F0 = np.column_stack(tracernonlineq([0.0, 0.0], R.T, isotopestandards))
+        J = np.stack(
+            [
+                np.column_stack([np.broadcast_to(dF, n) for dF in row])
+                for row in tracerjacobian([0.0, 0.0], R.T, isotopestandards)
+            ],
+            axis=1,
+        )
+
+        def cost(f):
+            F = F0 + np.einsum("nij,nj->ni", J, f)
+            return np.sum(F**2, axis=1)
+
+        # unbounded solution from the normal equations, J'J f = -J'F0
+        A = np.einsum("nki,nkj->nij", J, J)
+        b = -np.einsum("nki,nk->ni", J, F0)
+        det = A[:, 0, 0] * A[:, 1, 1] - A[:, 0, 1] * A[:, 1, 0]
+        f = np.column_stack(
+            [
+                (A[:, 1, 1] * b[:, 0] - A[:, 0, 1] * b[:, 1]) / det,
+                (A[:, 0, 0] * b[:, 1] - A[:, 1, 0] * b[:, 0]) / det,
+            ]
+        )
+
+        inbounds = np.all((f >= lb) & (f <= ub), axis=1)
+        isol = np.where(inbounds[:, None], f, np.nan)
+        best = np.where(inbounds, cost(f), np.inf)
+
+        # for rows outside the bounds, try each edge: hold column i at a bound
+        # and solve for column j, which minimizes the cost along that edge
+        for i, j in ((0, 1), (1, 0)):
+            for bound in (lb[i], ub[i]):
+                edge = np.empty((n, 2))
+                edge[:, i] = bound
+                edge[:, j] = np.clip(
+                    (b[:, j] - A[:, j, i] * bound) / A[:, j, j], lb[j], ub[j]
+                )
+                c = np.where(inbounds, np.inf, cost(edge))
+                better = c < best
+                isol[better] = edge[better]
+                best[better] = c[better]
+
+    converged = np.isfinite(best) & np.all(np.isfinite(isol), axis=1)
+
+    return isol, converged
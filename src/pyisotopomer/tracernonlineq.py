@@ -72,3 +72,39 @@ def tracernonlineq(f, R, isotopestandards):  # , scrambling):
     ]
 
     return F
+
+
+def tracerjacobian(f, R, isotopestandards):
+    """
+    USAGE: v = least_squares(tracernonlineq, x0, jac=tracerjacobian... args=args)
+        Please see tracerSPmain.py for definitions of these variables.
+
+    DESCRIPTION:
+        Analytic Jacobian of tracernonlineq with respect to 15Ralpha and
+        15Rbeta. With 17R known, all three equations are linear in 15Ralpha
+        and 15Rbeta, so the Jacobian does not depend on f.
+
+    OUTPUT:
+        J = nested list with dimensions 3 x 2: the partial derivatives of the
+        46R, 45R and 31R equations (rows) with respect to 15Ralpha and
+        15Rbeta (columns).
+    """
+
+    # rename inputted data
+    x = R[0]
+
+    g = R[4]  # gamma scrambling coefficient
+    k = R[5]  # kappa scrambling coefficient
+
+    delta17O = R[6]
+
+    # known 17R
+    r17 = (delta17O / 1000 + 1) * 0.0003799
+
+    J = [
+        [r17, r17],  # 46R equation
+        [1, 1],  # 45R equation
+        [(1 - g) + (r17 - x) * g, k + (r17 - x) * (1 - k)],  # 31R equation
+    ]
+
+    return J
@@ -0,0 +1,367 @@
+"""
+File: workbook.py
+---------------------------
+Created on Sat Oct 17th, 2026
+
+Workbook class to read in an excel template (or the same tables
+saved as .csv, .parquet, .feather, .npy or .npz files) once and
+share its sheets between Scrambling, Isotopomers and Tracers.
+"""
+
+import os
+import numpy as np
+import pandas as pd
+
+# file formats, by file extension
+COLUMNAR = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".feather": "feather",
+    ".arrow": "feather",
+    ".npy": "npy",
+    ".npz": "npz",
+}
+
+# missing values in string fields of .npy and .npz files
+NASTRINGS = ["", "nan", "NaN", "NA", "N/A", "<NA>", "None", "null"]
+
+
+def readtable(filename, fmt, allow_pickle=False):
+    # return one columnar file as a Pandas DataFrame
+    if fmt == "csv":
+        # round_trip reads back exactly the values that DataFrame.to_csv wrote
+        return pd.read_csv(filename, float_precision="round_trip")
+    if fmt == "parquet":
+        return pd.read_parquet(filename)
+    if fmt == "feather":
+        return pd.read_feather(filename)
+    if fmt == "npy":
+        return recordstotable(np.load(filename, allow_pickle=allow_pickle), filename)
+
+
+def recordstotable(array, filename):
+    # structured Numpy arrays carry the column names of the template as field names
+    if array.dtype.names is None:
+        raise ValueError(
+            f"{filename} must hold a structured array with one field per column, "
+            'e.g. np.save(filename, df.to_records(index=False, column_dtypes={"ref_tag": "U16"}))'
+        )
+    data = pd.DataFrame(array)
+
+    # fixed-width string fields can't hold NaN: treat the strings that
+    # pd.read_csv reads as missing values as missing, as in .csv files
+    for col in data.columns:
+        if array.dtype[col].kind == "U":
+            data[col] = data[col].where(~data[col].isin(NASTRINGS))
+    return data
+
+
+def chunkframe(data, chunksize):
+    # split a DataFrame that has already been read into chunks of rows
+    for start in range(0, len(data), chunksize):
+        yield data.iloc[start : start + chunksize]
+
+
+def headernames(row):
+    # column names as pd.read_excel gives them: blank headers become "Unnamed: i",
+    # and repeated headers get a suffix, e.g. "d15Nbulk.1"
+    names, seen = [], {}
+    for i, name in enumerate(row):
+        name = f"Unnamed: {i}" if name is None else name
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def iterexcel(filename, sheet_name, chunksize, skiprows):
+    # stream one sheet of an excel file with openpyxl, one chunk of rows at a time
+    import openpyxl
+
+    book = openpyxl.load_workbook(filename, read_only=True, data_only=True)
+    try:
+        rows = book[sheet_name].iter_rows(values_only=True)
+        for _ in range(skiprows):
+            next(rows, None)
+        columns = headernames(next(rows, ()))
+
+        start, chunk = 0, []
+        for row in rows:
+            if all(value is None for value in row):
+                continue  # pd.read_excel skips blank rows
+            chunk.append(row[: len(columns)])
+            if len(chunk) == chunksize:
+                yield tochunk(chunk, columns, start)
+                start, chunk = start + len(chunk), []
+        if chunk:
+            yield tochunk(chunk, columns, start)
+    finally:
+        book.close()
+
+
+def tochunk(rows, columns, start):
+    # DataFrame of rows, indexed by their position in the whole sheet
+    data = pd.DataFrame.from_records(rows, columns=columns)
+    data = data.infer_objects()
+    data.index = pd.RangeIndex(start, start + len(data))
+    return data
+
+
+def itertable(filename, fmt, chunksize, allow_pickle=False):
+    # stream one columnar file, one chunk of rows at a time
+    if fmt == "csv":
+        yield from pd.read_csv(
+            filename, chunksize=chunksize, float_precision="round_trip"
+        )
+    elif fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        batches = pq.ParquetFile(filename).iter_batches(batch_size=chunksize)
+        yield from rechunk((batch.to_pandas() for batch in batches), chunksize)
+    elif fmt == "feather":
+        import pyarrow as pa
+
+        with pa.memory_map(filename) as source:
+            reader = pa.ipc.open_file(source)
+            batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+            yield from rechunk((batch.to_pandas() for batch in batches), chunksize)
+    elif fmt == "npy":
+        # memory-mapped, so only the rows of each chunk are read from disk
+        array = np.load(filename, mmap_mode="r", allow_pickle=allow_pickle)
+        for start in range(0, len(array), chunksize):
+            data = recordstotable(np.asarray(array[start : start + chunksize]), filename)
+            data.index = pd.RangeIndex(start, start + len(data))
+            yield data
+
+
+def rechunk(chunks, chunksize):
+    # regroup a stream of DataFrames into chunks of chunksize rows, indexed by
+    # their position in the whole table
+    start, pending = 0, []
+    for chunk in chunks:
+        pending.append(chunk)
+        while sum(len(c) for c in pending) >= chunksize:
+            data = pd.concat(pending, ignore_index=True)
+            out, rest = data.iloc[:chunksize], data.iloc[chunksize:]
+            out.index = pd.RangeIndex(start, start + len(out))
+            yield out
+            start += len(out)
+            pending = [rest] if len(rest) else []
+    if pending:
+        data = pd.concat(pending, ignore_index=True)
+        if len(data):
+            data.index = pd.RangeIndex(start, start + len(data))
+            yield data
+
+
+class Workbook:
+    """
+    Open an excel template once and keep each sheet after it is first parsed.
+
+    USAGE: workbook = Workbook("00_Python_template_v3.xlsx")
+           data = workbook.read("size_correction")
+
+    DESCRIPTION:
+        ScramblingInput, IsotopomerInput and TracerInput accept either a
+        filename or a Workbook. Passing the same Workbook to Scrambling and
+        then to Isotopomers parses each sheet of the template only once.
+        read() returns a copy of the cached sheet, so callers can add
+        columns to it without changing the cache.
+
+        An excel or .npz file is held open until close() is called, or the
+        Workbook is used in a with statement. Sheets already parsed can still
+        be read once it is closed; other sheets are then read by opening the
+        file again for that one read.
+
+        The file format is detected from the file extension. Besides excel
+        files, the sheets of the template can be read from columnar files
+        with the same column names ("size corrected 31R", "D17O", "gamma",
+        "kappa", "ref_tag", "run_date", ...), which are much faster to read:
+            .csv, .parquet or .feather file: one table, read as the first sheet asked for
+            .npy file: one structured array (one field per column), read as the first sheet asked for
+            .npz file: one structured array per sheet, named after the sheet,
+            e.g. np.savez(filename, size_correction=..., scale_normalization=...)
+            directory: one .csv, .parquet, .feather or .npy file per sheet,
+            named after the sheet, e.g. "size_correction.parquet"
+        Unlike the excel template, columnar files have their column names in
+        the first row, as written by DataFrame.to_csv(index=False) or
+        DataFrame.to_parquet(). Parquet and feather files require pyarrow.
+
+    INPUT:
+        :param filename: filename for spreadsheet template, e.g. "00_excel_template.xlsx",
+        or for a columnar file or directory as described above. If the file is not
+        found and the name doesn't end in ".xlsx" or a columnar extension,
+        ".xlsx" is appended.
+        :type filename: string
+        :param allow_pickle: allow .npy and .npz files to hold object arrays, e.g.
+        columns of Python strings. Only use with files from a trusted source.
+        :type allow_pickle: bool
+
+    OUTPUT:
+        :param filename: filename of the workbook that was opened
+        :type filename: string
+        :param format: "excel", "csv", "parquet", "feather", "npy", "npz" or "directory"
+        :type format: string
+        :param sheet_names: names of all sheets in the workbook; for single-table
+        files, None until the table is first read as a sheet
+        :type sheet_names: list
+    """
+
+    def __init__(self, filename, allow_pickle=False):
+
+        self.filename = os.fspath(filename)
+        self.allow_pickle = allow_pickle
+
+        # open excel or .npz file, and the excel engine that reads it
+        self.excelfile, self.npzfile, self.engine = None, None, None
+
+        extension = os.path.splitext(self.filename)[1].lower()
+        if not os.path.exists(self.filename):
+            if extension not in COLUMNAR and self.filename[-5:] != ".xlsx":
+                self.filename = self.filename + ".xlsx"
+                extension = ".xlsx"
+
+        if os.path.isdir(self.filename):
+            self.format = "directory"
+            self.files = {}  # sheet name: (filename, format)
+            for name in sorted(os.listdir(self.filename)):
+                stem, ext = os.path.splitext(name)
+                if ext.lower() in COLUMNAR and ext.lower() != ".npz":
+                    path = os.path.join(self.filename, name)
+                    self.files.setdefault(stem, (path, COLUMNAR[ext.lower()]))
+            self.sheet_names = list(self.files)
+        elif extension in COLUMNAR:
+            self.format = COLUMNAR[extension]
+            if self.format == "npz":
+                self.npzfile = np.load(self.filename, allow_pickle=self.allow_pickle)
+                self.sheet_names = list(self.npzfile.files)
+            else:
+                if not os.path.exists(self.filename):
+                    raise FileNotFoundError(self.filename)
+                self.sheet_names = None
+        else:
+            self.format = "excel"
+            self.excelfile = pd.ExcelFile(self.filename)
+            self.sheet_names = self.excelfile.sheet_names
+            self.engine = self.excelfile.engine
+
+        self._sheets = {}  # parsed sheets, keyed by (sheet name, skiprows)
+
+    def parse(self, sheet_name, skiprows):
+        # parse one sheet from the file(s) behind this workbook
+        if self.format == "excel":
+            if self.excelfile is None:
+                with pd.ExcelFile(self.filename, engine=self.engine) as excelfile:
+                    return excelfile.parse(sheet_name, skiprows=skiprows)
+            return self.excelfile.parse(sheet_name, skiprows=skiprows)
+
+        # columnar files have their column names in the first row: skiprows only
+        # applies to the title row of the excel template
+        self.checksheet(sheet_name)
+        if self.format == "directory":
+            return readtable(*self.files[sheet_name], allow_pickle=self.allow_pickle)
+        if self.format == "npz":
+            if self.npzfile is None:
+                with np.load(self.filename, allow_pickle=self.allow_pickle) as npzfile:
+                    return recordstotable(npzfile[sheet_name], self.filename)
+            return recordstotable(self.npzfile[sheet_name], self.filename)
+        return readtable(self.filename, self.format, allow_pickle=self.allow_pickle)
+
+    def checksheet(self, sheet_name):
+        # raise an error if a columnar workbook has no such sheet
+        if self.sheet_names is None:
+            # a single table is read as whichever sheet is asked for first
+            self.sheet_names = [sheet_name]
+        if sheet_name not in self.sheet_names:
+            raise ValueError(
+                f"{self.filename} has no sheet {sheet_name!r}; found {self.sheet_names}. "
+                "To read more than one sheet, use a directory or a .npz file."
+            )
+
+    def iterread(self, sheet_name, chunksize, skiprows=1):
+        """
+        Read one sheet in chunks of at most chunksize rows, without caching it.
+
+        USAGE: for data in workbook.iterread("size_correction", 10000): ...
+
+        DESCRIPTION:
+            Yields Pandas DataFrames indexed by row position in the whole sheet,
+            so that only one chunk is in memory at a time. Excel (.xlsx) files
+            are streamed with openpyxl in read-only mode, .csv files with
+            pd.read_csv, .parquet and .feather files with pyarrow, and .npy
+            files are memory-mapped. Sheets of .npz files, and excel formats
+            that openpyxl can't read, are read in full and then split into chunks.
+            A sheet that has already been read with read() is split from the cache.
+        """
+        if chunksize < 1:
+            raise ValueError(f"chunksize must be a positive integer, not {chunksize!r}")
+
+        key = (sheet_name, skiprows if self.format == "excel" else None)
+        if key in self._sheets:
+            yield from chunkframe(self._sheets[key].copy(), chunksize)
+        elif self.format == "excel" and self.engine == "openpyxl":
+            yield from iterexcel(self.filename, sheet_name, chunksize, skiprows)
+        elif self.format in ("excel", "npz"):
+            yield from chunkframe(self.parse(sheet_name, skiprows), chunksize)
+        elif self.format == "directory":
+            self.checksheet(sheet_name)
+            filename, fmt = self.files[sheet_name]
+            yield from itertable(filename, fmt, chunksize, self.allow_pickle)
+        else:
+            self.checksheet(sheet_name)
+            yield from itertable(self.filename, self.format, chunksize, self.allow_pickle)
+
+    def read(self, sheet_name, skiprows=1, usecols=None):
+        # return a copy of one sheet as a Pandas DataFrame, parsing it on first use
+        key = (sheet_name, skiprows if self.format == "excel" else None)
+        if key not in self._sheets:
+            self._sheets[key] = self.parse(sheet_name, skiprows)
+
+        data = self._sheets[key]
+        if usecols is not None:
+            missing = [col for col in usecols if col not in data.columns]
+            if missing:
+                raise ValueError(
+                    f"sheet {sheet_name!r} of {self.filename} has no columns {missing}"
+                )
+            return data[list(usecols)].copy()
+        return data.copy()
+
+    def update(self, sheet_name, data, skiprows=1):
+        # replace the cached copy of one sheet, e.g. with a recalculated one;
+        # the file itself is not changed
+        key = (sheet_name, skiprows if self.format == "excel" else None)
+        self._sheets[key] = data.copy()
+
+    def close(self):
+        # close the excel or .npz file behind this workbook; sheets that have
+        # been parsed can still be read
+        if self.excelfile is not None:
+            self.excelfile.close()
+            self.excelfile = None
+        if self.npzfile is not None:
+            self.npzfile.close()
+            self.npzfile = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __repr__(self):
+        parsed = [sheet for sheet, skiprows in self._sheets]
+        return f"Workbook({self.filename!r}, format={self.format!r}): parsed {parsed}"
+
+
+def openworkbook(inputfile):
+    """
+    Return inputfile if it is already a Workbook; otherwise open it as one.
+    """
+    if isinstance(inputfile, Workbook):
+        return inputfile
+    return Workbook(inputfile)
@@ -0,0 +1,73 @@
+"""
+File: test_bootstrap.py
+---------------------------
+Created on Sat Oct 17th, 2026
+
+Tests of the bootstrap confidence intervals on gamma and kappa.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pyisotopomer import bootstrapscrambling
+
+
+@pytest.fixture(scope="module")
+def alloutputs():
+    # pairings on 8 run dates, 1 to 4 pairings per date, in no particular order
+    rng = np.random.default_rng(0)
+    dates = np.repeat(pd.date_range("2026-01-01", periods=8), rng.integers(1, 5, 8))
+    dates = rng.permutation(dates)
+    return pd.DataFrame(
+        {
+            "gamma": 0.17 + 0.01 * rng.standard_normal(len(dates)),
+            "kappa": 0.08 + 0.01 * rng.standard_normal(len(dates)),
+        },
+        index=pd.Index(dates, name="run_date"),
+    )
+
+
+@pytest.mark.parametrize("n_jobs", [2, -1])
+def test_results_do_not_depend_on_n_jobs(alloutputs, n_jobs):
+    # small batches, so that the resamples are spread over several batches
+    kwargs = dict(nresamples=500, seed=42, batchsize=len(alloutputs) * 50)
+    ci, resamples = bootstrapscrambling(alloutputs, **kwargs)
+    ci_parallel, resamples_parallel = bootstrapscrambling(
+        alloutputs, n_jobs=n_jobs, **kwargs
+    )
+
+    pd.testing.assert_frame_equal(resamples_parallel, resamples)
+    pd.testing.assert_frame_equal(ci_parallel, ci)
+
+
+def test_results_do_not_depend_on_executor(alloutputs):
+    kwargs = dict(nresamples=500, seed=42, batchsize=len(alloutputs) * 50)
+    ci, resamples = bootstrapscrambling(alloutputs, **kwargs)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        ci_parallel, resamples_parallel = bootstrapscrambling(
+            alloutputs, executor=executor, **kwargs
+        )
+
+    pd.testing.assert_frame_equal(resamples_parallel, resamples)
+    pd.testing.assert_frame_equal(ci_parallel, ci)
+
+
+def test_interval_contains_mean(alloutputs):
+    ci, resamples = bootstrapscrambling(alloutputs, nresamples=1000, seed=1)
+
+    assert len(resamples) == 1000
+    np.testing.assert_allclose(ci["mean"], alloutputs.mean())
+    assert (ci["lower"] < ci["mean"]).all() and (ci["mean"] < ci["upper"]).all()
+
+
+@pytest.mark.parametrize("rows", [[], [np.nan]])
+def test_no_pairings_are_rejected(rows):
+    alloutputs = pd.DataFrame(
+        {"gamma": rows, "kappa": rows},
+        index=pd.DatetimeIndex(["2026-01-01"] * len(rows), name="run_date"),
+    )
+    with pytest.raises(ValueError, match="no pairings"):
+        bootstrapscrambling(alloutputs, nresamples=10, seed=0)
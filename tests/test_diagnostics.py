@@ -0,0 +1,46 @@
+"""
+File: test_diagnostics.py
+---------------------------
+Created on Sat Oct 17th, 2026
+
+Tests of the Diagnostics sink for intermediate tables.
+"""
+
+from pathlib import Path
+
+import pandas as pd
+
+import pyisotopomer as pi
+
+EXAMPLES = Path(__file__).resolve().parents[1] / "pyisotopomer_examples"
+TEMPLATE = EXAMPLES / "00_Python_template_v3.xlsx"
+
+
+def test_flush_creates_directory(tmp_path):
+    path = tmp_path / "diagnostics" / "run1"
+    diagnostics = pi.Diagnostics(mode="write", path=str(path))
+    diagnostics.add("table", pd.DataFrame({"a": [1.0, 2.0]}))
+
+    written = diagnostics.flush()
+
+    assert written == [str(path / "table.csv")]
+    assert pd.read_csv(path / "table.csv", index_col=0)["a"].tolist() == [1.0, 2.0]
+
+
+def test_scrambling_writes_to_new_directory(tmp_path):
+    path = tmp_path / "nodir"
+    diagnostics = pi.Diagnostics(mode="write", path=str(path))
+    pi.Scrambling(inputfile=str(TEMPLATE), saveout=False, diagnostics=diagnostics)
+
+    assert (path / "normalized_ratios.csv").exists()
+    assert (path / "normalized_deltas.csv").exists()
+
+
+def test_memory_mode_writes_nothing(tmp_path):
+    path = tmp_path / "nodir"
+    diagnostics = pi.Diagnostics(mode="memory", path=str(path))
+    diagnostics.add("table", pd.DataFrame({"a": [1.0]}))
+
+    assert diagnostics.flush() == []
+    assert not path.exists()
+    assert diagnostics["table"]["a"].tolist() == [1.0]
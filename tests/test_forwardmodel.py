@@ -0,0 +1,83 @@
+"""
+File: test_forwardmodel.py
+---------------------------
+Created on Sat Oct 17th, 2026
+
+Round trips from known isotopocule delta values through the forward model
+and back through the solvers.
+"""
+
+import numpy as np
+import pytest
+
+from pyisotopomer import IsotopeStandards
+from pyisotopomer.calcSPmain import calcSPmain
+from pyisotopomer.calcdeltaSP import calcdeltaSP
+from pyisotopomer.forwardmodel import forwardmodel, tracerforwardmodel
+from pyisotopomer.tracerSPmain import tracerSPmain
+
+# per mil
+TOLERANCE = 1e-7
+
+
+@pytest.fixture(scope="module")
+def isotopestandards():
+    return IsotopeStandards()
+
+
+@pytest.fixture(scope="module")
+def truth():
+    # natural-abundance samples
+    rng = np.random.default_rng(0)
+    n = 50
+    return dict(
+        d15Na=rng.uniform(-10, 40, n),
+        d15Nb=rng.uniform(-20, 20, n),
+        d18O=rng.uniform(20, 60, n),
+        D17O=rng.uniform(0, 1, n),
+        gamma=rng.uniform(0.15, 0.2, n),
+        kappa=rng.uniform(0.07, 0.1, n),
+    )
+
+
+@pytest.mark.parametrize("method", ["least_squares", "newton", "bracketed"])
+def test_calcSPmain_round_trip(truth, isotopestandards, method):
+    R = forwardmodel(**truth, isotopestandards=isotopestandards)
+    isol = calcSPmain(np.array(R), isotopestandards, method=method)
+    deltas = calcdeltaSP(isol, isotopestandards)
+
+    for name in ["d15Na", "d15Nb", "d18O"]:
+        np.testing.assert_allclose(deltas[name], truth[name], rtol=0, atol=TOLERANCE)
+    np.testing.assert_allclose(
+        deltas["SP"], truth["d15Na"] - truth["d15Nb"], rtol=0, atol=TOLERANCE
+    )
+
+
+@pytest.mark.parametrize("method", ["least_squares", "linear"])
+def test_tracerSPmain_round_trip(truth, isotopestandards, method):
+    # 15N-labeled samples, with a t0 15Ralpha * 15Rbeta close to natural abundance
+    rng = np.random.default_rng(1)
+    n = len(truth["D17O"])
+    d15Na = rng.uniform(0, 500, n)
+    d15Nb = rng.uniform(0, 300, n)
+    delta17O = rng.uniform(10, 30, n)
+    ab_t0 = isotopestandards.R15Air**2 * rng.uniform(1, 1.01, n)
+
+    R = tracerforwardmodel(
+        d15Na,
+        d15Nb,
+        delta17O,
+        truth["D17O"],
+        truth["gamma"],
+        truth["kappa"],
+        ab_t0,
+        isotopestandards=isotopestandards,
+    )
+    isol = tracerSPmain(np.array(R), isotopestandards, method=method)
+    deltas = calcdeltaSP(isol, isotopestandards)
+
+    np.testing.assert_allclose(deltas["d15Na"], d15Na, rtol=0, atol=TOLERANCE)
+    np.testing.assert_allclose(deltas["d15Nb"], d15Nb, rtol=0, atol=TOLERANCE)
+    np.testing.assert_allclose(
+        isol["17R"], (delta17O / 1000 + 1) * 0.0003799, rtol=1e-12, atol=0
+    )
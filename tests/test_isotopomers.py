@@ -0,0 +1,97 @@
+"""
+File: test_isotopomers.py
+---------------------------
+Created on Sat Oct 17th, 2026
+
+Tests of the Isotopomers class on the example template.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import pyisotopomer as pi
+
+EXAMPLES = Path(__file__).resolve().parents[1] / "pyisotopomer_examples"
+TEMPLATE = EXAMPLES / "00_Python_template_v3.xlsx"
+
+
+@pytest.fixture(scope="module")
+def scrambling():
+    return pi.Scrambling(
+        inputfile=str(TEMPLATE),
+        saveout=False,
+        diagnostics=pi.Diagnostics(mode="off"),
+        ref1="ATM",
+        ref2="S2",
+        ref3="B6",
+    )
+
+
+@pytest.mark.parametrize("chunksize", [1, 4, 100])
+def test_chunked_matches_full(chunksize, tmp_path):
+    # gamma and kappa from the template
+    full = pi.Isotopomers(
+        inputfile=str(TEMPLATE), outputfile=str(tmp_path / "full.csv")
+    )
+    chunked = pi.Isotopomers(
+        inputfile=str(TEMPLATE),
+        outputfile=str(tmp_path / "chunked.csv"),
+        chunksize=chunksize,
+    )
+    assert chunked.nrows == full.nrows == len(full.deltavals)
+
+    fullout = pd.read_csv(tmp_path / "full.csv")
+    chunkedout = pd.read_csv(tmp_path / "chunked.csv")
+    pd.testing.assert_frame_equal(fullout, chunkedout, rtol=1e-10)
+
+
+@pytest.mark.parametrize("direction", ["backward", "nearest"])
+def test_chunked_matches_full_with_scrambling(scrambling, direction, tmp_path):
+    # with direction="backward", the first run date has no scrambling
+    # coefficients, so its rows are dropped; the labels of the remaining rows
+    # must stay with their own delta values
+    full = pi.Isotopomers(
+        inputfile=str(TEMPLATE),
+        outputfile=str(tmp_path / "full.csv"),
+        scrambling=scrambling,
+        direction=direction,
+    )
+    pi.Isotopomers(
+        inputfile=str(TEMPLATE),
+        outputfile=str(tmp_path / "chunked.csv"),
+        scrambling=scrambling,
+        direction=direction,
+        chunksize=4,
+    )
+
+    fullout = pd.read_csv(tmp_path / "full.csv")
+    chunkedout = pd.read_csv(tmp_path / "chunked.csv")
+    pd.testing.assert_frame_equal(fullout, chunkedout, rtol=1e-10)
+
+    data = full.inputobj.data
+    assert len(data) == len(full.R) == full.nrows
+    np.testing.assert_array_equal(
+        full.deltavals["Identifier 1"].to_numpy(), data["Identifier 1"].to_numpy()
+    )
+    np.testing.assert_array_equal(full.R[:, 4], data["gamma"].to_numpy())
+
+
+def test_dropped_rows_keep_labels(scrambling, tmp_path):
+    # each sample's identifier comes from its own row of the template
+    template = pd.read_excel(TEMPLATE, sheet_name="size_correction", skiprows=1)
+    first = template["run_date"].dropna().min()
+    out = pi.Isotopomers(
+        inputfile=str(TEMPLATE),
+        outputfile=str(tmp_path / "full.csv"),
+        scrambling=scrambling,
+        direction="backward",
+    )
+    assert first not in set(out.deltavals["run_date"])
+    solved = template[template["run_date"] > first]
+    np.testing.assert_array_equal(
+        out.deltavals["Identifier 1"].to_numpy(),
+        solved["Identifier 1"].to_numpy(),
+    )
@@ -0,0 +1,87 @@
+"""
+File: test_montecarlo.py
+---------------------------
+Created on Sat Oct 17th, 2026
+
+Tests of the Monte Carlo propagation of uncertainty into delta values.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pyisotopomer import IsotopeStandards, Isotopomers, montecarlo
+from pyisotopomer.calcSPmain import calcSPmain
+from pyisotopomer.calcdeltaSP import calcdeltaSP
+from pyisotopomer.isotopomerinput import IsotopomerInput
+
+EXAMPLES = Path(__file__).resolve().parents[1] / "pyisotopomer_examples"
+
+UNCERTAINTY = {"31R": 1e-6, "45R": 1e-6, "46R": 1e-6, "gamma": 0.01, "kappa": 0.01}
+
+
+@pytest.fixture(scope="module")
+def isotopestandards():
+    return IsotopeStandards()
+
+
+@pytest.fixture(scope="module")
+def samples():
+    # n x 6 array of 31R, 45R, 46R, D17O, gamma and kappa
+    return IsotopomerInput(EXAMPLES / "00_Python_template_v3.xlsx").ratiosscrambling
+
+
+def test_zero_uncertainty_gives_measured_deltas(samples, isotopestandards):
+    expected = calcdeltaSP(
+        calcSPmain(samples, isotopestandards, method="bracketed"), isotopestandards
+    )
+    stats = montecarlo(
+        samples,
+        isotopestandards,
+        {name: 0.0 for name in UNCERTAINTY},
+        nsamples=10,
+        seed=0,
+    )
+
+    for name in ["d15Na", "d15Nb", "SP", "d18O"]:
+        np.testing.assert_allclose(
+            stats[f"{name}_mean"], expected[name], rtol=0, atol=1e-9
+        )
+        np.testing.assert_allclose(stats[f"{name}_std"], 0.0, rtol=0, atol=1e-9)
+        np.testing.assert_allclose(
+            stats[f"{name}_p2.5"], expected[name], rtol=0, atol=1e-9
+        )
+
+
+def test_fixed_seed_is_reproducible(samples, isotopestandards):
+    first = montecarlo(samples, isotopestandards, UNCERTAINTY, nsamples=50, seed=1)
+    again = montecarlo(samples, isotopestandards, UNCERTAINTY, nsamples=50, seed=1)
+    pd.testing.assert_frame_equal(first, again)
+
+    other = montecarlo(samples, isotopestandards, UNCERTAINTY, nsamples=50, seed=2)
+    assert not np.allclose(first["SP_mean"], other["SP_mean"])
+
+
+def test_chunksize_does_not_change_results(samples, isotopestandards):
+    # the perturbations are drawn in the same order, however many passes
+    whole = montecarlo(samples, isotopestandards, UNCERTAINTY, nsamples=20, seed=3)
+    passes = montecarlo(
+        samples, isotopestandards, UNCERTAINTY, nsamples=20, seed=3, chunksize=40
+    )
+    pd.testing.assert_frame_equal(whole, passes, rtol=1e-12)
+
+
+@pytest.mark.parametrize("nsamples", [0, 1])
+def test_too_few_samples_are_rejected(samples, isotopestandards, nsamples):
+    with pytest.raises(ValueError, match="nsamples"):
+        montecarlo(samples, isotopestandards, UNCERTAINTY, nsamples=nsamples)
+
+    # before any rows are solved
+    with pytest.raises(ValueError, match="nsamples"):
+        Isotopomers(
+            inputfile=EXAMPLES / "00_Python_template_v3.xlsx",
+            uncertainty=UNCERTAINTY,
+            nsamples=nsamples,
+        )
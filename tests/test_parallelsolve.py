@@ -0,0 +1,145 @@
+"""
+File: test_parallelsolve.py
+---------------------------
+Created on Sat Oct 17th, 2026
+
+Tests that solving chunks of rows in worker processes gives the same results
+as solving every row in this process.
+"""
+
+from concurrent.futures import Future
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pyisotopomer import Diagnostics, IsotopeStandards, ScramblingInput, calculate_17R
+from pyisotopomer.automate_gk_solver import automate_gk_solver
+from pyisotopomer.calcSPmain import calcSPmain
+from pyisotopomer.isotopomerinput import IsotopomerInput
+from pyisotopomer.tracerinput import TracerInput
+from pyisotopomer.tracerSPmain import tracerSPmain
+
+EXAMPLES = Path(__file__).resolve().parents[1] / "pyisotopomer_examples"
+
+
+class RecordingExecutor:
+    # runs each submitted chunk straight away and keeps its keyword arguments
+    def __init__(self):
+        self.calls = []
+
+    def submit(self, func, *args, **kwargs):
+        self.calls.append(kwargs)
+        future = Future()
+        future.set_result(func(*args, **kwargs))
+        return future
+
+
+@pytest.fixture(scope="module")
+def isotopestandards():
+    return IsotopeStandards()
+
+
+@pytest.fixture(scope="module")
+def samples():
+    # n x 6 array of 31R, 45R, 46R, D17O, gamma and kappa
+    return IsotopomerInput(EXAMPLES / "00_Python_template_v3.xlsx").ratiosscrambling
+
+
+@pytest.fixture(scope="module")
+def tracers():
+    return TracerInput(EXAMPLES / "00_Tracer_template.xlsx").sizecorrected
+
+
+@pytest.fixture(scope="module")
+def scrambling(isotopestandards):
+    # ratios and reference constants for the ATM-S2 pairing
+    inputobj = ScramblingInput(
+        EXAMPLES / "00_Python_template_v3.xlsx",
+        isotopestandards,
+        diagnostics=Diagnostics(mode="off"),
+    )
+    ref1, ref2, R, df = inputobj.scrambleinput["ATM-S2"]
+    return R, inputobj.refconstants, ref1, ref2
+
+
+@pytest.mark.parametrize("method", ["least_squares", "newton", "bracketed"])
+def test_calcSPmain_parallel_matches_serial(samples, isotopestandards, method):
+    expected = calcSPmain(samples, isotopestandards, method=method)
+    result = calcSPmain(samples, isotopestandards, method=method, n_jobs=2)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_calcSPmain_parallel_splits_rowwise_guesses(samples, isotopestandards):
+    # one initial guess per row, split into chunks along with the rows
+    guesses = np.tile([0.0037, 0.0037], (len(samples), 1))
+    expected = calcSPmain(samples, isotopestandards, initialguess=guesses)
+    result = calcSPmain(samples, isotopestandards, initialguess=guesses, n_jobs=2)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+@pytest.mark.parametrize("method", ["least_squares", "linear"])
+def test_tracerSPmain_parallel_matches_serial(tracers, isotopestandards, method):
+    expected = tracerSPmain(tracers, isotopestandards, method=method)
+    result = tracerSPmain(tracers, isotopestandards, method=method, n_jobs=2)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+@pytest.mark.parametrize("weights", [False, True])
+def test_automate_gk_solver_parallel_matches_serial(scrambling, weights):
+    R, refconstants, ref1, ref2 = scrambling
+    expected = automate_gk_solver(R, refconstants, ref1, ref2, weights=weights)
+    result = automate_gk_solver(
+        R, refconstants, ref1, ref2, weights=weights, n_jobs=2
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_automate_gk_solver_sends_parent_weights_to_chunks(scrambling):
+    R, refconstants, ref1, ref2 = scrambling
+    # the weights that the parent calculates from every pairing
+    var1, var2 = np.var(R[:, 0]), np.var(R[:, 3])
+    weights = [(var1 + var2) / var1, (var1 + var2) / var2]
+
+    executor = RecordingExecutor()
+    result = automate_gk_solver(
+        R, refconstants, ref1, ref2, weights=True, n_jobs=2, executor=executor
+    )
+
+    assert len(executor.calls) > 1
+    for kwargs in executor.calls:
+        np.testing.assert_allclose(kwargs["weights"], weights, rtol=1e-12)
+    pd.testing.assert_frame_equal(
+        result, automate_gk_solver(R, refconstants, ref1, ref2, weights=True)
+    )
+
+
+@pytest.mark.parametrize("method", ["least_squares", "bracketed"])
+def test_calculate_17R_parallel_matches_serial(samples, isotopestandards, method):
+    # 31R, 45R, 46R and D17O
+    R = samples[:, :4]
+    expected = calculate_17R(
+        R, isotopestandards, method=method, diagnostics=Diagnostics(mode="off")
+    )
+    result = calculate_17R(
+        R,
+        isotopestandards,
+        method=method,
+        diagnostics=Diagnostics(mode="off"),
+        n_jobs=2,
+    )
+    np.testing.assert_array_equal(result, expected)
+
+
+def test_previous_guess_is_rejected_in_parallel(samples, scrambling, isotopestandards):
+    # each chunk would start again from the default guess, so results would
+    # depend on n_jobs
+    with pytest.raises(ValueError, match="previous"):
+        calcSPmain(samples, isotopestandards, initialguess="previous", n_jobs=2)
+
+    R, refconstants, ref1, ref2 = scrambling
+    with pytest.raises(ValueError, match="previous"):
+        automate_gk_solver(
+            R, refconstants, ref1, ref2, x0="previous", executor=RecordingExecutor()
+        )
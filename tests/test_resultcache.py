@@ -0,0 +1,114 @@
+"""
+File: test_resultcache.py
+---------------------------
+Created on Sat Oct 17th, 2026
+
+Tests that ResultCache only returns solutions solved with the same rows,
+isotope standards and solver settings.
+"""
+
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pyisotopomer import IsotopeStandards
+from pyisotopomer import resultcache
+from pyisotopomer.calcSPmain import calcSPmain
+from pyisotopomer.isotopomerinput import IsotopomerInput
+from pyisotopomer.resultcache import ResultCache
+from pyisotopomer.tracerinput import TracerInput
+from pyisotopomer.tracerSPmain import tracerSPmain
+
+EXAMPLES = Path(__file__).resolve().parents[1] / "pyisotopomer_examples"
+
+
+@pytest.fixture(scope="module")
+def samples():
+    return IsotopomerInput(EXAMPLES / "00_Python_template_v3.xlsx").ratiosscrambling
+
+
+@pytest.fixture(scope="module")
+def tracers():
+    return TracerInput(EXAMPLES / "00_Tracer_template.xlsx").sizecorrected
+
+
+@pytest.fixture
+def cache():
+    cache = ResultCache(":memory:")
+    yield cache
+    cache.close()
+
+
+def test_rerun_hits_every_row(samples, cache):
+    isotopestandards = IsotopeStandards()
+    first = calcSPmain(samples, isotopestandards, cache=cache)
+    assert (cache.hits, cache.misses) == (0, len(samples))
+    assert len(cache) == len(samples)
+
+    second = calcSPmain(samples, isotopestandards, cache=cache)
+    assert (cache.hits, cache.misses) == (len(samples), len(samples))
+    pd.testing.assert_frame_equal(second, first)
+
+    # the cached solutions are exactly those solved without a cache
+    uncached = calcSPmain(samples, isotopestandards)
+    pd.testing.assert_frame_equal(first, uncached)
+
+
+@pytest.mark.parametrize(
+    "changed, standards",
+    [
+        ({"method": "bracketed"}, {}),
+        ({"lowerbounds": [0.001, 0.001]}, {}),
+        ({"upperbounds": [0.9, 0.9]}, {}),
+        ({"initialguess": [0.004, 0.0036]}, {}),
+        ({}, {"R15Air": 0.0036783}),
+        ({}, {"O17beta": 0.52}),
+    ],
+)
+def test_changed_settings_miss(samples, cache, changed, standards):
+    calcSPmain(samples, IsotopeStandards(), cache=cache)
+    misses = cache.misses
+
+    calcSPmain(samples, IsotopeStandards(**standards), cache=cache, **changed)
+    assert cache.hits == 0
+    assert cache.misses == misses + len(samples)
+    assert len(cache) == 2 * len(samples)
+
+
+def test_least_recently_used_rows_are_evicted(monkeypatch):
+    # a clock that ticks once per call, so that no two rows are used at once
+    clock = iter(range(1000))
+    monkeypatch.setattr(resultcache, "time", SimpleNamespace(time=lambda: next(clock)))
+
+    cache = ResultCache(":memory:", maxrows=3)
+    keys = [bytes([n]) * 16 for n in range(4)]
+    isol = np.arange(8, dtype=float).reshape(4, 2)
+
+    cache.store(keys[:1], isol[:1])
+    cache.store(keys[1:3], isol[1:3])
+    cache.lookup(keys[:1])  # row 0 is now more recently used than rows 1 and 2
+    cache.store(keys[3:], isol[3:])
+
+    assert len(cache) == 3
+    found, hit = cache.lookup(keys)
+    np.testing.assert_array_equal(hit, [True, False, True, True])
+    np.testing.assert_array_equal(found[hit], isol[[0, 2, 3]])
+    cache.close()
+
+
+def test_tracerSPmain_cache(tracers, cache):
+    isotopestandards = IsotopeStandards()
+    first = tracerSPmain(tracers, isotopestandards, cache=cache)
+    assert (cache.hits, cache.misses) == (0, len(tracers))
+
+    second = tracerSPmain(tracers, isotopestandards, cache=cache)
+    assert cache.hits == len(tracers)
+    pd.testing.assert_frame_equal(second, first)
+    pd.testing.assert_frame_equal(first, tracerSPmain(tracers, isotopestandards))
+
+    # the linear solver is keyed separately from least squares
+    tracerSPmain(tracers, isotopestandards, method="linear", cache=cache)
+    assert cache.misses == 2 * len(tracers)
@@ -0,0 +1,62 @@
+"""
+File: test_scramblinginput.py
+---------------------------
+Created on Sat Oct 17th, 2026
+
+Tests of the pairings of reference materials built by ScramblingInput.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pyisotopomer import Diagnostics, IsotopeStandards, ScramblingInput
+
+EXAMPLES = Path(__file__).resolve().parents[1] / "pyisotopomer_examples"
+
+COLUMNS = [
+    "run_date",
+    "ref_tag",
+    "size corrected 31R",
+    "size corrected 45R",
+    "size corrected 46R",
+    "15Rbulk",
+    "17R",
+]
+
+
+def joinpairing(data, ref1, ref2):
+    # pairs of ref1 and ref2 measured on the same run date, as parsescrambling
+    # built them before the self-merge: one Pandas "join" on run date per pairing
+    LHS = data[data.ref_tag == ref1][COLUMNS].dropna().set_index("run_date")
+    RHS = data[data.ref_tag == ref2][COLUMNS].dropna().set_index("run_date")
+    return LHS.join(RHS, lsuffix="_1", rsuffix="_2").dropna()
+
+
+@pytest.fixture(scope="module")
+def inputobj():
+    return ScramblingInput(
+        EXAMPLES / "00_Python_template_v3.xlsx",
+        IsotopeStandards(),
+        diagnostics=Diagnostics(mode="off"),
+    )
+
+
+def test_pairings_match_join(inputobj):
+    assert len(inputobj.scrambleinput) > 0
+    for ref1, ref2 in inputobj.pairings:
+        expected = joinpairing(inputobj.data, ref1, ref2)
+        key = f"{ref1}-{ref2}"
+        if len(expected) == 0:
+            assert key not in inputobj.scrambleinput
+            continue
+
+        name1, name2, R, df = inputobj.scrambleinput[key]
+        assert (name1, name2) == (ref1, ref2)
+        pd.testing.assert_frame_equal(
+            df, expected, check_dtype=False, check_index_type=False
+        )
+        ratios = expected.drop(columns=["ref_tag_1", "ref_tag_2"])
+        np.testing.assert_array_equal(R, np.array(ratios, dtype=float))
@@ -0,0 +1,102 @@
+"""
+File: test_scramblingtimeseries.py
+---------------------------
+Created on Sat Oct 17th, 2026
+
+Tests of the ordering and window logic of ScramblingTimeSeries.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pyisotopomer import ScramblingTimeSeries
+
+
+def pairings(dates, gammas, kappas=None):
+    if kappas is None:
+        kappas = [g / 2 for g in gammas]
+    return pd.DataFrame({"run_date": dates, "gamma": gammas, "kappa": kappas})
+
+
+def test_window_evicts_oldest_pairings():
+    ts = ScramblingTimeSeries(pairings([1, 2, 3], [0.10, 0.20, 0.30]), window=2)
+    running = ts.running
+
+    assert list(running.index) == [1, 2, 3]
+    np.testing.assert_allclose(running["gamma"], [0.10, 0.15, 0.25])
+    np.testing.assert_allclose(running["kappa"], [0.05, 0.075, 0.125])
+    assert list(running["n"]) == [1, 2, 2]
+    assert np.isnan(running["gamma_std"].iloc[0])
+    np.testing.assert_allclose(running["gamma_std"].iloc[2], np.std([0.2, 0.3], ddof=1))
+
+
+def test_append_matches_building_at_once():
+    table = pairings([1, 1, 2, 3, 3, 3], [0.1, 0.2, 0.3, 0.4, 0.5, 0.6])
+    whole = ScramblingTimeSeries(table, window=3)
+
+    appended = ScramblingTimeSeries(window=3)
+    appended.append(table.iloc[:3]).append(table.iloc[3:])
+
+    pd.testing.assert_frame_equal(appended.running, whole.running)
+    pd.testing.assert_frame_equal(appended.pairings, whole.pairings)
+
+
+def test_append_to_same_run_day():
+    ts = ScramblingTimeSeries(pairings([1, 2], [0.1, 0.2]), window=10)
+    ts.append(pairings([2], [0.3]))
+
+    assert len(ts) == 2
+    assert len(ts.pairings) == 3
+    np.testing.assert_allclose(ts.running.loc[2, "gamma"], 0.2)
+    assert ts.running.loc[2, "n"] == 3
+
+
+def test_out_of_order_append_raises():
+    ts = ScramblingTimeSeries(pairings([1, 3], [0.1, 0.2]))
+    with pytest.raises(ValueError, match="before the last run date"):
+        ts.append(pairings([2], [0.3]))
+
+    # the time series is unchanged
+    assert len(ts) == 2
+    assert len(ts.pairings) == 2
+
+
+def test_invalid_window():
+    with pytest.raises(ValueError, match="window"):
+        ScramblingTimeSeries(window=0)
+
+
+@pytest.mark.parametrize(
+    "direction, expected",
+    [
+        ("backward", [np.nan, 0.1, 0.1, 0.15, 0.15]),
+        ("forward", [0.1, 0.1, 0.15, 0.15, np.nan]),
+        ("nearest", [0.1, 0.1, 0.1, 0.15, 0.15]),
+    ],
+)
+def test_at(direction, expected):
+    ts = ScramblingTimeSeries(pairings([10, 20], [0.1, 0.2]), window=10)
+    # before the first run, on it, just after it, on the last run, and after it
+    dates = [5, 10, 12, 20, 30]
+    stats = ts.at(dates, direction=direction)
+
+    assert list(stats.index) == dates
+    np.testing.assert_allclose(stats["gamma"], expected)
+
+
+def test_at_unsorted_dates_and_scalar():
+    ts = ScramblingTimeSeries(pairings([10, 20], [0.1, 0.2]), window=10)
+    stats = ts.at([25, 5, 15])
+    assert list(stats.index) == [25, 5, 15]
+    np.testing.assert_allclose(stats["gamma"], [0.15, np.nan, 0.1])
+
+    one = ts.at(15)
+    assert isinstance(one, pd.Series)
+    assert one["gamma"] == pytest.approx(0.1)
+
+
+def test_at_invalid_direction():
+    ts = ScramblingTimeSeries(pairings([10], [0.1]))
+    with pytest.raises(ValueError, match="direction"):
+        ts.at(10, direction="sideways")
@@ -0,0 +1,64 @@
+"""
+File: test_signatures.py
+---------------------------
+Created on Sat Oct 17th, 2026
+
+Tests that the front-ends keep their original positional parameters, in order,
+so that new keyword arguments don't shift positional callers.
+"""
+
+import inspect
+
+import pytest
+
+import pyisotopomer as pi
+
+ORIGINAL = {
+    pi.Scrambling: [
+        "inputfile",
+        "tabname",
+        "saveout",
+        "outputfile",
+        "method",
+        "initialguess",
+        "lowerbounds",
+        "upperbounds",
+        "weights",
+        "O17beta",
+        "R15Air",
+        "R17VSMOW",
+        "R18VSMOW",
+    ],
+    pi.Isotopomers: [
+        "inputfile",
+        "tabname",
+        "saveout",
+        "outputfile",
+        "initialguess",
+        "lowerbounds",
+        "upperbounds",
+        "O17beta",
+        "R15Air",
+        "R17VSMOW",
+        "R18VSMOW",
+    ],
+    pi.Tracers: [
+        "inputfile",
+        "tabname",
+        "saveout",
+        "outputfile",
+        "initialguess",
+        "lowerbounds",
+        "upperbounds",
+        "O17beta",
+        "R15Air",
+        "R17VSMOW",
+        "R18VSMOW",
+    ],
+}
+
+
+@pytest.mark.parametrize("cls", list(ORIGINAL), ids=lambda cls: cls.__name__)
+def test_original_parameters_come_first(cls):
+    names = list(inspect.signature(cls).parameters)
+    assert names[: len(ORIGINAL[cls])] == ORIGINAL[cls]
@@ -0,0 +1,87 @@
+"""
+File: test_solvers.py
+---------------------------
+Created on Sat Oct 17th, 2026
+
+Tests that the batched and closed-form solvers agree with the row-by-row
+least squares solvers on the example templates.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from pyisotopomer import Diagnostics, IsotopeStandards, calculate_17R
+from pyisotopomer.calcSPmain import calcSPmain
+from pyisotopomer.calcdeltaSP import calcdeltaSP
+from pyisotopomer.isotopomerinput import IsotopomerInput
+from pyisotopomer.tracerinput import TracerInput
+from pyisotopomer.tracerSPmain import tracerSPmain
+
+EXAMPLES = Path(__file__).resolve().parents[1] / "pyisotopomer_examples"
+
+# delta values reported for each sample
+DELTAS = ["d15Na", "d15Nb", "SP", "d18O"]
+
+
+@pytest.fixture(scope="module")
+def isotopestandards():
+    return IsotopeStandards()
+
+
+@pytest.fixture(scope="module")
+def samples():
+    # n x 6 array of 31R, 45R, 46R, D17O, gamma and kappa
+    return IsotopomerInput(EXAMPLES / "00_Python_template_v3.xlsx").ratiosscrambling
+
+
+@pytest.fixture(scope="module")
+def tracers():
+    return TracerInput(EXAMPLES / "00_Tracer_template.xlsx").sizecorrected
+
+
+@pytest.mark.parametrize("method", ["newton", "bracketed"])
+def test_calcSPmain_matches_least_squares(samples, isotopestandards, method):
+    expected = calcSPmain(samples, isotopestandards, method="least_squares")
+    result = calcSPmain(samples, isotopestandards, method=method)
+
+    ratios = ["15Ralpha", "15Rbeta", "17R", "18R"]
+    np.testing.assert_allclose(result[ratios], expected[ratios], rtol=1e-10, atol=0)
+
+    # per mil
+    np.testing.assert_allclose(
+        calcdeltaSP(result, isotopestandards)[DELTAS],
+        calcdeltaSP(expected, isotopestandards)[DELTAS],
+        rtol=0,
+        atol=1e-6,
+    )
+
+
+def test_tracerlinearsolver_matches_least_squares(tracers, isotopestandards):
+    expected = tracerSPmain(tracers, isotopestandards, method="least_squares")
+    result = tracerSPmain(tracers, isotopestandards, method="linear")
+
+    ratios = ["15Ralpha", "15Rbeta", "17R", "18R"]
+    np.testing.assert_allclose(result[ratios], expected[ratios], rtol=1e-8, atol=0)
+    np.testing.assert_array_equal(result["D17O"], expected["D17O"])
+
+
+def test_calculate_17R_bracketed_matches_least_squares(samples, isotopestandards):
+    # 31R, 45R, 46R and D17O
+    R = samples[:, :4]
+    expected = calculate_17R(
+        R,
+        isotopestandards,
+        method="least_squares",
+        diagnostics=Diagnostics(mode="off"),
+    )
+    result = calculate_17R(
+        R,
+        isotopestandards,
+        method="bracketed",
+        diagnostics=Diagnostics(mode="off"),
+    )
+
+    # 15Rbulk, 18R and 17R
+    np.testing.assert_allclose(result, expected, rtol=1e-12, atol=0)
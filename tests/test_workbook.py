@@ -0,0 +1,79 @@
+"""
+File: test_workbook.py
+---------------------------
+Created on Sat Oct 17th, 2026
+
+Tests that Workbook releases the files it opens.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import pyisotopomer as pi
+from pyisotopomer import cli
+from pyisotopomer.workbook import Workbook
+
+EXAMPLES = Path(__file__).resolve().parents[1] / "pyisotopomer_examples"
+TEMPLATE = EXAMPLES / "00_Python_template_v3.xlsx"
+
+
+def test_context_manager_closes_excel():
+    with Workbook(TEMPLATE) as workbook:
+        assert workbook.excelfile is not None
+        data = workbook.read("size_correction")
+    assert workbook.excelfile is None
+
+    # parsed sheets come from the cache, others from a one-off read
+    pd.testing.assert_frame_equal(workbook.read("size_correction"), data)
+    assert "ref_tag" in workbook.read("scale_normalization").columns
+    assert workbook.excelfile is None
+    workbook.close()  # closing twice is harmless
+
+
+def test_close_npz(tmp_path):
+    table = pd.DataFrame({"a": [1.0, 2.0], "b": [3.0, 4.0]})
+    filename = tmp_path / "template.npz"
+    np.savez(filename, size_correction=table.to_records(index=False))
+
+    workbook = Workbook(filename)
+    workbook.close()
+    assert workbook.npzfile is None
+    pd.testing.assert_frame_equal(workbook.read("size_correction"), table)
+
+
+def test_frontends_close_templates_they_open(tmp_path):
+    isotopomers = pi.Isotopomers(str(TEMPLATE), outputfile=str(tmp_path / "out.csv"))
+    assert isotopomers.workbook.excelfile is None
+
+    chunked = pi.Isotopomers(
+        str(TEMPLATE), outputfile=str(tmp_path / "chunked.csv"), chunksize=4
+    )
+    assert chunked.workbook.excelfile is None
+
+    scrambling = pi.Scrambling(
+        str(TEMPLATE), saveout=False, diagnostics=pi.Diagnostics(mode="off")
+    )
+    assert scrambling.workbook.excelfile is None
+
+
+def test_frontends_leave_workbooks_they_are_given_open(tmp_path):
+    with Workbook(TEMPLATE) as workbook:
+        pi.Isotopomers(workbook, outputfile=str(tmp_path / "out.csv"))
+        assert workbook.excelfile is not None
+    assert workbook.excelfile is None
+
+
+def test_runfile_closes_template(tmp_path, monkeypatch):
+    closed = []
+    close = Workbook.close
+
+    def recordclose(self):
+        closed.append(self.filename)
+        close(self)
+
+    monkeypatch.setattr(Workbook, "close", recordclose)
+    summary = cli.runfile("isotopomers", str(TEMPLATE), str(tmp_path / "out.csv"), {})
+    assert summary["status"] == "ok"
+    assert str(TEMPLATE) in closed